@@ -1,13 +1,23 @@
+import time
+inicio_script = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from data_loader import get_datasets
-import unicodedata, re, math
+from enrich import carregar_datasets_enriquecidos
+from dataset_registry import RegistroDatasets
+from item_analysis import carregar_mapeamento_palavras, tabela_evolucao_palavras
+from word_matching import indice_palavras_ensinadas
+from boxplot_summary import dados_boxplot, camadas_boxplot
+from histogram_summary import resumir_histograma
+from filter_state import EstadoFiltros
+from trajectory_summary import LIMIAR_ENTIDADES_LINHAS, usar_linhas_individuais, faixas_quantis
+from perf_monitor import MonitorSecoes, memoria_solicitada
+import re, os, json
+from datetime import date
 import numpy as np
-from datetime import datetime, date
 import altair as alt
+# Plotly (gráficos da evolução individual e fallbacks sem Altair) é importado no primeiro uso
+ms_importacoes = (time.perf_counter() - inicio_script) * 1000
 
 st.set_page_config(
     page_title="Dashboard Longitudinal WordGen", 
@@ -38,110 +48,126 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ========== FUNÇÕES AUXILIARES ==========
-def normalizar_turma(turma_original: str) -> str:
-    """Normaliza valores de turma para formato padrão (5° Ano, 6° Ano, etc.)"""
-    if pd.isna(turma_original):
-        return turma_original
-    
-    turma_str = str(turma_original).upper().strip()
-    
-    if any(x in turma_str for x in ['5', 'QUINTO']):
-        return '5° Ano'
-    elif any(x in turma_str for x in ['6', 'SEXTO']):
-        return '6° Ano'
-    elif any(x in turma_str for x in ['7', 'SETIMO', 'SÉTIMO']):
-        return '7° Ano'
-    elif any(x in turma_str for x in ['8', 'OITAVO']):
-        return '8° Ano'
-    elif any(x in turma_str for x in ['9', 'NONO']):
-        return '9° Ano'
-    else:
-        return turma_original
-
-@st.cache_data(show_spinner=False)
-def load_data():
-    """Carrega e normaliza os datasets principais."""
-    tde, vocab = get_datasets()
-    
-    if 'Turma' in tde.columns:
-        tde['Turma_Original'] = tde['Turma'].copy()
-        tde['Turma'] = tde['Turma'].apply(normalizar_turma)
-    
-    if 'Turma' in vocab.columns:
-        vocab['Turma_Original'] = vocab['Turma'].copy()
-        vocab['Turma'] = vocab['Turma'].apply(normalizar_turma)
-    
-    return tde, vocab
-
-def calcular_idade(data_nascimento_str, data_referencia=None):
+@st.cache_resource(show_spinner=False)
+def load_data() -> RegistroDatasets:
     """
-    Calcula idade a partir da data de nascimento.
+    Carrega os datasets com todas as colunas derivadas em um registro único
+    por processo, compartilhado (sem cópia) por todas as sessões.
     
-    Args:
-        data_nascimento_str: String com data de nascimento (formato: DD/MM/YYYY ou YYYY-MM-DD)
-        data_referencia: Data de referência para cálculo (default: hoje)
-    
-    Returns:
-        Idade em anos (int) ou None se não puder calcular
+    Usa o artefato gerado por `python Dashboard/enrich.py` quando ele está
+    válido (carga pura, sem cálculo); caso contrário calcula em tempo real.
     """
-    if pd.isna(data_nascimento_str) or data_nascimento_str == '':
-        return None
-    
-    if data_referencia is None:
-        data_referencia = date.today()
-    
-    try:
-        # Tentar formato DD/MM/YYYY
-        if '/' in str(data_nascimento_str):
-            data_nasc = datetime.strptime(str(data_nascimento_str), '%d/%m/%Y').date()
-        # Tentar formato YYYY-MM-DD
-        elif '-' in str(data_nascimento_str):
-            data_nasc = datetime.strptime(str(data_nascimento_str), '%Y-%m-%d').date()
-        else:
-            return None
-        
-        # Calcular idade
-        idade = data_referencia.year - data_nasc.year
-        
-        # Ajustar se ainda não fez aniversário este ano
-        if (data_referencia.month, data_referencia.day) < (data_nasc.month, data_nasc.day):
-            idade -= 1
-        
-        return idade if idade >= 0 else None
-        
-    except (ValueError, AttributeError):
-        return None
+    tde, vocab, data_referencia = carregar_datasets_enriquecidos()
+    return RegistroDatasets({"TDE": tde, "VOCABULÁRIO": vocab}, data_referencia)
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def registro_na_data(data_referencia) -> RegistroDatasets:
+    """Registro com Idade/FaixaEtaria na data de referência escolhida (memoizado por data)."""
+    return load_data().na_data_referencia(data_referencia)
+
+# Tabelas derivadas memoizadas pela chave canônica dos filtros (EstadoFiltros):
+# o DataFrame filtrado (`_df`) não é hasheado, a chave já identifica o recorte.
+# O st.cache_data é do processo (compartilhado entre sessões/usuários) e, com
+# max_entries, descarta a entrada usada há mais tempo (LRU) ao passar do limite.
+# O limite vale para cada função memoizada, não para o conjunto: o total em
+# memória chega a MAX_ENTRADAS_POR_MEMO × (número de funções que o usam).
+MAX_ENTRADAS_POR_MEMO = 64
 
-def criar_faixas_etarias(idade):
+@st.cache_data(show_spinner=False, max_entries=MAX_ENTRADAS_POR_MEMO)
+def cards_memo(chave_filtros: str, _cubo, _selecao: np.ndarray, coluna_turma: str) -> dict:
+    """Valores dos cards de resumo (registros, alunos, escolas, turmas e d de Cohen)."""
+    resumo = _cubo.resumo(_selecao).iloc[0]
+    celulas = _cubo.celulas(_selecao)
+    return {
+        'n_linhas': int(resumo['n_linhas']),
+        'n_alunos': int(resumo['n_alunos']),
+        'n_escolas': celulas['Escola'].nunique(),
+        'n_turmas': celulas[coluna_turma].nunique(),
+        'd_cohen': float(resumo['d_cohen']),
+    }
+
+@st.cache_data(show_spinner=False, max_entries=MAX_ENTRADAS_POR_MEMO)
+def dados_boxplot_memo(chave_filtros: str, _df: pd.DataFrame, coluna_turma: str | None):
+    """Formato longo + resumo do boxplot por Fase (e Turma, se `coluna_turma`) e Momento."""
+    id_vars = ['Fase'] + ([coluna_turma] if coluna_turma else [])
+    df_boxplot = _df.melt(
+        id_vars=id_vars,
+        value_vars=['Score_Pre', 'Score_Pos'],
+        var_name='Momento',
+        value_name='Score'
+    )
+    df_boxplot['Momento'] = df_boxplot['Momento'].replace({
+        'Score_Pre': 'Pré-Teste',
+        'Score_Pos': 'Pós-Teste'
+    })
+    df_boxplot['Fase_str'] = df_boxplot['Fase'].astype(int).astype(str)
+
+    grupos_box = ['Fase', 'Fase_str'] + ([coluna_turma] if coluna_turma else []) + ['Momento']
+    dados_box, resumido = dados_boxplot(df_boxplot, grupos_box)
+    turmas = list(df_boxplot[coluna_turma].dropna().unique()) if coluna_turma else []
+    return dados_box, resumido, grupos_box, turmas
+
+@st.cache_data(show_spinner=False, max_entries=MAX_ENTRADAS_POR_MEMO)
+def dados_boxplot_perfil_memo(chave_filtros: str, _df: pd.DataFrame, coluna: str, ordem: tuple | None = None):
     """
-    Cria faixas etárias para agrupamento.
-    
-    Args:
-        idade: Idade em anos
-        
-    Returns:
-        String com faixa etária ou None
+    Formato longo + resumo do boxplot por `coluna` (Sexo, FaixaEtaria) e Momento.
+
+    Com `ordem`, registros sem `coluna` saem e as categorias seguem essa ordem.
     """
-    if pd.isna(idade) or idade is None:
-        return None
-    
-    if idade < 10:
-        return "< 10 anos"
-    elif idade < 12:
-        return "10-11 anos"
-    elif idade < 14:
-        return "12-13 anos"
-    elif idade < 16:
-        return "14-15 anos"
-    else:
-        return "≥ 16 anos"
+    df_perf = _df.melt(
+        id_vars=[coluna, 'ID_Unico'],
+        value_vars=['Score_Pre', 'Score_Pos'],
+        var_name='Momento',
+        value_name='Score'
+    )
+    df_perf['Momento'] = df_perf['Momento'].replace({
+        'Score_Pre': 'Pré-Teste',
+        'Score_Pos': 'Pós-Teste'
+    })
+
+    # Remover NaN para evitar problemas nos tooltips
+    df_perf = df_perf.dropna(subset=['Score'] + ([coluna] if ordem else []))
+    if ordem:
+        df_perf[coluna] = pd.Categorical(df_perf[coluna], categories=list(ordem), ordered=True)
+        df_perf = df_perf.sort_values(coluna)
+    return dados_boxplot(df_perf, [coluna, 'Momento'])
+
+@st.cache_data(show_spinner=False, max_entries=MAX_ENTRADAS_POR_MEMO)
+def tabela_palavras_memo(chave_filtros: str, _df: pd.DataFrame, fases: tuple) -> pd.DataFrame:
+    """Tabela de evolução por palavra do recorte atual."""
+    return tabela_evolucao_palavras(_df, carregar_mapeamento_palavras(fases))
+
+@st.cache_data(show_spinner=False, max_entries=MAX_ENTRADAS_POR_MEMO)
+def trajetorias_memo(chave_filtros: str, _df_drill: pd.DataFrame, col_agrupamento: str, col_fase: str,
+                     metrica_col: str, filtros_drill: tuple) -> pd.DataFrame:
+    """Média da métrica por entidade e fase (`filtros_drill` = coorte, escolas, turmas, alunos)."""
+    df_viz = _df_drill.groupby([col_agrupamento, col_fase], observed=True)[metrica_col].mean().reset_index()
+    return df_viz.rename(columns={col_agrupamento: 'Entidade', col_fase: 'Fase', metrica_col: 'Valor'})
+
+@st.cache_data(show_spinner=False, max_entries=MAX_ENTRADAS_POR_MEMO)
+def ganhos_memo(chave_filtros: str, _df: pd.DataFrame):
+    """Estatísticas dos ganhos (Pós - Pré) e contagens do histograma por intervalo e sinal."""
+    delta = (_df['Score_Pos'] - _df['Score_Pre']).dropna()
+    if delta.empty:
+        return None, None
+    p25, p75 = delta.quantile(0.25), delta.quantile(0.75)
+    iqr = p75 - p25
+    ganhos = {
+        'media': delta.mean(), 'mediana': delta.median(), 'dp': delta.std(),
+        'minimo': delta.min(), 'maximo': delta.max(),
+        'melhoraram': int((delta > 0).sum()), 'mantiveram': int((delta == 0).sum()),
+        'pioraram': int((delta < 0).sum()), 'total': len(delta),
+        'p25': p25, 'p75': p75,
+        'outliers_baixo': int((delta < p25 - 1.5 * iqr).sum()),
+        'outliers_alto': int((delta > p75 + 1.5 * iqr).sum()),
+    }
+    cor = np.select([delta > 0, delta < 0], ['Positivo', 'Negativo'], 'Zero')
+    bins = resumir_histograma(delta, cor, maxbins=30).rename(columns={'categoria': 'Cor'})
+    return ganhos, bins
 
 @st.cache_data(show_spinner=False)
 def carregar_palavras_ensinadas():
     """Carrega as palavras ensinadas de todas as fases."""
-    import json
-    import os
-    
     palavras_por_fase = {}
     base_path = os.path.join(os.path.dirname(__file__), '..', 'Data')
     
@@ -160,62 +186,6 @@ def carregar_palavras_ensinadas():
     
     return palavras_por_fase
 
-def normalizar_palavra(palavra: str) -> str:
-    """Normaliza palavra para comparação (remove acentos, lowercase, etc)."""
-    if not palavra:
-        return ""
-    # Remove acentos
-    palavra_norm = unicodedata.normalize('NFD', str(palavra))
-    palavra_norm = ''.join(char for char in palavra_norm if unicodedata.category(char) != 'Mn')
-    # Lowercase e strip
-    palavra_norm = palavra_norm.lower().strip()
-    # Remove pontuação no final
-    palavra_norm = palavra_norm.rstrip('.,;:!?')
-    return palavra_norm
-
-def palavra_ensinada_match(palavra_teste: str, palavras_ensinadas: set) -> bool:
-    """Verifica se palavra do teste corresponde a alguma palavra ensinada.
-    
-    Usa correspondência exata normalizada e correspondência de raiz com no mínimo 6 caracteres.
-    """
-    if not palavra_teste or not palavras_ensinadas:
-        return False
-    
-    palavra_teste_norm = normalizar_palavra(palavra_teste)
-    
-    # Verificar correspondência exata normalizada
-    for palavra_ensinada in palavras_ensinadas:
-        palavra_ensinada_norm = normalizar_palavra(palavra_ensinada)
-        
-        # Correspondência exata
-        if palavra_teste_norm == palavra_ensinada_norm:
-            return True
-        
-        # Correspondência de raiz (primeiras 6 letras) - mais rigoroso
-        if len(palavra_teste_norm) >= 6 and len(palavra_ensinada_norm) >= 6:
-            if palavra_teste_norm[:6] == palavra_ensinada_norm[:6]:
-                return True
-    
-    return False
-
-def calcular_d_cohen(df_in: pd.DataFrame, col_pre: str = 'Score_Pre', col_pos: str = 'Score_Pos') -> float:
-    """Calcula d de Cohen."""
-    if df_in is None or df_in.empty:
-        return float('nan')
-    pre = df_in[col_pre].dropna()
-    pos = df_in[col_pos].dropna()
-    n_pre, n_pos = len(pre), len(pos)
-    if n_pre < 2 or n_pos < 2:
-        return float('nan')
-    m_pre, m_pos = pre.mean(), pos.mean()
-    sd_pre, sd_pos = pre.std(ddof=1), pos.std(ddof=1)
-    if (sd_pre == 0 and sd_pos == 0):
-        return float('nan')
-    pooled = math.sqrt(((n_pre - 1) * sd_pre**2 + (n_pos - 1) * sd_pos**2) / (n_pre + n_pos - 2)) if (n_pre + n_pos - 2) > 0 else float('nan')
-    if pooled == 0 or np.isnan(pooled):
-        return float('nan')
-    return (m_pos - m_pre) / pooled
-
 def classificar_geral(d: float) -> str:
     if np.isnan(d):
         return 'Sem dados'
@@ -256,19 +226,45 @@ def criar_metric_card(valor, titulo, icone, cor_box=(0, 123, 255), cor_fonte=(25
                             display: block;'>{titulo}</span></p>"""
     return lnk + htmlstr
 
-# ========== LOAD DATA ==========
-tde_df, vocab_df = load_data()
+# ========== INSTRUMENTAÇÃO ==========
+# Painel de desempenho oculto: ?debug=1 na URL (ou DASHBOARD_PERF_LOG no ambiente para só gravar o log).
+# O pico de memória (tracemalloc, deixa o processo inteiro mais lento) só com ?debug=memoria
+# ou DASHBOARD_PERF_MEMORIA=1
+if st.query_params.get('debug') in ('1', 'memoria'):
+    st.session_state.show_debug = True
+    st.session_state.perf_memoria = st.query_params.get('debug') == 'memoria'
+monitor = MonitorSecoes(
+    ativo=st.session_state.get('show_debug', False) or 'DASHBOARD_PERF_LOG' in os.environ,
+    inicio=inicio_script,
+    memoria=st.session_state.get('perf_memoria', False) or memoria_solicitada()
+)
+monitor.marco('importacoes', ms_importacoes)
 
-# Calcular idade para ambos os datasets
-if 'DataAniversario' in tde_df.columns:
-    tde_df['Idade'] = tde_df['DataAniversario'].apply(calcular_idade)
-    tde_df['FaixaEtaria'] = tde_df['Idade'].apply(criar_faixas_etarias)
+# ========== FILTROS DA URL ==========
+# Lidos uma vez por sessão: são os valores iniciais dos widgets (um link compartilhado
+# reproduz o recorte). Ficam fixos na sessão para não mudar a identidade dos widgets.
+if 'filtros_url' not in st.session_state:
+    st.session_state.filtros_url = EstadoFiltros.de_query_params(
+        {nome: st.query_params.get_all(nome) for nome in st.query_params}
+    )
+filtros_url = st.session_state.filtros_url
 
-if 'DataAniversario' in vocab_df.columns:
-    vocab_df['Idade'] = vocab_df['DataAniversario'].apply(calcular_idade)
-    vocab_df['FaixaEtaria'] = vocab_df['Idade'].apply(criar_faixas_etarias)
+def selecao_inicial(opcoes, campo: str, padrao: list) -> list:
+    """Opções presentes no campo `campo` do estado da URL (casadas por texto); senão `padrao`."""
+    if filtros_url is None or not getattr(filtros_url, campo):
+        return padrao
+    da_url = set(getattr(filtros_url, campo))
+    return [o for o in opcoes if str(o) in da_url] or padrao
+
+# ========== LOAD DATA ==========
+with monitor.secao('carga'):
+    # Idade na data de hoje por padrão (o artefato pode ter sido gerado há meses)
+    data_inicial = (filtros_url.data_referencia if filtros_url and filtros_url.data_referencia
+                    else date.today())
+    # Data de referência da idade (widget na segunda linha de filtros)
+    data_referencia_idade = st.session_state.get('data_referencia_idade', data_inicial)
+    registro_datasets = registro_na_data(data_referencia_idade)
 
-PROVAS = {"TDE": tde_df, "VOCABULÁRIO": vocab_df}
 
 # ========== HEADER ==========
 st.title("📊 Dashboard Longitudinal - WordGen")
@@ -276,30 +272,37 @@ st.markdown("**Análise Comparativa de Desempenho: Pré-Teste vs Pós-Teste**")
 st.markdown("---")
 
 # ========== FILTROS NO TOPO (TOP BAR) ==========
-with st.expander("🔍 **FILTROS DE ANÁLISE**", expanded=True):
+with st.expander("🔍 **FILTROS DE ANÁLISE**", expanded=True), monitor.secao('filtros'):
     # LINHA ÚNICA - Filtros principais (Prova reduzida em 50%, Turma reduzida em 20%)
     col_f1, col_f2, col_f3, col_f4 = st.columns([0.5, 1, 1.5, 1.6])
     
     with col_f1:
-        prova_sel = st.selectbox("📝 Prova", list(PROVAS.keys()))
-        df = PROVAS[prova_sel]
+        nomes_provas = list(registro_datasets.nomes)
+        prova_sel = st.selectbox(
+            "📝 Prova", nomes_provas,
+            index=nomes_provas.index(filtros_url.prova) if filtros_url and filtros_url.prova in nomes_provas else 0
+        )
+        indice_filtros = registro_datasets.indice(prova_sel)
+        # Bitmap das linhas selecionadas; o dataset só é fatiado no final
+        selecao = indice_filtros.todos()
+        sexo_sel, faixa_sel, idade_range = [], [], None
     
     with col_f2:
-        fases = sorted(df['Fase'].dropna().unique())
-        fases_sel = st.multiselect("📅 Fase(s)", fases, default=fases)
+        fases = indice_filtros.valores('Fase')
+        fases_sel = st.multiselect("📅 Fase(s)", fases, default=selecao_inicial(fases, 'fases', fases))
         if fases_sel:
-            df = df[df['Fase'].isin(fases_sel)]
+            selecao &= indice_filtros.selecionar('Fase', fases_sel)
     
     with col_f3:
-        escolas = sorted(df['Escola'].dropna().unique())
-        escola_sel = st.multiselect("🏫 Escola(s)", escolas, default=[])
+        escolas = indice_filtros.valores('Escola', selecao)
+        escola_sel = st.multiselect("🏫 Escola(s)", escolas, default=selecao_inicial(escolas, 'escolas', []))
         if escola_sel:
-            df = df[df['Escola'].isin(escola_sel)]
+            selecao &= indice_filtros.selecionar('Escola', escola_sel)
     
     with col_f4:
         # Inicializar session_state ANTES de tudo
         if 'agregar_turmas' not in st.session_state:
-            st.session_state.agregar_turmas = False
+            st.session_state.agregar_turmas = filtros_url is not None and filtros_url.coluna_turma == 'Turma'
         
         # Sub-colunas: checkbox ao lado do multiselect
         sub_col1, sub_col2 = st.columns([3, 1.9])
@@ -326,1035 +329,964 @@ with st.expander("🔍 **FILTROS DE ANÁLISE**", expanded=True):
             # Multiselect de turmas (muda conforme checkbox)
             if agregar_turmas:
                 coluna_turma = 'Turma'
-                turmas_disponiveis = sorted(df['Turma'].dropna().unique())
                 label_turmas = "🎓 Turma(s) - Agregadas"
             else:
                 coluna_turma = 'Turma_Original'
-                turmas_disponiveis = sorted(df['Turma_Original'].dropna().unique())
                 label_turmas = "🎓 Turma(s) - Separadas"
+            turmas_disponiveis = indice_filtros.valores(coluna_turma, selecao)
             
-            turmas_sel = st.multiselect(label_turmas, turmas_disponiveis, key="turmas_multiselect")
+            turmas_sel = st.multiselect(
+                label_turmas, turmas_disponiveis,
+                default=selecao_inicial(turmas_disponiveis, 'turmas', []),
+                key="turmas_multiselect"
+            )
             if turmas_sel:
-                df = df[df[coluna_turma].isin(turmas_sel)]
+                selecao &= indice_filtros.selecionar(coluna_turma, turmas_sel)
     
     # SEGUNDA LINHA - Filtros demográficos (Sexo e Idade)
     st.markdown("---")
-    col_d1, col_d2, col_d3 = st.columns([1, 1.5, 2])
+    col_d1, col_d2, col_d3, col_d4 = st.columns([1, 1.5, 2, 1])
     
     with col_d1:
         # Filtro de Sexo
-        if 'Sexo' in df.columns:
-            sexos_disponiveis = sorted([s for s in df['Sexo'].dropna().unique() if s != ''])
-            sexo_sel = st.multiselect("👤 Sexo", sexos_disponiveis, default=[])
+        if indice_filtros.tem('Sexo'):
+            sexos_disponiveis = [s for s in indice_filtros.valores('Sexo', selecao) if s != '']
+            sexo_sel = st.multiselect("👤 Sexo", sexos_disponiveis, default=selecao_inicial(sexos_disponiveis, 'sexos', []))
             if sexo_sel:
-                df = df[df['Sexo'].isin(sexo_sel)]
+                selecao &= indice_filtros.selecionar('Sexo', sexo_sel)
     
     with col_d2:
         # Filtro de Faixa Etária
-        if 'FaixaEtaria' in df.columns:
+        if indice_filtros.tem('FaixaEtaria'):
+            faixas_presentes = set(indice_filtros.valores('FaixaEtaria', selecao))
             faixas_disponiveis = [f for f in ["< 10 anos", "10-11 anos", "12-13 anos", "14-15 anos", "≥ 16 anos"] 
-                                  if f in df['FaixaEtaria'].unique()]
-            faixa_sel = st.multiselect("🎂 Faixa Etária", faixas_disponiveis, default=[])
+                                  if f in faixas_presentes]
+            faixa_sel = st.multiselect("🎂 Faixa Etária", faixas_disponiveis,
+                                       default=selecao_inicial(faixas_disponiveis, 'faixas', []))
             if faixa_sel:
-                df = df[df['FaixaEtaria'].isin(faixa_sel)]
+                selecao &= indice_filtros.selecionar('FaixaEtaria', faixa_sel)
     
     with col_d3:
         # Filtro de Idade Específica (range slider)
-        if 'Idade' in df.columns:
-            idades_validas = df['Idade'].dropna()
+        if indice_filtros.tem('Idade'):
+            idades_validas = indice_filtros.valores('Idade', selecao)
             if len(idades_validas) > 0:
-                idade_min = int(idades_validas.min())
-                idade_max = int(idades_validas.max())
+                idade_min = int(idades_validas[0])
+                idade_max = int(idades_validas[-1])
+                # Faixa da URL limitada às idades disponíveis
+                idade_inicial = (idade_min, idade_max)
+                if filtros_url and filtros_url.idade:
+                    idade_inicial = tuple(min(max(i, idade_min), idade_max) for i in filtros_url.idade)
                 idade_range = st.slider(
                     "📊 Idade Específica (anos)",
                     min_value=idade_min,
                     max_value=idade_max,
-                    value=(idade_min, idade_max),
+                    value=idade_inicial,
                     step=1
                 )
-                df = df[(df['Idade'] >= idade_range[0]) & (df['Idade'] <= idade_range[1])]
+                selecao &= indice_filtros.selecionar_intervalo('Idade', idade_range[0], idade_range[1])
+    
+    with col_d4:
+        # Data em que a idade é calculada (recalcula Idade/Faixa Etária sem reler as datas)
+        if indice_filtros.tem('Idade'):
+            st.date_input(
+                "📆 Idade em",
+                value=data_inicial,
+                format="DD/MM/YYYY",
+                key="data_referencia_idade"
+            )
+    
+    df = indice_filtros.aplicar(registro_datasets.obter(prova_sel), selecao)
+    # Estatísticas agregadas saem do cubo (soma das células selecionadas)
+    cubo = registro_datasets.cubo(prova_sel)
+
+# Chave canônica do recorte: memoiza as tabelas derivadas das seções abaixo
+estado_filtros = EstadoFiltros.de_selecoes(
+    prova_sel, data_referencia_idade, fases_sel, escola_sel, coluna_turma,
+    turmas_sel, sexo_sel, faixa_sel, idade_range
+)
+chave_filtros = estado_filtros.chave()
+
+# O mesmo estado vai para a URL (preservando ?debug); só reescreve quando muda
+params_url = estado_filtros.para_query_params()
+if 'debug' in st.query_params:
+    params_url['debug'] = st.query_params.get_all('debug')
+if params_url != {nome: st.query_params.get_all(nome) for nome in st.query_params}:
+    st.query_params.from_dict(params_url)
+monitor.contexto.update(prova=prova_sel, chave_filtros=chave_filtros, n_linhas=len(df))
 
 st.markdown("---")
 
 # ========== MÉTRICAS PRINCIPAIS ==========
-st.subheader("📈 Resumo Estatístico")
-col1, col2, col3, col4, col5 = st.columns(5)
+with monitor.secao('cards'):
+    st.subheader("📈 Resumo Estatístico")
+    cards = cards_memo(chave_filtros, cubo, selecao, coluna_turma)
+    col1, col2, col3, col4, col5 = st.columns(5)
 
-with col1:
-    st.markdown(criar_metric_card(
-        len(df), "Registros", "fas fa-database",
-        (52, 152, 219), (255, 255, 255)
-    ), unsafe_allow_html=True)
+    with col1:
+        st.markdown(criar_metric_card(
+            cards['n_linhas'], "Registros", "fas fa-database",
+            (52, 152, 219), (255, 255, 255)
+        ), unsafe_allow_html=True)
 
-with col2:
-    st.markdown(criar_metric_card(
-        df['ID_Unico'].nunique(), "Alunos Únicos", "fas fa-users",
-        (46, 204, 113), (255, 255, 255)
-    ), unsafe_allow_html=True)
+    with col2:
+        st.markdown(criar_metric_card(
+            cards['n_alunos'], "Alunos Únicos", "fas fa-users",
+            (46, 204, 113), (255, 255, 255)
+        ), unsafe_allow_html=True)
 
-with col3:
-    st.markdown(criar_metric_card(
-        df['Escola'].nunique(), "Escolas", "fas fa-school",
-        (155, 89, 182), (255, 255, 255)
-    ), unsafe_allow_html=True)
+    with col3:
+        st.markdown(criar_metric_card(
+            cards['n_escolas'], "Escolas", "fas fa-school",
+            (155, 89, 182), (255, 255, 255)
+        ), unsafe_allow_html=True)
 
-with col4:
-    turmas_count = df[coluna_turma].nunique()
-    turma_label = "Turmas Agregadas" if agregar_turmas else "Turmas"
-    st.markdown(criar_metric_card(
-        turmas_count, turma_label, "fas fa-chalkboard-teacher",
-        (230, 126, 34), (255, 255, 255)
-    ), unsafe_allow_html=True)
+    with col4:
+        turmas_count = cards['n_turmas']
+        turma_label = "Turmas Agregadas" if agregar_turmas else "Turmas"
+        st.markdown(criar_metric_card(
+            turmas_count, turma_label, "fas fa-chalkboard-teacher",
+            (230, 126, 34), (255, 255, 255)
+        ), unsafe_allow_html=True)
 
-with col5:
-    d_val = calcular_d_cohen(df)
-    prova_norm = 'TDE' if prova_sel.upper().startswith('TDE') else 'VOCAB'
-    cls_espec, ok_flag = benchmark_especifico(d_val, prova_norm)
+    with col5:
+        d_val = cards['d_cohen']
+        prova_norm = 'TDE' if prova_sel.upper().startswith('TDE') else 'VOCAB'
+        cls_espec, ok_flag = benchmark_especifico(d_val, prova_norm)
     
-    if ok_flag:
-        cor_box, cor_fonte, icone = (40, 167, 69), (255, 255, 255), "fas fa-check-circle"
-    elif not np.isnan(d_val):
-        cor_box, cor_fonte, icone = (255, 193, 7), (0, 0, 0), "fas fa-exclamation-triangle"
-    else:
-        cor_box, cor_fonte, icone = (108, 117, 125), (255, 255, 255), "fas fa-info-circle"
+        if ok_flag:
+            cor_box, cor_fonte, icone = (40, 167, 69), (255, 255, 255), "fas fa-check-circle"
+        elif not np.isnan(d_val):
+            cor_box, cor_fonte, icone = (255, 193, 7), (0, 0, 0), "fas fa-exclamation-triangle"
+        else:
+            cor_box, cor_fonte, icone = (108, 117, 125), (255, 255, 255), "fas fa-info-circle"
     
-    val_str = '—' if np.isnan(d_val) else f"{d_val:.3f}"
-    st.markdown(criar_metric_card(
-        val_str, "Tamanho do Efeito", icone,
-        cor_box, cor_fonte
-    ), unsafe_allow_html=True)
+        val_str = '—' if np.isnan(d_val) else f"{d_val:.3f}"
+        st.markdown(criar_metric_card(
+            val_str, "Tamanho do Efeito", icone,
+            cor_box, cor_fonte
+        ), unsafe_allow_html=True)
+# Tempo até a primeira pintura: cards de resumo (primeiro conteúdo com dados) enviados
+monitor.marco('primeira_pintura')
 
 st.markdown("---")
 
 # ========== ANÁLISE DEMOGRÁFICA ==========
-st.subheader("👥 Análise Demográfica")
+with monitor.secao('demografia'):
+    st.subheader("👥 Análise Demográfica")
 
-# Criar abas para organizar visualizações demográficas
-tab_dist, tab_perf = st.tabs(["📊 Distribuição", "📈 Performance por Perfil"])
+    # Criar abas para organizar visualizações demográficas
+    tab_dist, tab_perf = st.tabs(["📊 Distribuição", "📈 Performance por Perfil"])
 
-with tab_dist:
-    col_dist1, col_dist2 = st.columns(2, gap="large")
+    with tab_dist:
+        col_dist1, col_dist2 = st.columns(2, gap="large")
     
-    # Gráfico 1: Distribuição por Sexo
-    with col_dist1:
-        with st.container(border=True):
-            st.markdown("#### Distribuição por Sexo")
+        # Gráfico 1: Distribuição por Sexo
+        with col_dist1:
+            with st.container(border=True):
+                st.markdown("#### Distribuição por Sexo")
             
-            if 'Sexo' in df.columns and not df['Sexo'].isna().all():
-                # Contar alunos únicos por sexo
-                dist_sexo = df.groupby('Sexo')['ID_Unico'].nunique().reset_index()
-                dist_sexo.columns = ['Sexo', 'Quantidade']
-                dist_sexo['Percentual'] = (dist_sexo['Quantidade'] / dist_sexo['Quantidade'].sum() * 100).round(1)
-                dist_sexo['Label'] = dist_sexo.apply(
-                    lambda row: f"{row['Quantidade']} ({row['Percentual']}%)", axis=1
-                )
+                if 'Sexo' in df.columns and not df['Sexo'].isna().all():
+                    # Contar alunos únicos por sexo
+                    dist_sexo = cubo.resumo(selecao, por='Sexo')[['Sexo', 'n_alunos']]
+                    dist_sexo.columns = ['Sexo', 'Quantidade']
+                    dist_sexo['Percentual'] = (dist_sexo['Quantidade'] / dist_sexo['Quantidade'].sum() * 100).round(1)
+                    dist_sexo['Label'] = dist_sexo.apply(
+                        lambda row: f"{row['Quantidade']} ({row['Percentual']}%)", axis=1
+                    )
                 
-                # Cores customizadas para cada sexo
-                color_scale = alt.Scale(
-                    domain=['Masculino', 'Feminino'],
-                    range=['#636EFA', '#EF553B']
-                )
+                    # Cores customizadas para cada sexo
+                    color_scale = alt.Scale(
+                        domain=['Masculino', 'Feminino'],
+                        range=['#636EFA', '#EF553B']
+                    )
                 
-                chart_sexo = alt.Chart(dist_sexo).mark_bar().encode(
-                    x=alt.X('Sexo:N', 
-                           title='Sexo',
-                           axis=alt.Axis(labelAngle=0)),
-                    y=alt.Y('Quantidade:Q', 
-                           title='Número de Alunos'),
-                    color=alt.Color('Sexo:N', 
-                                   scale=color_scale,
-                                   legend=None),
-                    tooltip=[
-                        alt.Tooltip('Sexo:N', title='Sexo'),
-                        alt.Tooltip('Quantidade:Q', title='Alunos'),
-                        alt.Tooltip('Percentual:Q', title='Percentual (%)', format='.1f')
-                    ]
-                ).properties(
-                    height=350
-                )
+                    chart_sexo = alt.Chart(dist_sexo).mark_bar().encode(
+                        x=alt.X('Sexo:N', 
+                               title='Sexo',
+                               axis=alt.Axis(labelAngle=0)),
+                        y=alt.Y('Quantidade:Q', 
+                               title='Número de Alunos'),
+                        color=alt.Color('Sexo:N', 
+                                       scale=color_scale,
+                                       legend=None),
+                        tooltip=[
+                            alt.Tooltip('Sexo:N', title='Sexo'),
+                            alt.Tooltip('Quantidade:Q', title='Alunos'),
+                            alt.Tooltip('Percentual:Q', title='Percentual (%)', format='.1f')
+                        ]
+                    ).properties(
+                        height=350
+                    )
                 
-                # Adicionar labels no topo das barras
-                text_sexo = chart_sexo.mark_text(
-                    align='center',
-                    baseline='bottom',
-                    dy=-5,
-                    fontSize=12,
-                    fontWeight='bold'
-                ).encode(
-                    text='Label:N'
-                )
+                    # Adicionar labels no topo das barras
+                    text_sexo = chart_sexo.mark_text(
+                        align='center',
+                        baseline='bottom',
+                        dy=-5,
+                        fontSize=12,
+                        fontWeight='bold'
+                    ).encode(
+                        text='Label:N'
+                    )
                 
-                st.altair_chart(chart_sexo + text_sexo, use_container_width=True)
-            else:
-                st.info("📊 Dados de sexo não disponíveis para os filtros selecionados")
+                    st.altair_chart(chart_sexo + text_sexo, use_container_width=True)
+                else:
+                    st.info("📊 Dados de sexo não disponíveis para os filtros selecionados")
     
-    # Gráfico 2: Distribuição por Faixa Etária
-    with col_dist2:
-        with st.container(border=True):
-            st.markdown("#### Distribuição por Faixa Etária")
+        # Gráfico 2: Distribuição por Faixa Etária
+        with col_dist2:
+            with st.container(border=True):
+                st.markdown("#### Distribuição por Faixa Etária")
             
-            if 'FaixaEtaria' in df.columns and not df['FaixaEtaria'].isna().all():
-                # Contar alunos únicos por faixa etária
-                dist_idade = df.groupby('FaixaEtaria')['ID_Unico'].nunique().reset_index()
-                dist_idade.columns = ['FaixaEtaria', 'Quantidade']
-                dist_idade['Percentual'] = (dist_idade['Quantidade'] / dist_idade['Quantidade'].sum() * 100).round(1)
-                dist_idade['Label'] = dist_idade.apply(
-                    lambda row: f"{row['Quantidade']} ({row['Percentual']}%)", axis=1
-                )
-                
-                # Ordenar as faixas corretamente
-                ordem_faixas = ['< 10 anos', '10-11 anos', '12-13 anos', '14-15 anos', '≥ 16 anos']
-                dist_idade['FaixaEtaria'] = pd.Categorical(
-                    dist_idade['FaixaEtaria'], 
-                    categories=ordem_faixas, 
-                    ordered=True
-                )
-                dist_idade = dist_idade.sort_values('FaixaEtaria')
+                if 'FaixaEtaria' in df.columns and not df['FaixaEtaria'].isna().all():
+                    # Contar alunos únicos por faixa etária
+                    dist_idade = cubo.resumo(selecao, por='FaixaEtaria')[['FaixaEtaria', 'n_alunos']]
+                    dist_idade.columns = ['FaixaEtaria', 'Quantidade']
+                    dist_idade['Percentual'] = (dist_idade['Quantidade'] / dist_idade['Quantidade'].sum() * 100).round(1)
+                    dist_idade['Label'] = dist_idade.apply(
+                        lambda row: f"{row['Quantidade']} ({row['Percentual']}%)", axis=1
+                    )
                 
-                chart_idade = alt.Chart(dist_idade).mark_bar().encode(
-                    x=alt.X('FaixaEtaria:N',
-                           title='Faixa Etária',
-                           sort=ordem_faixas,
-                           axis=alt.Axis(labelAngle=-45)),
-                    y=alt.Y('Quantidade:Q',
-                           title='Número de Alunos'),
-                    color=alt.Color('FaixaEtaria:N',
-                                   scale=alt.Scale(scheme='viridis'),
-                                   legend=None),
-                    tooltip=[
-                        alt.Tooltip('FaixaEtaria:N', title='Faixa Etária'),
-                        alt.Tooltip('Quantidade:Q', title='Alunos'),
-                        alt.Tooltip('Percentual:Q', title='Percentual (%)', format='.1f')
-                    ]
-                ).properties(
-                    height=350
-                )
+                    # Ordenar as faixas corretamente
+                    ordem_faixas = ['< 10 anos', '10-11 anos', '12-13 anos', '14-15 anos', '≥ 16 anos']
+                    dist_idade['FaixaEtaria'] = pd.Categorical(
+                        dist_idade['FaixaEtaria'], 
+                        categories=ordem_faixas, 
+                        ordered=True
+                    )
+                    dist_idade = dist_idade.sort_values('FaixaEtaria')
+                
+                    chart_idade = alt.Chart(dist_idade).mark_bar().encode(
+                        x=alt.X('FaixaEtaria:N',
+                               title='Faixa Etária',
+                               sort=ordem_faixas,
+                               axis=alt.Axis(labelAngle=-45)),
+                        y=alt.Y('Quantidade:Q',
+                               title='Número de Alunos'),
+                        color=alt.Color('FaixaEtaria:N',
+                                       scale=alt.Scale(scheme='viridis'),
+                                       legend=None),
+                        tooltip=[
+                            alt.Tooltip('FaixaEtaria:N', title='Faixa Etária'),
+                            alt.Tooltip('Quantidade:Q', title='Alunos'),
+                            alt.Tooltip('Percentual:Q', title='Percentual (%)', format='.1f')
+                        ]
+                    ).properties(
+                        height=350
+                    )
                 
-                # Adicionar labels
-                text_idade = chart_idade.mark_text(
-                    align='center',
-                    baseline='bottom',
-                    dy=-5,
-                    fontSize=11,
-                    fontWeight='bold'
-                ).encode(
-                    text='Label:N'
-                )
+                    # Adicionar labels
+                    text_idade = chart_idade.mark_text(
+                        align='center',
+                        baseline='bottom',
+                        dy=-5,
+                        fontSize=11,
+                        fontWeight='bold'
+                    ).encode(
+                        text='Label:N'
+                    )
                 
-                st.altair_chart(chart_idade + text_idade, use_container_width=True)
-            else:
-                st.info("📊 Dados de idade não disponíveis para os filtros selecionados")
+                    st.altair_chart(chart_idade + text_idade, use_container_width=True)
+                else:
+                    st.info("📊 Dados de idade não disponíveis para os filtros selecionados")
 
-with tab_perf:
-    # Performance por Sexo
-    st.markdown("#### Performance por Sexo (Pré vs Pós-Teste)")
+    with tab_perf:
+        # Performance por Sexo
+        st.markdown("#### Performance por Sexo (Pré vs Pós-Teste)")
     
-    if 'Sexo' in df.columns and not df['Sexo'].isna().all():
-        # Preparar dados em formato longo
-        df_perf_sexo = df.melt(
-            id_vars=['Sexo', 'ID_Unico'],
-            value_vars=['Score_Pre', 'Score_Pos'],
-            var_name='Momento',
-            value_name='Score'
-        )
-        df_perf_sexo['Momento'] = df_perf_sexo['Momento'].replace({
-            'Score_Pre': 'Pré-Teste',
-            'Score_Pos': 'Pós-Teste'
-        })
-        
-        # Remover NaN para evitar problemas nos tooltips
-        df_perf_sexo = df_perf_sexo.dropna(subset=['Score'])
-        
-        # Calcular médias para cada grupo
-        medias_sexo = df_perf_sexo.groupby(['Sexo', 'Momento'], as_index=False)['Score'].mean()
-        medias_sexo.columns = ['Sexo', 'Momento', 'Media']
+        if 'Sexo' in df.columns and not df['Sexo'].isna().all():
+            # Médias de cada grupo a partir do cubo
+            resumo_sexo = cubo.resumo(selecao, por='Sexo')
+            medias_sexo = resumo_sexo.melt(
+                id_vars=['Sexo'], value_vars=['media_pre', 'media_pos'],
+                var_name='Momento', value_name='Media'
+            ).dropna(subset=['Media'])
+            medias_sexo['Momento'] = medias_sexo['Momento'].replace({
+                'media_pre': 'Pré-Teste',
+                'media_pos': 'Pós-Teste'
+            })
         
-        # Criar escala de cores
-        color_scale = alt.Scale(
-            domain=['Pré-Teste', 'Pós-Teste'],
-            range=['#636EFA', '#EF553B']
-        )
+            # Criar escala de cores
+            color_scale = alt.Scale(
+                domain=['Pré-Teste', 'Pós-Teste'],
+                range=['#636EFA', '#EF553B']
+            )
         
-        # Escala de offset para separar os boxplots
-        offset_scale = alt.Scale(
-            domain=['Pré-Teste', 'Pós-Teste'],
-            range=[-50, 50]
-        )
+            # Escala de offset para separar os boxplots
+            offset_scale = alt.Scale(
+                domain=['Pré-Teste', 'Pós-Teste'],
+                range=[-50, 50]
+            )
         
-        # Criar boxplot base
-        boxplot_sexo = alt.Chart(df_perf_sexo).mark_boxplot(
-            size=40,
-            opacity=0.7
-        ).encode(
-            x=alt.X('Sexo:N', title='Sexo', axis=alt.Axis(labelAngle=0)),
-            y=alt.Y('Score:Q', title='Score', scale=alt.Scale(zero=False)),
-            color=alt.Color('Momento:N', scale=color_scale, legend=alt.Legend(title='Momento')),
-            xOffset=alt.XOffset('Momento:N', scale=offset_scale)
-        ).properties(
-            height=400
-        )
+            # Criar boxplot base (resumido no servidor acima do limiar de linhas;
+            # formato longo memoizado pela chave dos filtros)
+            dados_box_sexo, resumido_sexo = dados_boxplot_perfil_memo(chave_filtros, df, 'Sexo')
+            boxplot_sexo = camadas_boxplot(
+                alt.Chart(dados_box_sexo), resumido_sexo,
+                x=alt.X('Sexo:N', title='Sexo', axis=alt.Axis(labelAngle=0)),
+                color=alt.Color('Momento:N', scale=color_scale, legend=alt.Legend(title='Momento')),
+                x_offset=alt.XOffset('Momento:N', scale=offset_scale),
+                escala_y=alt.Scale(zero=False),
+                size=40
+            ).properties(
+                height=400
+            )
         
-        # Adicionar círculos com as médias
-        pontos_media_sexo = alt.Chart(medias_sexo).mark_point(
-            size=100,
-            filled=True,
-            opacity=0.9,
-            stroke='white',
-            strokeWidth=2
-        ).encode(
-            x=alt.X('Sexo:N'),
-            y=alt.Y('Media:Q'),
-            color=alt.Color('Momento:N', scale=color_scale, legend=None),
-            xOffset=alt.XOffset('Momento:N', scale=offset_scale),
-            tooltip=[
-                alt.Tooltip('Sexo:N', title='Sexo'),
-                alt.Tooltip('Momento:N', title='Momento'),
-                alt.Tooltip('Media:Q', title='Média', format='.2f')
-            ]
-        )
+            # Adicionar círculos com as médias
+            pontos_media_sexo = alt.Chart(medias_sexo).mark_point(
+                size=100,
+                filled=True,
+                opacity=0.9,
+                stroke='white',
+                strokeWidth=2
+            ).encode(
+                x=alt.X('Sexo:N'),
+                y=alt.Y('Media:Q'),
+                color=alt.Color('Momento:N', scale=color_scale, legend=None),
+                xOffset=alt.XOffset('Momento:N', scale=offset_scale),
+                tooltip=[
+                    alt.Tooltip('Sexo:N', title='Sexo'),
+                    alt.Tooltip('Momento:N', title='Momento'),
+                    alt.Tooltip('Media:Q', title='Média', format='.2f')
+                ]
+            )
         
-        # Adicionar labels de média acima dos círculos
-        text_media_sexo = alt.Chart(medias_sexo).mark_text(
-            align='center',
-            baseline='bottom',
-            dy=-12,
-            fontSize=11,
-            fontWeight='bold'
-        ).encode(
-            x=alt.X('Sexo:N'),
-            y=alt.Y('Media:Q'),
-            text=alt.Text('Media:Q', format='.1f'),
-            xOffset=alt.XOffset('Momento:N', scale=offset_scale),
-            color=alt.value('black')
-        )
+            # Adicionar labels de média acima dos círculos
+            text_media_sexo = alt.Chart(medias_sexo).mark_text(
+                align='center',
+                baseline='bottom',
+                dy=-12,
+                fontSize=11,
+                fontWeight='bold'
+            ).encode(
+                x=alt.X('Sexo:N'),
+                y=alt.Y('Media:Q'),
+                text=alt.Text('Media:Q', format='.1f'),
+                xOffset=alt.XOffset('Momento:N', scale=offset_scale),
+                color=alt.value('black')
+            )
         
-        chart_final_sexo = (boxplot_sexo + pontos_media_sexo + text_media_sexo).configure_axis(
-            labelFontSize=11,
-            titleFontSize=13
-        ).configure_legend(
-            titleFontSize=12,
-            labelFontSize=11
-        )
+            chart_final_sexo = (boxplot_sexo + pontos_media_sexo + text_media_sexo).configure_axis(
+                labelFontSize=11,
+                titleFontSize=13
+            ).configure_legend(
+                titleFontSize=12,
+                labelFontSize=11
+            )
         
-        st.altair_chart(chart_final_sexo, use_container_width=True)
+            st.altair_chart(chart_final_sexo, use_container_width=True)
         
-        # Estatísticas por sexo
-        col_stat1, col_stat2 = st.columns(2)
-        for idx, sexo in enumerate(sorted(df['Sexo'].dropna().unique())):
-            df_sexo = df[df['Sexo'] == sexo]
-            with col_stat1 if idx == 0 else col_stat2:
-                st.markdown(f"**{sexo}**")
-                pre_mean = df_sexo['Score_Pre'].mean()
-                pos_mean = df_sexo['Score_Pos'].mean()
-                ganho = pos_mean - pre_mean
-                st.write(f"- Pré: {pre_mean:.2f} | Pós: {pos_mean:.2f}")
-                st.write(f"- Ganho: {ganho:.2f} ({(ganho/pre_mean*100):.1f}%)")
-    else:
-        st.info("📊 Dados de sexo não disponíveis")
+            # Estatísticas por sexo
+            col_stat1, col_stat2 = st.columns(2)
+            for idx, linha in enumerate(resumo_sexo.itertuples()):
+                with col_stat1 if idx == 0 else col_stat2:
+                    st.markdown(f"**{linha.Sexo}**")
+                    pre_mean = linha.media_pre
+                    pos_mean = linha.media_pos
+                    ganho = pos_mean - pre_mean
+                    st.write(f"- Pré: {pre_mean:.2f} | Pós: {pos_mean:.2f}")
+                    st.write(f"- Ganho: {ganho:.2f} ({(ganho/pre_mean*100):.1f}%)")
+        else:
+            st.info("📊 Dados de sexo não disponíveis")
     
-    st.markdown("---")
+        st.markdown("---")
     
-    # Performance por Faixa Etária
-    st.markdown("#### Performance por Faixa Etária (Pré vs Pós-Teste)")
+        # Performance por Faixa Etária
+        st.markdown("#### Performance por Faixa Etária (Pré vs Pós-Teste)")
     
-    if 'FaixaEtaria' in df.columns and not df['FaixaEtaria'].isna().all():
-        # Preparar dados
-        df_perf_idade = df.melt(
-            id_vars=['FaixaEtaria', 'ID_Unico'],
-            value_vars=['Score_Pre', 'Score_Pos'],
-            var_name='Momento',
-            value_name='Score'
-        )
-        df_perf_idade['Momento'] = df_perf_idade['Momento'].replace({
-            'Score_Pre': 'Pré-Teste',
-            'Score_Pos': 'Pós-Teste'
-        })
-        
-        # Remover NaN para evitar problemas nos tooltips
-        df_perf_idade = df_perf_idade.dropna(subset=['Score', 'FaixaEtaria'])
-        
-        # Ordenar faixas
-        ordem_faixas = ['< 10 anos', '10-11 anos', '12-13 anos', '14-15 anos', '≥ 16 anos']
-        df_perf_idade['FaixaEtaria'] = pd.Categorical(
-            df_perf_idade['FaixaEtaria'],
-            categories=ordem_faixas,
-            ordered=True
-        )
-        df_perf_idade = df_perf_idade.sort_values('FaixaEtaria')
+        if 'FaixaEtaria' in df.columns and not df['FaixaEtaria'].isna().all():
+            # Ordenar faixas
+            ordem_faixas = ['< 10 anos', '10-11 anos', '12-13 anos', '14-15 anos', '≥ 16 anos']
         
-        # Calcular médias
-        medias_idade = df_perf_idade.groupby(['FaixaEtaria', 'Momento'], as_index=False)['Score'].mean()
-        medias_idade.columns = ['FaixaEtaria', 'Momento', 'Media']
+            # Médias de cada faixa a partir do cubo
+            resumo_faixa = cubo.resumo(selecao, por='FaixaEtaria').set_index('FaixaEtaria')
+            medias_idade = resumo_faixa.reset_index().melt(
+                id_vars=['FaixaEtaria'], value_vars=['media_pre', 'media_pos'],
+                var_name='Momento', value_name='Media'
+            ).dropna(subset=['Media'])
+            medias_idade['Momento'] = medias_idade['Momento'].replace({
+                'media_pre': 'Pré-Teste',
+                'media_pos': 'Pós-Teste'
+            })
         
-        # Criar escala de cores
-        color_scale = alt.Scale(
-            domain=['Pré-Teste', 'Pós-Teste'],
-            range=['#636EFA', '#EF553B']
-        )
+            # Criar escala de cores
+            color_scale = alt.Scale(
+                domain=['Pré-Teste', 'Pós-Teste'],
+                range=['#636EFA', '#EF553B']
+            )
         
-        # Escala de offset
-        offset_scale = alt.Scale(
-            domain=['Pré-Teste', 'Pós-Teste'],
-            range=[-35, 35]
-        )
+            # Escala de offset
+            offset_scale = alt.Scale(
+                domain=['Pré-Teste', 'Pós-Teste'],
+                range=[-35, 35]
+            )
         
-        # Criar boxplot
-        boxplot_idade = alt.Chart(df_perf_idade).mark_boxplot(
-            size=30,
-            opacity=0.7
-        ).encode(
-            x=alt.X('FaixaEtaria:N', 
-                   title='Faixa Etária',
-                   sort=ordem_faixas,
-                   axis=alt.Axis(labelAngle=-45)),
-            y=alt.Y('Score:Q', 
-                   title='Score',
-                   scale=alt.Scale(zero=False)),
-            color=alt.Color('Momento:N', 
-                           scale=color_scale,
-                           legend=alt.Legend(title='Momento')),
-            xOffset=alt.XOffset('Momento:N', scale=offset_scale)
-        ).properties(
-            height=400
-        )
+            # Criar boxplot (resumido no servidor acima do limiar de linhas;
+            # formato longo memoizado pela chave dos filtros)
+            dados_box_idade, resumido_idade = dados_boxplot_perfil_memo(
+                chave_filtros, df, 'FaixaEtaria', tuple(ordem_faixas)
+            )
+            boxplot_idade = camadas_boxplot(
+                alt.Chart(dados_box_idade), resumido_idade,
+                x=alt.X('FaixaEtaria:N', 
+                       title='Faixa Etária',
+                       sort=ordem_faixas,
+                       axis=alt.Axis(labelAngle=-45)),
+                color=alt.Color('Momento:N', 
+                               scale=color_scale,
+                               legend=alt.Legend(title='Momento')),
+                x_offset=alt.XOffset('Momento:N', scale=offset_scale),
+                escala_y=alt.Scale(zero=False),
+                size=30
+            ).properties(
+                height=400
+            )
         
-        # Adicionar círculos com as médias
-        pontos_media_idade = alt.Chart(medias_idade).mark_point(
-            size=80,
-            filled=True,
-            opacity=0.9,
-            stroke='white',
-            strokeWidth=2
-        ).encode(
-            x=alt.X('FaixaEtaria:N', sort=ordem_faixas),
-            y=alt.Y('Media:Q'),
-            color=alt.Color('Momento:N', scale=color_scale, legend=None),
-            xOffset=alt.XOffset('Momento:N', scale=offset_scale),
-            tooltip=[
-                alt.Tooltip('FaixaEtaria:N', title='Faixa Etária'),
-                alt.Tooltip('Momento:N', title='Momento'),
-                alt.Tooltip('Media:Q', title='Média', format='.2f')
-            ]
-        )
+            # Adicionar círculos com as médias
+            pontos_media_idade = alt.Chart(medias_idade).mark_point(
+                size=80,
+                filled=True,
+                opacity=0.9,
+                stroke='white',
+                strokeWidth=2
+            ).encode(
+                x=alt.X('FaixaEtaria:N', sort=ordem_faixas),
+                y=alt.Y('Media:Q'),
+                color=alt.Color('Momento:N', scale=color_scale, legend=None),
+                xOffset=alt.XOffset('Momento:N', scale=offset_scale),
+                tooltip=[
+                    alt.Tooltip('FaixaEtaria:N', title='Faixa Etária'),
+                    alt.Tooltip('Momento:N', title='Momento'),
+                    alt.Tooltip('Media:Q', title='Média', format='.2f')
+                ]
+            )
         
-        # Adicionar labels de média acima dos círculos
-        text_media_idade = alt.Chart(medias_idade).mark_text(
-            align='center',
-            baseline='bottom',
-            dy=-12,
-            fontSize=10,
-            fontWeight='bold'
-        ).encode(
-            x=alt.X('FaixaEtaria:N', sort=ordem_faixas),
-            y=alt.Y('Media:Q'),
-            text=alt.Text('Media:Q', format='.1f'),
-            xOffset=alt.XOffset('Momento:N', scale=offset_scale),
-            color=alt.value('black')
-        )
+            # Adicionar labels de média acima dos círculos
+            text_media_idade = alt.Chart(medias_idade).mark_text(
+                align='center',
+                baseline='bottom',
+                dy=-12,
+                fontSize=10,
+                fontWeight='bold'
+            ).encode(
+                x=alt.X('FaixaEtaria:N', sort=ordem_faixas),
+                y=alt.Y('Media:Q'),
+                text=alt.Text('Media:Q', format='.1f'),
+                xOffset=alt.XOffset('Momento:N', scale=offset_scale),
+                color=alt.value('black')
+            )
         
-        chart_final_idade = (boxplot_idade + pontos_media_idade + text_media_idade).configure_axis(
-            labelFontSize=11,
-            titleFontSize=13
-        ).configure_legend(
-            titleFontSize=12,
-            labelFontSize=11
-        )
+            chart_final_idade = (boxplot_idade + pontos_media_idade + text_media_idade).configure_axis(
+                labelFontSize=11,
+                titleFontSize=13
+            ).configure_legend(
+                titleFontSize=12,
+                labelFontSize=11
+            )
         
-        st.altair_chart(chart_final_idade, use_container_width=True)
+            st.altair_chart(chart_final_idade, use_container_width=True)
         
-        # Tabela de estatísticas por faixa etária
-        st.markdown("**Estatísticas por Faixa Etária**")
+            # Tabela de estatísticas por faixa etária
+            st.markdown("**Estatísticas por Faixa Etária**")
         
-        stats_list = []
-        for faixa in ordem_faixas:
-            df_faixa = df[df['FaixaEtaria'] == faixa]
-            if len(df_faixa) > 0:
-                pre_mean = df_faixa['Score_Pre'].mean()
-                pos_mean = df_faixa['Score_Pos'].mean()
-                ganho = pos_mean - pre_mean
-                n_alunos = df_faixa['ID_Unico'].nunique()
-                
-                stats_list.append({
-                    'Faixa Etária': faixa,
-                    'N Alunos': n_alunos,
-                    'Pré (μ)': f"{pre_mean:.2f}",
-                    'Pós (μ)': f"{pos_mean:.2f}",
-                    'Ganho': f"{ganho:.2f}",
-                    'Ganho %': f"{(ganho/pre_mean*100):.1f}%"
-                })
+            stats_list = []
+            for faixa in ordem_faixas:
+                if faixa in resumo_faixa.index:
+                    pre_mean = resumo_faixa.at[faixa, 'media_pre']
+                    pos_mean = resumo_faixa.at[faixa, 'media_pos']
+                    ganho = pos_mean - pre_mean
+                    n_alunos = int(resumo_faixa.at[faixa, 'n_alunos'])
+                
+                    stats_list.append({
+                        'Faixa Etária': faixa,
+                        'N Alunos': n_alunos,
+                        'Pré (μ)': f"{pre_mean:.2f}",
+                        'Pós (μ)': f"{pos_mean:.2f}",
+                        'Ganho': f"{ganho:.2f}",
+                        'Ganho %': f"{(ganho/pre_mean*100):.1f}%"
+                    })
         
-        if stats_list:
-            df_stats = pd.DataFrame(stats_list)
-            st.dataframe(df_stats, use_container_width=True, hide_index=True)
-    else:
-        st.info("📊 Dados de idade não disponíveis")
+            if stats_list:
+                df_stats = pd.DataFrame(stats_list)
+                st.dataframe(df_stats, use_container_width=True, hide_index=True)
+        else:
+            st.info("📊 Dados de idade não disponíveis")
 
 st.markdown("---")
 
 # ========== ANÁLISES PRINCIPAIS (LADO A LADO) ==========
-if not df.empty:
-    col_box, col_gran = st.columns([1.3, 1], gap="large")
+@st.fragment
+@monitor.cronometrar('analises')
+def secao_analises_principais(df, monitor, chave_filtros, selecao, cubo, prova_sel, fases_sel, turmas_sel, coluna_turma):
+    """Boxplot por fase, ganho médio por fase e análise por questão (rerun isolado)."""
+    if not df.empty:
+        col_box, col_gran = st.columns([1.3, 1], gap="large")
     
-    # ========== COLUNA 1: BOXPLOT ==========
-    with col_box:
-        with st.container(border=True, height=750):
-            st.markdown("### 📊 Distribuição de Scores por Fase")
+        # ========== COLUNA 1: BOXPLOT ==========
+        with col_box, monitor.secao('boxplot'):
+            with st.container(border=True, height=750):
+                st.markdown("### 📊 Distribuição de Scores por Fase")
             
-            # Controle de visualização por turmas
-            visualizar_por_turmas = False
-            if turmas_sel and len(turmas_sel) > 0:
-                visualizar_por_turmas = st.checkbox(
-                    "📋 Separar por Turma", 
-                    value=False,
-                    help="Ative para visualizar cada turma separadamente no gráfico"
-                )
-            
-            try:
-                import altair as alt
-                
-                # Transformar dados para formato longo
-                if visualizar_por_turmas:
-                    df_boxplot = df.melt(
-                        id_vars=['Fase', coluna_turma], 
-                        value_vars=['Score_Pre', 'Score_Pos'],
-                        var_name='Momento', 
-                        value_name='Score'
+                # Controle de visualização por turmas
+                visualizar_por_turmas = False
+                if turmas_sel and len(turmas_sel) > 0:
+                    visualizar_por_turmas = st.checkbox(
+                        "📋 Separar por Turma", 
+                        value=False,
+                        help="Ative para visualizar cada turma separadamente no gráfico"
                     )
-                else:
-                    df_boxplot = df.melt(
-                        id_vars=['Fase'], 
-                        value_vars=['Score_Pre', 'Score_Pos'],
-                        var_name='Momento', 
-                        value_name='Score'
+            
+                try:
+                    # Formato longo + quartis/médias/outliers por grupo (linhas brutas
+                    # só abaixo do limiar), memoizados pela chave dos filtros
+                    dados_box, resumido, grupos_box, turmas_no_grafico = dados_boxplot_memo(
+                        chave_filtros, df, coluna_turma if visualizar_por_turmas else None
                     )
                 
-                df_boxplot['Momento'] = df_boxplot['Momento'].replace({
-                    'Score_Pre': 'Pré-Teste',
-                    'Score_Pos': 'Pós-Teste'
-                })
+                    # Médias por grupo (já calculadas no resumo)
+                    medias = dados_box.loc[dados_box['tipo'] == 'caixa', grupos_box + ['Media']]
                 
-                df_boxplot['Fase_str'] = df_boxplot['Fase'].astype(int).astype(str)
+                    # Criar boxplot
+                    color_scale = alt.Scale(domain=['Pré-Teste', 'Pós-Teste'], range=['#636EFA', '#EF553B'])
+                    offset_scale = alt.Scale(domain=['Pré-Teste', 'Pós-Teste'], range=[-40, 40])
                 
-                # Calcular médias
-                if visualizar_por_turmas:
-                    medias = df_boxplot.groupby(['Fase', 'Fase_str', coluna_turma, 'Momento'])['Score'].mean().reset_index()
-                else:
-                    medias = df_boxplot.groupby(['Fase', 'Fase_str', 'Momento'])['Score'].mean().reset_index()
-                medias = medias.rename(columns={'Score': 'Media'})
-                
-                # Criar boxplot
-                color_scale = alt.Scale(domain=['Pré-Teste', 'Pós-Teste'], range=['#636EFA', '#EF553B'])
-                offset_scale = alt.Scale(domain=['Pré-Teste', 'Pós-Teste'], range=[-40, 40])
-                
-                if visualizar_por_turmas:
-                    base_chart = alt.Chart(df_boxplot)
+                    if visualizar_por_turmas:
+                        base_chart = alt.Chart(dados_box)
+
+                        num_facetas = len(turmas_no_grafico) if len(turmas_no_grafico) > 0 else 1
                     
-                    turmas_no_grafico = df_boxplot[coluna_turma].dropna().unique()
-                    num_facetas = len(turmas_no_grafico) if len(turmas_no_grafico) > 0 else 1
+                        if num_facetas <= 2:
+                            facet_width = 320
+                            facet_spacing = 80
+                            facet_columns = num_facetas
+                        elif num_facetas == 3:
+                            facet_width = 260
+                            facet_spacing = 60
+                            facet_columns = 3
+                        else:
+                            facet_width = 230
+                            facet_spacing = 50
+                            facet_columns = min(num_facetas, 4)
                     
-                    if num_facetas <= 2:
-                        facet_width = 320
-                        facet_spacing = 80
-                        facet_columns = num_facetas
-                    elif num_facetas == 3:
-                        facet_width = 260
-                        facet_spacing = 60
-                        facet_columns = 3
-                    else:
-                        facet_width = 230
-                        facet_spacing = 50
-                        facet_columns = min(num_facetas, 4)
+                        boxplot_layer = camadas_boxplot(
+                            base_chart, resumido,
+                            x=alt.X('Fase_str:N', title='Fase', axis=alt.Axis(labelAngle=0)),
+                            color=alt.Color('Momento:N', scale=color_scale, legend=alt.Legend(title='Teste')),
+                            x_offset=alt.XOffset('Momento:N', scale=offset_scale),
+                            size=30
+                        )
                     
-                    boxplot_layer = base_chart.mark_boxplot(
-                        size=30,
-                        opacity=0.7
-                    ).encode(
-                        x=alt.X('Fase_str:N', title='Fase', axis=alt.Axis(labelAngle=0)),
-                        y=alt.Y('Score:Q', title='Score'),
-                        color=alt.Color('Momento:N', scale=color_scale, legend=alt.Legend(title='Teste')),
-                        xOffset=alt.XOffset('Momento:N', scale=offset_scale)
-                    )
+                        # Médias já calculadas por grupo nas linhas do resumo
+                        medias_chart = base_chart.transform_filter(alt.datum.tipo == 'caixa')
                     
-                    pontos_media_layer = base_chart.transform_aggregate(
-                        Media='mean(Score)',
-                        groupby=['Fase', 'Fase_str', coluna_turma, 'Momento']
-                    ).mark_point(
-                        size=80,
-                        filled=True,
-                        opacity=0.9,
-                        stroke='white',
-                        strokeWidth=2
-                    ).encode(
-                        x=alt.X('Fase_str:N'),
-                        y=alt.Y('Media:Q'),
-                        color=alt.Color('Momento:N', scale=color_scale, legend=None),
-                        xOffset=alt.XOffset('Momento:N', scale=offset_scale),
-                        tooltip=[
-                            alt.Tooltip('Fase:Q', title='Fase', format='d'),
-                            alt.Tooltip(f'{coluna_turma}:N', title='Turma'),
-                            alt.Tooltip('Momento:N', title='Teste'),
-                            alt.Tooltip('Media:Q', title='Média', format='.2f')
-                        ]
-                    )
+                        pontos_media_layer = medias_chart.mark_point(
+                            size=80,
+                            filled=True,
+                            opacity=0.9,
+                            stroke='white',
+                            strokeWidth=2
+                        ).encode(
+                            x=alt.X('Fase_str:N'),
+                            y=alt.Y('Media:Q'),
+                            color=alt.Color('Momento:N', scale=color_scale, legend=None),
+                            xOffset=alt.XOffset('Momento:N', scale=offset_scale),
+                            tooltip=[
+                                alt.Tooltip('Fase:Q', title='Fase', format='d'),
+                                alt.Tooltip(f'{coluna_turma}:N', title='Turma'),
+                                alt.Tooltip('Momento:N', title='Teste'),
+                                alt.Tooltip('Media:Q', title='Média', format='.2f')
+                            ]
+                        )
                     
-                    # Adicionar labels de média acima dos círculos
-                    text_media_layer = base_chart.transform_aggregate(
-                        Media='mean(Score)',
-                        groupby=['Fase', 'Fase_str', coluna_turma, 'Momento']
-                    ).mark_text(
-                        align='center',
-                        baseline='bottom',
-                        dy=-12,
-                        fontSize=10,
-                        fontWeight='bold'
-                    ).encode(
-                        x=alt.X('Fase_str:N'),
-                        y=alt.Y('Media:Q'),
-                        text=alt.Text('Media:Q', format='.1f'),
-                        xOffset=alt.XOffset('Momento:N', scale=offset_scale),
-                        color=alt.value('black')
-                    )
+                        # Adicionar labels de média acima dos círculos
+                        text_media_layer = medias_chart.mark_text(
+                            align='center',
+                            baseline='bottom',
+                            dy=-12,
+                            fontSize=10,
+                            fontWeight='bold'
+                        ).encode(
+                            x=alt.X('Fase_str:N'),
+                            y=alt.Y('Media:Q'),
+                            text=alt.Text('Media:Q', format='.1f'),
+                            xOffset=alt.XOffset('Momento:N', scale=offset_scale),
+                            color=alt.value('black')
+                        )
                     
-                    combined = alt.layer(boxplot_layer, pontos_media_layer, text_media_layer).properties(
-                        width=facet_width,
-                        height=380
-                    )
+                        combined = alt.layer(boxplot_layer, pontos_media_layer, text_media_layer).properties(
+                            width=facet_width,
+                            height=380
+                        )
                     
-                    boxplot = combined.facet(
-                        facet=alt.Facet(f'{coluna_turma}:N', title='Turma', 
-                                       header=alt.Header(labelAngle=0, labelFontSize=12)),
-                        columns=facet_columns
-                    )
+                        boxplot = combined.facet(
+                            facet=alt.Facet(f'{coluna_turma}:N', title='Turma', 
+                                           header=alt.Header(labelAngle=0, labelFontSize=12)),
+                            columns=facet_columns
+                        )
                     
-                    chart_final = boxplot.properties(
-                        title=f'Comparativo por Turma ({len(turmas_sel)} turma(s))'
-                    ).configure_axis(
-                        labelFontSize=11,
-                        titleFontSize=13
-                    ).configure_title(
-                        fontSize=14,
-                        anchor='start'
-                    ).configure_legend(
-                        titleFontSize=12,
-                        labelFontSize=11
-                    ).configure_view(
-                        strokeWidth=0
-                    ).configure_facet(
-                        spacing=facet_spacing
-                    )
+                        chart_final = boxplot.properties(
+                            title=f'Comparativo por Turma ({len(turmas_sel)} turma(s))'
+                        ).configure_axis(
+                            labelFontSize=11,
+                            titleFontSize=13
+                        ).configure_title(
+                            fontSize=14,
+                            anchor='start'
+                        ).configure_legend(
+                            titleFontSize=12,
+                            labelFontSize=11
+                        ).configure_view(
+                            strokeWidth=0
+                        ).configure_facet(
+                            spacing=facet_spacing
+                        )
                     
-                else:
-                    boxplot = alt.Chart(df_boxplot).mark_boxplot(
-                        size=36,
-                        opacity=0.7
+                    else:
+                        boxplot = camadas_boxplot(
+                            alt.Chart(dados_box), resumido,
+                            x=alt.X('Fase_str:N', 
+                                   title='Fase',
+                                   axis=alt.Axis(labelAngle=0)),
+                            color=alt.Color('Momento:N', scale=color_scale, legend=alt.Legend(title='Teste')),
+                            x_offset=alt.XOffset('Momento:N', scale=offset_scale),
+                            size=36
+                        ).properties(
+                            width=600,
+                            height=380
+                        )
+                    
+                        pontos_media = alt.Chart(medias).mark_point(
+                            size=100,
+                            filled=True,
+                            opacity=0.9,
+                            stroke='white',
+                            strokeWidth=2
+                        ).encode(
+                            x=alt.X('Fase_str:N'),
+                            y=alt.Y('Media:Q'),
+                            color=alt.Color('Momento:N', scale=color_scale, legend=None),
+                            xOffset=alt.XOffset('Momento:N', scale=offset_scale),
+                            tooltip=[
+                                alt.Tooltip('Fase:Q', title='Fase', format='d'),
+                                alt.Tooltip('Momento:N', title='Teste'),
+                                alt.Tooltip('Media:Q', title='Média', format='.2f')
+                            ]
+                        )
+                    
+                        # Adicionar labels de média acima dos círculos
+                        text_media = alt.Chart(medias).mark_text(
+                            align='center',
+                            baseline='bottom',
+                            dy=-12,
+                            fontSize=10,
+                            fontWeight='bold'
+                        ).encode(
+                            x=alt.X('Fase_str:N'),
+                            y=alt.Y('Media:Q'),
+                            text=alt.Text('Media:Q', format='.1f'),
+                            xOffset=alt.XOffset('Momento:N', scale=offset_scale),
+                            color=alt.value('black')
+                        )
+                    
+                        titulo = 'Distribuição Pré-Teste vs Pós-Teste por Fase'
+                    
+                        chart_final = (boxplot + pontos_media + text_media).properties(
+                            title=titulo
+                        ).configure_axis(
+                            labelFontSize=12,
+                            titleFontSize=14
+                        ).configure_title(
+                            fontSize=15,
+                            anchor='start'
+                        ).configure_legend(
+                            titleFontSize=13,
+                            labelFontSize=12
+                        )
+                
+                    st.altair_chart(chart_final, use_container_width=True)
+                
+                    if visualizar_por_turmas and turmas_sel:
+                        st.caption(f"📊 Comparação entre {len(turmas_sel)} turma(s)")
+                
+                    # ========== GRÁFICO DE DELTA MÉDIO POR FASE ==========
+                    st.markdown("---")
+                    st.markdown("#### 📊 Ganho Médio por Fase")
+                    st.caption("Diferença entre Pós-Teste e Pré-Teste (Delta = Pós - Pré)")
+                
+                    # Calcular delta médio por fase
+                    resumo_fase = cubo.resumo(selecao, por='Fase')
+                    df_delta_fase = pd.DataFrame({
+                        'Fase': pd.to_numeric(resumo_fase['Fase']),
+                        'Delta_Medio': resumo_fase['media_pos'] - resumo_fase['media_pre'],
+                        'N_Alunos': resumo_fase['n_linhas'].astype(int)
+                    })
+                
+                    df_delta_fase['Fase_str'] = df_delta_fase['Fase'].astype(int).astype(str)
+                    df_delta_fase['Cor'] = df_delta_fase['Delta_Medio'].apply(
+                        lambda x: '#28a745' if x > 0 else '#dc3545' if x < 0 else '#6c757d'
+                    )
+                
+                    # Criar gráfico de barras com Altair
+                    bar_delta = alt.Chart(df_delta_fase).mark_bar(
+                        cornerRadiusTopLeft=4,
+                        cornerRadiusTopRight=4,
+                        opacity=0.85
                     ).encode(
                         x=alt.X('Fase_str:N', 
                                title='Fase',
                                axis=alt.Axis(labelAngle=0)),
-                        y=alt.Y('Score:Q', 
-                               title='Score'),
-                        color=alt.Color('Momento:N', scale=color_scale, legend=alt.Legend(title='Teste')),
-                        xOffset=alt.XOffset('Momento:N', scale=offset_scale)
+                        y=alt.Y('Delta_Medio:Q', 
+                               title='Ganho Médio (Pós - Pré)',
+                               scale=alt.Scale(domain=[
+                                   min(0, df_delta_fase['Delta_Medio'].min() - 1),
+                                   df_delta_fase['Delta_Medio'].max() + 1
+                               ])),
+                        color=alt.Color('Cor:N', scale=None, legend=None),
+                        tooltip=[
+                            alt.Tooltip('Fase:Q', title='Fase', format='d'),
+                            alt.Tooltip('Delta_Medio:Q', title='Ganho Médio', format='.2f'),
+                            alt.Tooltip('N_Alunos:Q', title='Nº Alunos', format='d')
+                        ]
                     ).properties(
                         width=600,
-                        height=380
+                        height=180
                     )
-                    
-                    pontos_media = alt.Chart(medias).mark_point(
-                        size=100,
-                        filled=True,
-                        opacity=0.9,
-                        stroke='white',
-                        strokeWidth=2
+                
+                    # Adicionar linha de referência no zero
+                    rule_zero = alt.Chart(pd.DataFrame({'y': [0]})).mark_rule(
+                        strokeDash=[5, 5],
+                        color='gray',
+                        strokeWidth=1.5
                     ).encode(
-                        x=alt.X('Fase_str:N'),
-                        y=alt.Y('Media:Q'),
-                        color=alt.Color('Momento:N', scale=color_scale, legend=None),
-                        xOffset=alt.XOffset('Momento:N', scale=offset_scale),
-                        tooltip=[
-                            alt.Tooltip('Fase:Q', title='Fase', format='d'),
-                            alt.Tooltip('Momento:N', title='Teste'),
-                            alt.Tooltip('Media:Q', title='Média', format='.2f')
-                        ]
+                        y='y:Q'
                     )
-                    
-                    # Adicionar labels de média acima dos círculos
-                    text_media = alt.Chart(medias).mark_text(
+                
+                    # Adicionar rótulos de valores nas barras
+                    text_delta = alt.Chart(df_delta_fase).mark_text(
                         align='center',
                         baseline='bottom',
-                        dy=-12,
-                        fontSize=10,
+                        dy=-5,
+                        fontSize=12,
                         fontWeight='bold'
                     ).encode(
                         x=alt.X('Fase_str:N'),
-                        y=alt.Y('Media:Q'),
-                        text=alt.Text('Media:Q', format='.1f'),
-                        xOffset=alt.XOffset('Momento:N', scale=offset_scale),
+                        y=alt.Y('Delta_Medio:Q'),
+                        text=alt.Text('Delta_Medio:Q', format='.2f'),
                         color=alt.value('black')
                     )
-                    
-                    titulo = 'Distribuição Pré-Teste vs Pós-Teste por Fase'
-                    
-                    chart_final = (boxplot + pontos_media + text_media).properties(
-                        title=titulo
-                    ).configure_axis(
-                        labelFontSize=12,
-                        titleFontSize=14
-                    ).configure_title(
-                        fontSize=15,
-                        anchor='start'
-                    ).configure_legend(
-                        titleFontSize=13,
-                        labelFontSize=12
-                    )
-                
-                st.altair_chart(chart_final, use_container_width=True)
-                
-                if visualizar_por_turmas and turmas_sel:
-                    st.caption(f"📊 Comparação entre {len(turmas_sel)} turma(s)")
-                
-                # ========== GRÁFICO DE DELTA MÉDIO POR FASE ==========
-                st.markdown("---")
-                st.markdown("#### 📊 Ganho Médio por Fase")
-                st.caption("Diferença entre Pós-Teste e Pré-Teste (Delta = Pós - Pré)")
-                
-                # Calcular delta médio por fase
-                df_delta_fase = df.groupby('Fase', as_index=False).apply(
-                    lambda x: pd.Series({
-                        'Delta_Medio': x['Score_Pos'].mean() - x['Score_Pre'].mean(),
-                        'N_Alunos': len(x)
-                    }), include_groups=False
-                ).reset_index(drop=True)
-                
-                df_delta_fase['Fase_str'] = df_delta_fase['Fase'].astype(int).astype(str)
-                df_delta_fase['Cor'] = df_delta_fase['Delta_Medio'].apply(
-                    lambda x: '#28a745' if x > 0 else '#dc3545' if x < 0 else '#6c757d'
-                )
-                
-                # Criar gráfico de barras com Altair
-                bar_delta = alt.Chart(df_delta_fase).mark_bar(
-                    cornerRadiusTopLeft=4,
-                    cornerRadiusTopRight=4,
-                    opacity=0.85
-                ).encode(
-                    x=alt.X('Fase_str:N', 
-                           title='Fase',
-                           axis=alt.Axis(labelAngle=0)),
-                    y=alt.Y('Delta_Medio:Q', 
-                           title='Ganho Médio (Pós - Pré)',
-                           scale=alt.Scale(domain=[
-                               min(0, df_delta_fase['Delta_Medio'].min() - 1),
-                               df_delta_fase['Delta_Medio'].max() + 1
-                           ])),
-                    color=alt.Color('Cor:N', scale=None, legend=None),
-                    tooltip=[
-                        alt.Tooltip('Fase:Q', title='Fase', format='d'),
-                        alt.Tooltip('Delta_Medio:Q', title='Ganho Médio', format='.2f'),
-                        alt.Tooltip('N_Alunos:Q', title='Nº Alunos', format='d')
-                    ]
-                ).properties(
-                    width=600,
-                    height=180
-                )
                 
-                # Adicionar linha de referência no zero
-                rule_zero = alt.Chart(pd.DataFrame({'y': [0]})).mark_rule(
-                    strokeDash=[5, 5],
-                    color='gray',
-                    strokeWidth=1.5
-                ).encode(
-                    y='y:Q'
-                )
-                
-                # Adicionar rótulos de valores nas barras
-                text_delta = alt.Chart(df_delta_fase).mark_text(
-                    align='center',
-                    baseline='bottom',
-                    dy=-5,
-                    fontSize=12,
-                    fontWeight='bold'
-                ).encode(
-                    x=alt.X('Fase_str:N'),
-                    y=alt.Y('Delta_Medio:Q'),
-                    text=alt.Text('Delta_Medio:Q', format='.2f'),
-                    color=alt.value('black')
-                )
-                
-                chart_delta_final = (bar_delta + rule_zero + text_delta).configure_axis(
-                    labelFontSize=11,
-                    titleFontSize=12
-                ).configure_view(
-                    strokeWidth=0
-                )
-                
-                st.altair_chart(chart_delta_final, use_container_width=True)
+                    chart_delta_final = (bar_delta + rule_zero + text_delta).configure_axis(
+                        labelFontSize=11,
+                        titleFontSize=12
+                    ).configure_view(
+                        strokeWidth=0
+                    )
                 
-                # Informação adicional
-                melhor_fase = df_delta_fase.loc[df_delta_fase['Delta_Medio'].idxmax()]
-                st.caption(f"🏆 **Maior ganho:** Fase {int(melhor_fase['Fase'])} com +{melhor_fase['Delta_Medio']:.2f} pontos ({int(melhor_fase['N_Alunos'])} alunos)")
+                    st.altair_chart(chart_delta_final, use_container_width=True)
                 
-            except ImportError:
-                st.warning("⚠️ Altair não disponível. Usando Plotly...")
+                    # Informação adicional
+                    melhor_fase = df_delta_fase.loc[df_delta_fase['Delta_Medio'].idxmax()]
+                    st.caption(f"🏆 **Maior ganho:** Fase {int(melhor_fase['Fase'])} com +{melhor_fase['Delta_Medio']:.2f} pontos ({int(melhor_fase['N_Alunos'])} alunos)")
                 
-                df_boxplot = df.melt(
-                    id_vars=['Fase'], 
-                    value_vars=['Score_Pre', 'Score_Pos'],
-                    var_name='Momento', 
-                    value_name='Score'
-                )
-                df_boxplot['Momento'] = df_boxplot['Momento'].replace({
-                    'Score_Pre': 'Pré-Teste',
-                    'Score_Pos': 'Pós-Teste'
-                })
+                except ImportError:
+                    st.warning("⚠️ Altair não disponível. Usando Plotly...")
+                    import plotly.express as px
                 
-                fig_fase = px.box(
-                    df_boxplot,
-                    x='Fase',
-                    y='Score',
-                    color='Momento',
-                    title='Distribuição Pré-Teste vs Pós-Teste por Fase',
-                    labels={'Score': 'Score', 'Momento': 'Teste'},
-                    points='outliers'
-                )
+                    df_boxplot = df.melt(
+                        id_vars=['Fase'], 
+                        value_vars=['Score_Pre', 'Score_Pos'],
+                        var_name='Momento', 
+                        value_name='Score'
+                    )
+                    df_boxplot['Momento'] = df_boxplot['Momento'].replace({
+                        'Score_Pre': 'Pré-Teste',
+                        'Score_Pos': 'Pós-Teste'
+                    })
+                
+                    fig_fase = px.box(
+                        df_boxplot,
+                        x='Fase',
+                        y='Score',
+                        color='Momento',
+                        title='Distribuição Pré-Teste vs Pós-Teste por Fase',
+                        labels={'Score': 'Score', 'Momento': 'Teste'},
+                        points='outliers'
+                    )
                 
-                fases_disponiveis = sorted(df_boxplot['Fase'].unique())
-                fig_fase.update_xaxes(
-                    tickmode='array',
-                    tickvals=fases_disponiveis,
-                    ticktext=[str(int(fase)) for fase in fases_disponiveis],
-                    title='Fase'
-                )
+                    fases_disponiveis = sorted(df_boxplot['Fase'].unique())
+                    fig_fase.update_xaxes(
+                        tickmode='array',
+                        tickvals=fases_disponiveis,
+                        ticktext=[str(int(fase)) for fase in fases_disponiveis],
+                        title='Fase'
+                    )
                 
-                st.plotly_chart(fig_fase, use_container_width=True)
+                    st.plotly_chart(fig_fase, use_container_width=True)
     
-    # ========== COLUNA 2: ANÁLISE GRANULAR ==========
-    with col_gran:
-        with st.container(border=True, height=750):
-            st.markdown("### 🔍 Análise por Questão")
+        # ========== COLUNA 2: ANÁLISE GRANULAR ==========
+        with col_gran, monitor.secao('palavras'):
+            with st.container(border=True, height=750):
+                st.markdown("### 🔍 Análise por Questão")
             
-            questao_cols = [col for col in df.columns if col.startswith('Q') and ('_Pre' in col or '_Pos' in col)]
+                questao_cols = [col for col in df.columns if col.startswith('Q') and ('_Pre' in col or '_Pos' in col)]
             
-            if questao_cols:
-                # Carregar mapeamento de questões para palavras POR FASE
-                import json
-                import os
-                
-                mapeamento_palavras = {}
-                # Tentar carregar RespostaVocabulario.json de cada fase selecionada
-                for fase in fases_sel:
-                    try:
-                        # Primeiro tenta o arquivo específico da fase
-                        path_fase = os.path.join(os.path.dirname(__file__), '..', 'Data', f'Fase {int(fase)}', 'RespostaVocabulario.json')
-                        if os.path.exists(path_fase):
-                            with open(path_fase, 'r', encoding='utf-8') as f:
-                                respostas = json.load(f)
-                                for item in respostas:
-                                    for q_key, q_data in item.items():
-                                        if 'Palavra Trabalhada' in q_data:
-                                            mapeamento_palavras[q_key] = q_data['Palavra Trabalhada']
-                    except Exception as e:
-                        pass
-                
-                # Se não encontrou nada, tenta o arquivo geral
-                if not mapeamento_palavras:
-                    try:
-                        path_respostas = os.path.join(os.path.dirname(__file__), '..', 'Data', 'RespostaVocabulario.json')
-                        if os.path.exists(path_respostas):
-                            with open(path_respostas, 'r', encoding='utf-8') as f:
-                                respostas = json.load(f)
-                                for item in respostas:
-                                    for q_key, q_data in item.items():
-                                        if 'Palavra Trabalhada' in q_data:
-                                            mapeamento_palavras[q_key] = q_data['Palavra Trabalhada']
-                    except Exception as e:
-                        pass
-                
-                questoes_nums = set()
-                for col in questao_cols:
-                    if '_Pre' in col:
-                        q_num = col.split('_Pre')[0]
-                        questoes_nums.add(q_num)
-                
-                questoes_nums = sorted(list(questoes_nums), key=lambda x: int(x[1:]))
-                
-                analise_questoes = []
-                for q_num in questoes_nums:
-                    col_pre = f"{q_num}_Pre"
-                    col_pos = f"{q_num}_Pos"
-                    
-                    if col_pre in df.columns and col_pos in df.columns:
-                        pct_pre = (df[col_pre].sum() / df[col_pre].count()) * 100 if df[col_pre].count() > 0 else 0
-                        pct_pos = (df[col_pos].sum() / df[col_pos].count()) * 100 if df[col_pos].count() > 0 else 0
-                        variacao = pct_pos - pct_pre
-                        
-                        # Usar palavra se disponível, senão usar Q1, Q2, etc.
-                        palavra = mapeamento_palavras.get(q_num, q_num)
-                        
-                        analise_questoes.append({
-                            'Palavra': palavra,
-                            '% Pré': pct_pre,
-                            '% Pós': pct_pos,
-                            'Δ': variacao
-                        })
-                
-                if analise_questoes:
-                    df_analise = pd.DataFrame(analise_questoes)
-                    df_analise_sorted = df_analise.sort_values('Δ', ascending=False)
-                    
-                    # Carregar palavras ensinadas se for Vocabulário
-                    palavras_ensinadas_todas = set()
-                    if prova_sel.upper().startswith('VOCABUL'):
-                        palavras_por_fase = carregar_palavras_ensinadas()
-                        # Juntar palavras de todas as fases selecionadas
-                        for fase in fases_sel:
-                            if fase in palavras_por_fase:
-                                palavras_ensinadas_todas.update(palavras_por_fase[fase])
+                if questao_cols:
+                    # Mapeamento questão -> palavra (lido uma vez por processo) e
+                    # % Pré / % Pós / Δ de todas as questões numa única redução (memoizado por recorte)
+                    df_analise_sorted = tabela_palavras_memo(chave_filtros, df, tuple(fases_sel))
+                
+                    if not df_analise_sorted.empty:
+                        # Carregar palavras ensinadas se for Vocabulário
+                        palavras_ensinadas_todas = set()
+                        if prova_sel.upper().startswith('VOCABUL'):
+                            palavras_por_fase = carregar_palavras_ensinadas()
+                            # Juntar palavras de todas as fases selecionadas
+                            for fase in fases_sel:
+                                if fase in palavras_por_fase:
+                                    palavras_ensinadas_todas.update(palavras_por_fase[fase])
                     
-                    # Tabela compacta com destaque para palavras ensinadas
-                    def style_variacao(val):
-                        if pd.isna(val):
-                            return ''
-                        elif val > 0:
-                            return 'background-color: #e8f5e8; color: #2d5016; font-weight: bold'
-                        elif val < 0:
-                            return 'background-color: #fdf2f2; color: #721c24; font-weight: bold'
+                        # Índice (exatas + raízes de 6 letras) montado uma vez por seleção de fases
+                        indice_ensinadas = indice_palavras_ensinadas(frozenset(palavras_ensinadas_todas))
+                        if prova_sel.upper().startswith('VOCABUL'):
+                            ensinadas = indice_ensinadas.corresponde_lote(df_analise_sorted['Palavra'])
                         else:
-                            return 'background-color: #f1f3f4; color: #495057; font-weight: bold'
+                            ensinadas = [False] * len(df_analise_sorted)
+                        linhas_ensinadas = set(df_analise_sorted.index[ensinadas])
                     
-                    def style_palavra_ensinada(row):
-                        """Destaca palavras ensinadas com fundo amarelo usando matching inteligente."""
-                        if prova_sel.upper().startswith('VOCABUL') and palavra_ensinada_match(row['Palavra'], palavras_ensinadas_todas):
-                            return ['background-color: #fff3cd; font-weight: bold'] * len(row)
-                        return [''] * len(row)
+                        # Tabela compacta com destaque para palavras ensinadas
+                        def style_variacao(val):
+                            if pd.isna(val):
+                                return ''
+                            elif val > 0:
+                                return 'background-color: #e8f5e8; color: #2d5016; font-weight: bold'
+                            elif val < 0:
+                                return 'background-color: #fdf2f2; color: #721c24; font-weight: bold'
+                            else:
+                                return 'background-color: #f1f3f4; color: #495057; font-weight: bold'
                     
-                    styled_analise = (df_analise_sorted.style
-                                     .apply(style_palavra_ensinada, axis=1)
-                                     .map(style_variacao, subset=['Δ'])
-                                     .format({
-                                         '% Pré': '{:.1f}%',
-                                         '% Pós': '{:.1f}%',
-                                         'Δ': '{:+.1f}%'
-                                     }))
+                        def style_palavra_ensinada(row):
+                            """Destaca palavras ensinadas com fundo amarelo usando matching inteligente."""
+                            if row.name in linhas_ensinadas:
+                                return ['background-color: #fff3cd; font-weight: bold'] * len(row)
+                            return [''] * len(row)
                     
-                    st.caption("**Tabela de Evolução por Palavra**")
-                    if prova_sel.upper().startswith('VOCABUL') and palavras_ensinadas_todas:
-                        # Contar quantas palavras do teste correspondem às ensinadas
-                        palavras_teste = df_analise_sorted['Palavra'].tolist()
-                        palavras_matched = [p for p in palavras_teste if palavra_ensinada_match(p, palavras_ensinadas_todas)]
+                        styled_analise = (df_analise_sorted.style
+                                         .apply(style_palavra_ensinada, axis=1)
+                                         .map(style_variacao, subset=['Δ'])
+                                         .format({
+                                             '% Pré': '{:.1f}%',
+                                             '% Pós': '{:.1f}%',
+                                             'Δ': '{:+.1f}%'
+                                         }))
+                    
+                        st.caption("**Tabela de Evolução por Palavra**")
+                        if prova_sel.upper().startswith('VOCABUL') and palavras_ensinadas_todas:
+                            # Contar quantas palavras do teste correspondem às ensinadas
+                            palavras_teste = df_analise_sorted['Palavra'].tolist()
+                            palavras_matched = df_analise_sorted.loc[ensinadas, 'Palavra'].tolist()
                         
-                        st.caption(f"🟡 *Palavras destacadas em amarelo foram ensinadas no WordGen ({len(palavras_matched)} de {len(palavras_teste)} palavras do teste)*")
+                            st.caption(f"🟡 *Palavras destacadas em amarelo foram ensinadas no WordGen ({len(palavras_matched)} de {len(palavras_teste)} palavras do teste)*")
                         
-                        # Debug: mostrar algumas correspondências (apenas em desenvolvimento)
-                        if st.session_state.get('show_debug', False):
-                            with st.expander("🔍 Debug - Correspondências encontradas"):
-                                st.write(f"**Palavras ensinadas carregadas:** {len(palavras_ensinadas_todas)}")
-                                st.write(f"**Fases selecionadas:** {fases_sel}")
-                                st.write(f"**Palavras matched:** {palavras_matched}")
+                            # Debug: mostrar algumas correspondências (apenas em desenvolvimento)
+                            if st.session_state.get('show_debug', False):
+                                with st.expander("🔍 Debug - Correspondências encontradas"):
+                                    st.write(f"**Palavras ensinadas carregadas:** {len(palavras_ensinadas_todas)}")
+                                    st.write(f"**Fases selecionadas:** {fases_sel}")
+                                    st.write(f"**Palavras matched:** {palavras_matched}")
                     
-                    st.dataframe(styled_analise, use_container_width=True, height=420)
+                        st.dataframe(styled_analise, use_container_width=True, height=420)
                     
-                    # ========== TOP 5 PALAVRAS ==========
-                    st.markdown("---")
-                    st.caption("**🏆 Destaques de Aprendizagem**")
+                        # ========== TOP 5 PALAVRAS ==========
+                        st.markdown("---")
+                        st.caption("**🏆 Destaques de Aprendizagem**")
                     
-                    # TOP 5 Maior Ganho
-                    top_5_ganho = df_analise_sorted.head(5)
-                    # TOP 5 Menor Ganho (ou maior declínio)
-                    top_5_declinio = df_analise_sorted.tail(5).sort_values('Δ', ascending=True)
+                        # TOP 5 Maior Ganho
+                        top_5_ganho = df_analise_sorted.head(5)
+                        # TOP 5 Menor Ganho (ou maior declínio)
+                        top_5_declinio = df_analise_sorted.tail(5).sort_values('Δ', ascending=True)
                     
-                    col_top, col_bottom = st.columns(2)
+                        col_top, col_bottom = st.columns(2)
                     
-                    with col_top:
-                        st.markdown("**🟢 Maior Progresso**")
-                        for idx, row in top_5_ganho.iterrows():
-                            delta_val = row['Δ']
-                            # Usar diferentes tons de verde baseado no valor
-                            if delta_val > 20:
-                                cor_fundo = "#d4edda"
-                                cor_texto = "#155724"
-                            elif delta_val > 10:
-                                cor_fundo = "#e8f5e8"
-                                cor_texto = "#2d5016"
-                            else:
-                                cor_fundo = "#f1f8f1"
-                                cor_texto = "#3d6b21"
+                        with col_top:
+                            st.markdown("**🟢 Maior Progresso**")
+                            for idx, row in top_5_ganho.iterrows():
+                                delta_val = row['Δ']
+                                # Usar diferentes tons de verde baseado no valor
+                                if delta_val > 20:
+                                    cor_fundo = "#d4edda"
+                                    cor_texto = "#155724"
+                                elif delta_val > 10:
+                                    cor_fundo = "#e8f5e8"
+                                    cor_texto = "#2d5016"
+                                else:
+                                    cor_fundo = "#f1f8f1"
+                                    cor_texto = "#3d6b21"
                             
-                            st.markdown(f"""
-                            <div style='background-color: {cor_fundo}; 
-                                        padding: 8px 12px; 
-                                        border-radius: 6px; 
-                                        margin-bottom: 6px;
-                                        border-left: 4px solid #28a745;'>
-                                <span style='color: {cor_texto}; font-weight: 600; font-size: 13px;'>{row['Palavra']}</span>
-                                <span style='float: right; color: {cor_texto}; font-weight: bold; font-size: 13px;'>+{delta_val:.1f}%</span>
-                            </div>
-                            """, unsafe_allow_html=True)
+                                st.markdown(f"""
+                                <div style='background-color: {cor_fundo}; 
+                                            padding: 8px 12px; 
+                                            border-radius: 6px; 
+                                            margin-bottom: 6px;
+                                            border-left: 4px solid #28a745;'>
+                                    <span style='color: {cor_texto}; font-weight: 600; font-size: 13px;'>{row['Palavra']}</span>
+                                    <span style='float: right; color: {cor_texto}; font-weight: bold; font-size: 13px;'>+{delta_val:.1f}%</span>
+                                </div>
+                                """, unsafe_allow_html=True)
                     
-                    with col_bottom:
-                        st.markdown("**🔴 Atenção Necessária**")
-                        for idx, row in top_5_declinio.iterrows():
-                            delta_val = row['Δ']
-                            # Usar diferentes tons de vermelho/amarelo baseado no valor
-                            if delta_val < 0:
-                                cor_fundo = "#f8d7da"
-                                cor_texto = "#721c24"
-                                borda_cor = "#dc3545"
-                            elif delta_val < 5:
-                                cor_fundo = "#fff3cd"
-                                cor_texto = "#856404"
-                                borda_cor = "#ffc107"
-                            else:
-                                cor_fundo = "#fff9e6"
-                                cor_texto = "#997404"
-                                borda_cor = "#ffeb3b"
+                        with col_bottom:
+                            st.markdown("**🔴 Atenção Necessária**")
+                            for idx, row in top_5_declinio.iterrows():
+                                delta_val = row['Δ']
+                                # Usar diferentes tons de vermelho/amarelo baseado no valor
+                                if delta_val < 0:
+                                    cor_fundo = "#f8d7da"
+                                    cor_texto = "#721c24"
+                                    borda_cor = "#dc3545"
+                                elif delta_val < 5:
+                                    cor_fundo = "#fff3cd"
+                                    cor_texto = "#856404"
+                                    borda_cor = "#ffc107"
+                                else:
+                                    cor_fundo = "#fff9e6"
+                                    cor_texto = "#997404"
+                                    borda_cor = "#ffeb3b"
                             
-                            simbolo = "" if delta_val < 0 else "+"
-                            st.markdown(f"""
-                            <div style='background-color: {cor_fundo}; 
-                                        padding: 8px 12px; 
-                                        border-radius: 6px; 
-                                        margin-bottom: 6px;
-                                        border-left: 4px solid {borda_cor};'>
-                                <span style='color: {cor_texto}; font-weight: 600; font-size: 13px;'>{row['Palavra']}</span>
-                                <span style='float: right; color: {cor_texto}; font-weight: bold; font-size: 13px;'>{simbolo}{delta_val:.1f}%</span>
-                            </div>
-                            """, unsafe_allow_html=True)
+                                simbolo = "" if delta_val < 0 else "+"
+                                st.markdown(f"""
+                                <div style='background-color: {cor_fundo}; 
+                                            padding: 8px 12px; 
+                                            border-radius: 6px; 
+                                            margin-bottom: 6px;
+                                            border-left: 4px solid {borda_cor};'>
+                                    <span style='color: {cor_texto}; font-weight: 600; font-size: 13px;'>{row['Palavra']}</span>
+                                    <span style='float: right; color: {cor_texto}; font-weight: bold; font-size: 13px;'>{simbolo}{delta_val:.1f}%</span>
+                                </div>
+                                """, unsafe_allow_html=True)
                 
+                    else:
+                        st.info("Sem questões válidas")
                 else:
-                    st.info("Sem questões válidas")
-            else:
-                st.info("Dataset não contém questões individuais")
+                    st.info("Dataset não contém questões individuais")
+
+secao_analises_principais(df, monitor, chave_filtros, selecao, cubo, prova_sel, fases_sel, turmas_sel, coluna_turma)
 
 st.markdown("---")
 
 # ========== DISTRIBUIÇÃO DE GANHOS INDIVIDUAIS (EXPANDER) ==========
-with st.expander("📊 **DISTRIBUIÇÃO DE GANHOS INDIVIDUAIS**", expanded=False):
+with st.expander("📊 **DISTRIBUIÇÃO DE GANHOS INDIVIDUAIS**", expanded=False), monitor.secao('histograma'):
     st.caption("Análise da variabilidade dos ganhos (Pós - Pré) entre todos os alunos")
     
     if not df.empty and 'Score_Pre' in df.columns and 'Score_Pos' in df.columns:
-        # Calcular delta para cada aluno
-        df_with_delta = df.copy()
-        df_with_delta['Delta'] = df_with_delta['Score_Pos'] - df_with_delta['Score_Pre']
+        # Estatísticas e contagens do histograma memoizadas pelo recorte
+        ganhos, bins_ganhos = ganhos_memo(chave_filtros, df)
         
-        # Remover valores nulos
-        df_with_delta = df_with_delta.dropna(subset=['Delta'])
-        
-        if len(df_with_delta) > 0:
+        if ganhos is not None:
             try:
-                import altair as alt
-                
-                # Estatísticas descritivas
-                media_delta = df_with_delta['Delta'].mean()
-                mediana_delta = df_with_delta['Delta'].median()
-                std_delta = df_with_delta['Delta'].std()
-                min_delta = df_with_delta['Delta'].min()
-                max_delta = df_with_delta['Delta'].max()
-                
-                # Contar alunos por categoria
-                melhoraram = len(df_with_delta[df_with_delta['Delta'] > 0])
-                mantiveram = len(df_with_delta[df_with_delta['Delta'] == 0])
-                pioraram = len(df_with_delta[df_with_delta['Delta'] < 0])
-                total_alunos = len(df_with_delta)
+                media_delta, mediana_delta, std_delta = ganhos['media'], ganhos['mediana'], ganhos['dp']
+                min_delta, max_delta = ganhos['minimo'], ganhos['maximo']
+                melhoraram, mantiveram, pioraram = ganhos['melhoraram'], ganhos['mantiveram'], ganhos['pioraram']
+                total_alunos = ganhos['total']
                 
                 # Cards de estatísticas
                 col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
@@ -1396,23 +1328,20 @@ with st.expander("📊 **DISTRIBUIÇÃO DE GANHOS INDIVIDUAIS**", expanded=False
                 # Criar histograma com Altair
                 st.markdown("#### 📊 Distribuição dos Ganhos")
                 
-                # Adicionar coluna de cor baseada no Delta
-                df_with_delta['Cor'] = df_with_delta['Delta'].apply(
-                    lambda x: 'Positivo' if x > 0 else ('Negativo' if x < 0 else 'Zero')
-                )
-                
-                # Histograma de barras
-                hist = alt.Chart(df_with_delta).mark_bar(
+                # Histograma de barras (intervalos já calculados, empilhados por sinal do ganho)
+                hist = alt.Chart(bins_ganhos).mark_bar(
                     opacity=0.75,
                     binSpacing=1,
                     cornerRadiusTopLeft=3,
                     cornerRadiusTopRight=3
                 ).encode(
-                    x=alt.X('Delta:Q', 
-                           bin=alt.Bin(maxbins=30), 
+                    x=alt.X('bin_inicio:Q', 
+                           bin='binned', 
                            title='Ganho (Pós - Pré)',
                            axis=alt.Axis(labelFontSize=11, titleFontSize=12)),
-                    y=alt.Y('count()', 
+                    x2='bin_fim:Q',
+                    y=alt.Y('n:Q', 
+                           stack='zero',
                            title='Número de Alunos',
                            axis=alt.Axis(labelFontSize=11, titleFontSize=12)),
                     color=alt.Color('Cor:N',
@@ -1423,8 +1352,9 @@ with st.expander("📊 **DISTRIBUIÇÃO DE GANHOS INDIVIDUAIS**", expanded=False
                         legend=None
                     ),
                     tooltip=[
-                        alt.Tooltip('count()', title='Nº Alunos'),
-                        alt.Tooltip('Delta:Q', title='Ganho', format='.1f', bin=True)
+                        alt.Tooltip('n:Q', title='Nº Alunos'),
+                        alt.Tooltip('bin_inicio:Q', title='Ganho de', format='.1f'),
+                        alt.Tooltip('bin_fim:Q', title='Ganho até', format='.1f')
                     ]
                 ).properties(
                     width=700,
@@ -1493,14 +1423,9 @@ with st.expander("📊 **DISTRIBUIÇÃO DE GANHOS INDIVIDUAIS**", expanded=False
                     """)
                 
                 with col_insight2:
-                    # Calcular percentis
-                    p25 = df_with_delta['Delta'].quantile(0.25)
-                    p75 = df_with_delta['Delta'].quantile(0.75)
-                    
-                    # Identificar outliers (usando regra IQR)
-                    iqr = p75 - p25
-                    outliers_baixo = len(df_with_delta[df_with_delta['Delta'] < (p25 - 1.5 * iqr)])
-                    outliers_alto = len(df_with_delta[df_with_delta['Delta'] > (p75 + 1.5 * iqr)])
+                    # Percentis e outliers (regra IQR)
+                    p25, p75 = ganhos['p25'], ganhos['p75']
+                    outliers_baixo, outliers_alto = ganhos['outliers_baixo'], ganhos['outliers_alto']
                     
                     st.success(f"""
                     **🎯 Análise de Performance:**
@@ -1522,7 +1447,10 @@ with st.expander("📊 **DISTRIBUIÇÃO DE GANHOS INDIVIDUAIS**", expanded=False
 st.markdown("---")
 
 # ========== EVOLUÇÃO HIERÁRQUICA (EXPANDER) ==========
-with st.expander("🌐 **EVOLUÇÃO COMPARATIVA HIERÁRQUICA**", expanded=False):
+@st.fragment
+@monitor.cronometrar('drilldown')
+def secao_evolucao_hierarquica(df, chave_filtros, prova_sel):
+    """Drill-down Escolas → Turmas → Alunos (rerun isolado)."""
     st.caption("Trajetórias longitudinais por Escola, Turma ou Aluno")
     
     # Inicializar estados
@@ -1658,8 +1586,6 @@ with st.expander("🌐 **EVOLUÇÃO COMPARATIVA HIERÁRQUICA**", expanded=False)
         st.warning(f"⚠️ Nenhum dado disponível para {prova_sel}")
     else:
         try:
-            import altair as alt
-            
             # Preparar dados
             if nivel_viz == 'Escolas':
                 col_agrupamento = col_escola
@@ -1671,9 +1597,6 @@ with st.expander("🌐 **EVOLUÇÃO COMPARATIVA HIERÁRQUICA**", expanded=False)
                 col_agrupamento = col_aluno
                 label_entidade = 'Aluno'
             
-            df_viz = df_drill_base.groupby([col_agrupamento, col_fase])[metrica_col].mean().reset_index()
-            df_viz = df_viz.rename(columns={col_agrupamento: 'Entidade', col_fase: 'Fase', metrica_col: 'Valor'})
-            
             # Filtros hierárquicos
             st.markdown("#### 🔽 Filtros Hierárquicos")
             col_filtro1, col_filtro2, col_filtro3 = st.columns(3)
@@ -1730,9 +1653,9 @@ with st.expander("🌐 **EVOLUÇÃO COMPARATIVA HIERÁRQUICA**", expanded=False)
                 else:
                     st.info("👈 Disponível ao visualizar Alunos")
             
-            # Reagregar
-            df_viz = df_drill_filtrado.groupby([col_agrupamento, col_fase])[metrica_col].mean().reset_index()
-            df_viz = df_viz.rename(columns={col_agrupamento: 'Entidade', col_fase: 'Fase', metrica_col: 'Valor'})
+            # Reagregar (memoizado pela chave dos filtros + seletores do drill-down)
+            filtros_drill = (coorte_drill, tuple(escolas_selecionadas), tuple(turmas_selecionadas), tuple(alunos_selecionados))
+            df_viz = trajetorias_memo(chave_filtros, df_drill_filtrado, col_agrupamento, col_fase, metrica_col, filtros_drill)
             
             if df_viz.empty:
                 st.warning("⚠️ Nenhum dado com os filtros selecionados")
@@ -1748,28 +1671,73 @@ with st.expander("🌐 **EVOLUÇÃO COMPARATIVA HIERÁRQUICA**", expanded=False)
                     df_plot = df_viz.copy()
                     df_plot['Fase'] = df_plot['Fase'].astype(str)
                     
-                    brush = alt.selection_interval(encodings=['y'])
-                    
-                    base = alt.Chart(df_plot).mark_line(
-                        point=True,
-                        strokeWidth=2,
-                        opacity=0.6
-                    ).encode(
-                        x=alt.X('Fase:O', axis=alt.Axis(title='Fase', labelAngle=0)),
-                        y=alt.Y('Valor:Q', axis=alt.Axis(title=metrica_axis_title)),
-                        color=alt.Color('Entidade:N', legend=None if len(df_plot['Entidade'].unique()) > 15 else alt.Legend(title=label_entidade)),
-                        detail='Entidade:N',
-                        tooltip=[
-                            alt.Tooltip('Entidade:N', title=label_entidade),
-                            alt.Tooltip('Fase:O', title='Fase'),
-                            alt.Tooltip('Valor:Q', title=metrica_axis_title, format='.2f')
-                        ],
-                        opacity=alt.condition(brush, alt.value(0.8), alt.value(0.2))
-                    ).properties(
-                        width=700,
-                        height=400,
-                        title=f'Evolução de {label_entidade}s: {prova_sel} - {coorte_drill}'
-                    ).add_params(brush)
+                    if usar_linhas_individuais(df_plot):
+                        brush = alt.selection_interval(encodings=['y'])
+                        
+                        base = alt.Chart(df_plot).mark_line(
+                            point=True,
+                            strokeWidth=2,
+                            opacity=0.6
+                        ).encode(
+                            x=alt.X('Fase:O', axis=alt.Axis(title='Fase', labelAngle=0)),
+                            y=alt.Y('Valor:Q', axis=alt.Axis(title=metrica_axis_title)),
+                            color=alt.Color('Entidade:N', legend=None if len(df_plot['Entidade'].unique()) > 15 else alt.Legend(title=label_entidade)),
+                            detail='Entidade:N',
+                            tooltip=[
+                                alt.Tooltip('Entidade:N', title=label_entidade),
+                                alt.Tooltip('Fase:O', title='Fase'),
+                                alt.Tooltip('Valor:Q', title=metrica_axis_title, format='.2f')
+                            ],
+                            opacity=alt.condition(brush, alt.value(0.8), alt.value(0.2))
+                        ).properties(
+                            width=700,
+                            height=400,
+                            title=f'Evolução de {label_entidade}s: {prova_sel} - {coorte_drill}'
+                        ).add_params(brush)
+                    else:
+                        # Muitas entidades: faixas de quantis por fase em vez de uma linha por entidade
+                        faixas = faixas_quantis(df_plot)
+                        st.caption(
+                            f"📉 {df_plot['Entidade'].nunique()} {label_entidade.lower()}s na seleção: exibindo faixas de "
+                            f"quantis (10–90% e 25–75%) e a mediana. Filtre escolas/turmas para ver até "
+                            f"{LIMIAR_ENTIDADES_LINHAS} trajetórias individuais."
+                        )
+                        
+                        banda_externa = alt.Chart(faixas).mark_area(opacity=0.2, color='#636EFA').encode(
+                            x=alt.X('Fase:O', axis=alt.Axis(title='Fase', labelAngle=0)),
+                            y=alt.Y('p10:Q', axis=alt.Axis(title=metrica_axis_title)),
+                            y2='p90:Q'
+                        )
+                        
+                        banda_interna = alt.Chart(faixas).mark_area(opacity=0.4, color='#636EFA').encode(
+                            x='Fase:O',
+                            y='p25:Q',
+                            y2='p75:Q'
+                        )
+                        
+                        linha_mediana = alt.Chart(faixas).mark_line(
+                            point=True,
+                            strokeWidth=3,
+                            color='#636EFA'
+                        ).encode(
+                            x='Fase:O',
+                            y='p50:Q',
+                            tooltip=[
+                                alt.Tooltip('Fase:O', title='Fase'),
+                                alt.Tooltip('n:Q', title=f'{label_entidade}s', format='d'),
+                                alt.Tooltip('p10:Q', title='P10', format='.2f'),
+                                alt.Tooltip('p25:Q', title='P25', format='.2f'),
+                                alt.Tooltip('p50:Q', title='Mediana', format='.2f'),
+                                alt.Tooltip('p75:Q', title='P75', format='.2f'),
+                                alt.Tooltip('p90:Q', title='P90', format='.2f')
+                            ]
+                        )
+                        
+                        base = (banda_externa + banda_interna + linha_mediana).properties(
+                            width=700,
+                            height=400,
+                            title=f'Evolução de {label_entidade}s: {prova_sel} - {coorte_drill}'
+                        )
                     
                     media_por_fase = df_plot.groupby('Fase')['Valor'].mean().reset_index()
                     
@@ -1866,6 +1834,7 @@ with st.expander("🌐 **EVOLUÇÃO COMPARATIVA HIERÁRQUICA**", expanded=False)
         except ImportError:
             st.error("❌ Altair não encontrada")
             st.info("💡 Usando Plotly...")
+            import plotly.express as px
             
             if nivel_viz == 'Escolas':
                 col_agrupamento = col_escola
@@ -1877,43 +1846,56 @@ with st.expander("🌐 **EVOLUÇÃO COMPARATIVA HIERÁRQUICA**", expanded=False)
                 col_agrupamento = col_aluno
                 label_entidade = 'Aluno'
             
-            df_viz = df_drill_base.groupby([col_agrupamento, col_fase])[metrica_col].mean().reset_index()
+            df_viz = df_drill_base.groupby([col_agrupamento, col_fase], observed=True)[metrica_col].mean().reset_index()
             
-            fig = px.line(
-                df_viz,
-                x=col_fase,
-                y=metrica_col,
-                color=col_agrupamento,
-                markers=True,
-                title=f'Evolução - {nivel_viz}',
-                labels={
-                    col_fase: 'Fase',
-                    metrica_col: metrica_axis_title,
-                    col_agrupamento: label_entidade
-                }
-            )
-            
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            # Uma linha por entidade só para seleções pequenas (o navegador trava com milhares)
+            if df_viz[col_agrupamento].nunique() > LIMIAR_ENTIDADES_LINHAS:
+                st.info(f"📉 Mais de {LIMIAR_ENTIDADES_LINHAS} {label_entidade.lower()}s: gráfico de linhas omitido")
+            else:
+                fig = px.line(
+                    df_viz,
+                    x=col_fase,
+                    y=metrica_col,
+                    color=col_agrupamento,
+                    markers=True,
+                    title=f'Evolução - {nivel_viz}',
+                    labels={
+                        col_fase: 'Fase',
+                        metrica_col: metrica_axis_title,
+                        col_agrupamento: label_entidade
+                    }
+                )
+                
+                fig.update_layout(height=500)
+                st.plotly_chart(fig, use_container_width=True)
+
+# Com on_change="rerun" o expander informa se está aberto: recolhido, a seção não roda
+with st.expander("🌐 **EVOLUÇÃO COMPARATIVA HIERÁRQUICA**", expanded=False,
+                 key='expander_hierarquica', on_change='rerun') as expander_hierarquica:
+    if expander_hierarquica.open:
+        secao_evolucao_hierarquica(df, chave_filtros, prova_sel)
 
 st.markdown("---")
 
 # ========== EVOLUÇÃO INDIVIDUAL (EXPANDER) ==========
-with st.expander("👨‍🎓 **EVOLUÇÃO INDIVIDUAL**", expanded=False):
+@st.fragment
+@monitor.cronometrar('individual')
+def secao_evolucao_individual(df, registro_datasets, selecao, prova_sel):
+    """Seleção e evolução de um aluno (rerun isolado)."""
     # Filtro de aluno baseado nos filtros principais (Prova, Fases, Escolas)
     st.markdown("**Selecione um aluno para análise individual:**")
     
-    # Criar dicionário com IDs e suas fases participadas
+    # Opções e busca saem do índice de alunos, restritas ao bitmap de filtros
+    indice_alunos = registro_datasets.alunos(prova_sel)
     if not df.empty:
-        aluno_fases = df.groupby('ID_Anonimizado')['Fase'].apply(
-            lambda x: ', '.join(sorted([str(int(f)) for f in x.dropna().unique()]))
-        ).to_dict()
+        busca_aluno = st.text_input(
+            "🔎 Buscar por ID (início)",
+            key="busca_aluno_individual",
+            placeholder="Ex.: 3F2A"
+        ).strip().upper()
         
-        # Criar lista de opções formatadas: "ID - Fases: X, Y, Z"
-        opcoes_alunos = ["<selecione>"] + [
-            f"{id_aluno} - Fases: {fases}" 
-            for id_aluno, fases in sorted(aluno_fases.items())
-        ]
+        # Lista de opções formatadas: "ID - Fases: X, Y, Z"
+        opcoes_alunos = indice_alunos.opcoes(selecao, prefixo=busca_aluno)
         
         aluno_selecionado = st.selectbox(
             "🔒 Aluno para Análise Individual",
@@ -1922,10 +1904,7 @@ with st.expander("👨‍🎓 **EVOLUÇÃO INDIVIDUAL**", expanded=False):
         )
         
         # Extrair apenas o ID do aluno da seleção
-        if aluno_selecionado != "<selecione>":
-            id_anonimizado_sel = aluno_selecionado.split(" - Fases:")[0]
-        else:
-            id_anonimizado_sel = "<selecione>"
+        id_anonimizado_sel = indice_alunos.id_da_opcao(aluno_selecionado)
     else:
         st.warning("⚠️ Nenhum aluno encontrado com os filtros selecionados")
         id_anonimizado_sel = "<selecione>"
@@ -1933,7 +1912,9 @@ with st.expander("👨‍🎓 **EVOLUÇÃO INDIVIDUAL**", expanded=False):
     st.markdown("---")
     
     if id_anonimizado_sel and id_anonimizado_sel != "<selecione>":
-        df_ind = df[df['ID_Anonimizado'] == id_anonimizado_sel].sort_values('Fase')
+        # Linhas do aluno direto pelas posições do índice (sem varrer o dataset)
+        posicoes_aluno = indice_alunos.posicoes(id_anonimizado_sel, selecao)
+        df_ind = registro_datasets.obter(prova_sel).iloc[posicoes_aluno].sort_values('Fase')
         
         if df_ind.empty:
             st.info("Aluno não encontrado com filtros atuais")
@@ -1966,7 +1947,8 @@ with st.expander("👨‍🎓 **EVOLUÇÃO INDIVIDUAL**", expanded=False):
             
             st.dataframe(styled_df, use_container_width=True)
             
-            # Gráficos lado a lado
+            # Gráficos lado a lado (Plotly importado só quando um aluno é aberto)
+            import plotly.express as px
             col_ev1, col_ev2 = st.columns(2)
             
             with col_ev1:
@@ -2010,6 +1992,21 @@ with st.expander("👨‍🎓 **EVOLUÇÃO INDIVIDUAL**", expanded=False):
     else:
         st.info("� Selecione um aluno na lista acima para visualizar sua evolução individual detalhada")
 
+with st.expander("👨‍🎓 **EVOLUÇÃO INDIVIDUAL**", expanded=False,
+                 key='expander_individual', on_change='rerun') as expander_individual:
+    if expander_individual.open:
+        secao_evolucao_individual(df, registro_datasets, selecao, prova_sel)
+
+# ========== PAINEL DE DESEMPENHO (DEBUG) ==========
+if st.session_state.get('show_debug', False):
+    with st.expander("⏱️ **DESEMPENHO POR SEÇÃO**", expanded=False):
+        st.dataframe(
+            monitor.tabela().style.format({'Tempo (ms)': '{:.1f}', 'Pico de memória (MB)': '{:.2f}'}, na_rep='—'),
+            use_container_width=True, hide_index=True
+        )
+        st.caption(f"Execução {monitor.execucao} • log em {monitor.caminho}")
+monitor.gravar_log()
+
 # ========== FOOTER ==========
 st.markdown("---")
 st.caption("Dashboard desenvolvido por Elton Sarmanho • Utilize filtros no topo para refinar a análise")
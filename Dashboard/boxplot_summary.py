@@ -0,0 +1,114 @@
+"""
+Boxplots resumidos no servidor.
+
+Com `mark_boxplot` o Altair envia todas as linhas ao navegador, que calcula os
+quartis a cada rerun. Acima de LIMIAR_BOXPLOT_RESUMIDO linhas os quartis,
+bigodes (1,5 × IQR, como o padrão do Vega-Lite), médias e outliers são
+calculados aqui por grupo, e o gráfico é desenhado a partir dessa tabela
+compacta com a mesma aparência (bigode, caixa, mediana e pontos).
+"""
+
+import altair as alt
+import pandas as pd
+
+LIMIAR_BOXPLOT_RESUMIDO = 5000
+EXTENSAO_BIGODE = 1.5
+
+
+def resumir_boxplot(df_longo: pd.DataFrame, grupos: list, valor: str = 'Score') -> pd.DataFrame:
+    """
+    Estatísticas do boxplot por grupo.
+
+    Retorna uma linha por grupo com tipo='caixa' (q1, mediana, q3, bigode_inf,
+    bigode_sup, Media, n) e uma linha por outlier com tipo='outlier' (valor).
+    Grupos com chave nula (ex.: Sexo não informado) ganham a própria caixa,
+    como no `mark_boxplot` do Vega-Lite.
+    """
+    dados = df_longo.dropna(subset=[valor])
+    chaves = [dados[g] for g in grupos]
+    agrupado = dados[valor].groupby(chaves, observed=True, sort=True, dropna=False)
+
+    q1 = agrupado.transform('quantile', 0.25)
+    q3 = agrupado.transform('quantile', 0.75)
+    iqr = q3 - q1
+    dentro = dados[valor].between(q1 - EXTENSAO_BIGODE * iqr, q3 + EXTENSAO_BIGODE * iqr)
+    # Só é outlier quem tem caixa calculada; sem quartis (NaN) a linha nunca vira ponto solto
+    fora = ~dentro & q1.notna() & q3.notna()
+    dentro_agrupado = dados[valor].where(dentro).groupby(chaves, observed=True, sort=True, dropna=False)
+
+    caixas = pd.DataFrame({
+        'q1': agrupado.quantile(0.25),
+        'mediana': agrupado.median(),
+        'q3': agrupado.quantile(0.75),
+        'bigode_inf': dentro_agrupado.min(),
+        'bigode_sup': dentro_agrupado.max(),
+        'Media': agrupado.mean(),
+        'n': agrupado.size(),
+    }).reset_index()
+    caixas['tipo'] = 'caixa'
+
+    outliers = dados.loc[fora, grupos + [valor]].copy()
+    outliers['tipo'] = 'outlier'
+    return pd.concat([caixas, outliers], ignore_index=True)
+
+
+def dados_boxplot(df_longo: pd.DataFrame, grupos: list, valor: str = 'Score',
+                  limiar: int | None = None):
+    """
+    Dados para `camadas_boxplot`: o resumo por grupo e, até `limiar` linhas
+    (padrão: LIMIAR_BOXPLOT_RESUMIDO), também as linhas brutas (tipo='linha')
+    para o `mark_boxplot` nativo.
+
+    Returns:
+        (dados, resumido) - resumido=True quando só o resumo será enviado
+    """
+    resumo = resumir_boxplot(df_longo, grupos, valor)
+    resumido = len(df_longo) > (LIMIAR_BOXPLOT_RESUMIDO if limiar is None else limiar)
+    if resumido:
+        return resumo, True
+    brutos = df_longo[grupos + [valor]].assign(tipo='linha')
+    return pd.concat([brutos, resumo[resumo['tipo'] == 'caixa']], ignore_index=True), False
+
+
+def camadas_boxplot(base: alt.Chart, resumido: bool, x, color, x_offset, valor: str = 'Score',
+                    titulo_y: str = 'Score', escala_y=alt.Undefined, size: int = 30,
+                    opacity: float = 0.7):
+    """
+    Boxplot a partir de `dados_boxplot`: nativo sobre as linhas brutas ou,
+    no modo resumido, bigode (rule) + caixa (bar) + mediana (tick) + outliers (point).
+    """
+    comum = dict(x=x, color=color, xOffset=x_offset)
+    if not resumido:
+        return base.transform_filter(alt.datum.tipo == 'linha').mark_boxplot(
+            size=size, opacity=opacity
+        ).encode(y=alt.Y(f'{valor}:Q', title=titulo_y, scale=escala_y), **comum)
+
+    caixas = base.transform_filter(alt.datum.tipo == 'caixa')
+    bigode = caixas.mark_rule().encode(
+        y=alt.Y('bigode_inf:Q', title=titulo_y, scale=escala_y),
+        y2='bigode_sup:Q',
+        **comum
+    )
+    caixa = caixas.mark_bar(size=size, opacity=opacity).encode(
+        y=alt.Y('q1:Q'),
+        y2='q3:Q',
+        tooltip=[
+            alt.Tooltip('q1:Q', title='Q1', format='.2f'),
+            alt.Tooltip('mediana:Q', title='Mediana', format='.2f'),
+            alt.Tooltip('q3:Q', title='Q3', format='.2f'),
+            alt.Tooltip('bigode_inf:Q', title='Mínimo', format='.2f'),
+            alt.Tooltip('bigode_sup:Q', title='Máximo', format='.2f'),
+            alt.Tooltip('n:Q', title='N', format='d')
+        ],
+        **comum
+    )
+    mediana = caixas.mark_tick(size=size, color='white').encode(
+        y=alt.Y('mediana:Q'),
+        x=x,
+        xOffset=x_offset
+    )
+    pontos = base.transform_filter(alt.datum.tipo == 'outlier').mark_point(opacity=opacity).encode(
+        y=alt.Y(f'{valor}:Q'),
+        **comum
+    )
+    return alt.layer(bigode, caixa, mediana, pontos)
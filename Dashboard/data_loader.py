@@ -1,31 +1,147 @@
 import pandas as pd
-import unicodedata
 import re
-import sys
 import os
+import json
+import hashlib
 import functools
 
-# Configuração de paths para deploy EC2
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-sys.path.append(project_root)
+from text_normalization import normalize_name, normalize_names, iniciais_nome, build_id_anonimizado
+
 
 # Caminhos dos arquivos de dados (relativos ao Dashboard)
 ARQ_TDE = os.path.join(os.path.dirname(__file__), 'TDE_longitudinal.csv')
 ARQ_VOC = os.path.join(os.path.dirname(__file__), 'vocabulario_longitudinal.csv')
 
+# Cache colunar (Parquet) dos CSVs longitudinais, reaproveitado entre reinícios do processo
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '.cache')
+CACHE_VERSAO = 1
+COLUNAS_CATEGORICAS = ['Escola', 'Turma', 'Turma_Origem', 'Sexo', 'FaixaEtaria']
+PADRAO_QUESTAO = re.compile(r'^[QP]\d+_(Pre|Pos)$')
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_DISPONIVEL = True
+except ImportError:
+    PARQUET_DISPONIVEL = False
+
+def _hash_arquivo(path: str) -> str:
+    """SHA-256 do conteúdo do arquivo, lido em blocos."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+def impressao_digital(path: str) -> dict:
+    """mtime, tamanho e hash do arquivo de origem, gravados junto dos artefatos derivados."""
+    stat = os.stat(path)
+    return {'mtime_ns': stat.st_mtime_ns, 'tamanho': stat.st_size, 'sha256': _hash_arquivo(path)}
+
+def origem_inalterada(meta: dict, path: str) -> bool:
+    """
+    Confere se o arquivo de origem ainda é o registrado em `meta`.
+    
+    Compara mtime/tamanho primeiro; se mudaram, decide pelo hash do conteúdo
+    (e atualiza mtime/tamanho em `meta` quando o conteúdo é o mesmo).
+    """
+    stat = os.stat(path)
+    if meta.get('mtime_ns') == stat.st_mtime_ns and meta.get('tamanho') == stat.st_size:
+        return True
+    if meta.get('sha256') != _hash_arquivo(path):
+        return False
+    meta['mtime_ns'], meta['tamanho'] = stat.st_mtime_ns, stat.st_size
+    return True
+
+def _caminhos_cache(path: str) -> tuple[str, str]:
+    nome = os.path.splitext(os.path.basename(path))[0]
+    return (os.path.join(CACHE_DIR, f'{nome}.parquet'),
+            os.path.join(CACHE_DIR, f'{nome}.meta.json'))
+
+def tipar_colunas(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica tipos explícitos ao dataset longitudinal.
+    
+    - Escola/Turma/Sexo/FaixaEtaria viram categóricas (poucos valores distintos)
+    - Questões Q*_Pre/Q*_Pos viram inteiros pequenos anuláveis (Int8) quando
+      todos os valores presentes são inteiros; caso contrário, ficam como estão
+    """
+    for col in COLUNAS_CATEGORICAS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    
+    for col in df.columns:
+        if not PADRAO_QUESTAO.match(col) or not pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        valores = df[col].dropna()
+        if valores.empty or ((valores % 1 == 0).all() and valores.between(-128, 127).all()):
+            df[col] = df[col].astype('Int8')
+    
+    return df
+
+def _ler_cache(path_parquet: str, path_meta: str, path_csv: str):
+    """Retorna o DataFrame em cache se ainda corresponder ao CSV de origem, senão None."""
+    if not (os.path.exists(path_parquet) and os.path.exists(path_meta)):
+        return None
+    try:
+        with open(path_meta, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('versao') != CACHE_VERSAO:
+        return None
+    
+    mtime_anterior = meta.get('mtime_ns')
+    if not origem_inalterada(meta, path_csv):
+        return None
+    if meta['mtime_ns'] != mtime_anterior:
+        # mtime mudou mas o conteúdo não: só atualiza os metadados
+        gravar_json_atomico(path_meta, meta)
+    
+    try:
+        return pd.read_parquet(path_parquet)
+    except Exception:
+        return None
+
+def gravar_json_atomico(path: str, dados: dict):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(dados, f)
+    os.replace(tmp, path)
+
+def _gravar_cache(df: pd.DataFrame, path_parquet: str, path_meta: str, path_csv: str):
+    """Grava Parquet + metadados de forma atômica (vários workers podem disputar o cache)."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f'{path_parquet}.{os.getpid()}.tmp'
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, path_parquet)
+        gravar_json_atomico(path_meta, {
+            'versao': CACHE_VERSAO,
+            'origem': os.path.basename(path_csv),
+            **impressao_digital(path_csv),
+        })
+    except OSError:
+        # Diretório somente leitura (ex.: contêiner): segue sem cache em disco
+        pass
+
 @functools.lru_cache(maxsize=4)
 def load_csv(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path)
+    """
+    Carrega um CSV longitudinal usando o cache colunar em disco.
+    
+    O Parquet em Dashboard/.cache é reconstruído automaticamente quando o mtime
+    e o hash SHA-256 do CSV de origem mudam. Sem pyarrow, lê o CSV diretamente.
+    """
+    if not PARQUET_DISPONIVEL:
+        return tipar_colunas(pd.read_csv(path))
+    
+    path_parquet, path_meta = _caminhos_cache(path)
+    df = _ler_cache(path_parquet, path_meta, path)
+    if df is None:
+        df = tipar_colunas(pd.read_csv(path))
+        _gravar_cache(df, path_parquet, path_meta, path)
     return df
 
-def normalize_name(s: str) -> str:
-    if pd.isna(s):
-        return ''
-    s = str(s).strip().upper()
-    s = ''.join(c for c in unicodedata.normalize('NFD', s) if unicodedata.category(c) != 'Mn')
-    s = re.sub(r'\s+', ' ', s)
-    return s
-
 def anonimizar_estudante(id_unico: str, nome_completo: str) -> str:
     """
     Cria identificador anonimizado para estudante seguindo LGPD.
@@ -46,12 +162,8 @@ def anonimizar_estudante(id_unico: str, nome_completo: str) -> str:
     # Pegar primeiros 6 caracteres do ID
     id_parcial = str(id_unico)[:6]
     
-    # Criar iniciais do nome (primeira letra de cada palavra)
-    nome_normalizado = normalize_name(nome_completo)
-    palavras = nome_normalizado.split()
-    
-    # Pegar primeira letra de cada palavra (máximo 4 iniciais para não ficar muito longo)
-    iniciais = ''.join([p[0] for p in palavras if p])[:4]
+    # Criar iniciais do nome (primeira letra de cada palavra, máximo 4 para não ficar muito longo)
+    iniciais = iniciais_nome(normalize_name(nome_completo))
     
     return f"{id_parcial} - {iniciais}"
 
@@ -67,6 +179,20 @@ def extract_year(turma: str):
         return int(m2.group(1))
     return None
 
+def fase_para_coorte(fase):
+    """Mapeia a fase de entrada do aluno para o número de coorte."""
+    if pd.isna(fase):
+        return None
+    fase_num = int(fase)
+    if fase_num == 2:
+        return 'Coorte 1'
+    elif fase_num == 3:
+        return 'Coorte 2'
+    elif fase_num == 4:
+        return 'Coorte 3'
+    else:
+        return f'Coorte {fase_num - 1}'  # Fallback genérico
+
 def create_coorte_origem(df):
     """
     Cria coluna de Coorte_Origem baseada na primeira fase em que cada aluno participou.
@@ -78,41 +204,37 @@ def create_coorte_origem(df):
     
     A coorte é determinada pela menor fase em que o ID_Unico aparece nos dados,
     garantindo rastreamento longitudinal correto mesmo se o aluno mudar de turma.
+    
+    Coorte e Turma_Primeira_Fase saem de uma única passada groupby/idxmin:
+    idxmin devolve a primeira linha (na ordem do arquivo) com a menor fase de
+    cada aluno, que é exatamente o registro de onde vem a turma de origem.
     """
-    # Para cada ID_Unico, encontrar a menor fase (primeira participação)
-    primeira_participacao = df.groupby('ID_Unico')['Fase'].min().reset_index()
-    primeira_participacao = primeira_participacao.rename(columns={'Fase': 'Primeira_Fase'})
+    # Posições (não rótulos) para funcionar com qualquer índice de entrada
+    validos = df[['ID_Unico', 'Fase']].reset_index(drop=True).dropna()
+    idx_primeira = validos.groupby('ID_Unico', sort=True)['Fase'].idxmin()
+    pos_primeira = idx_primeira.to_numpy()
+    
+    primeira_participacao = pd.DataFrame({
+        'ID_Unico': idx_primeira.index,
+        'Primeira_Fase': df['Fase'].iloc[pos_primeira].to_numpy()
+    })
     
-    # Mapear fase inicial para número de coorte
+    # Mapear fase inicial para número de coorte (um cálculo por fase distinta)
     # Fase 2 → Coorte 1, Fase 3 → Coorte 2, Fase 4 → Coorte 3
-    def fase_para_coorte(fase):
-        if pd.isna(fase):
-            return None
-        fase_num = int(fase)
-        if fase_num == 2:
-            return 'Coorte 1'
-        elif fase_num == 3:
-            return 'Coorte 2'
-        elif fase_num == 4:
-            return 'Coorte 3'
-        else:
-            return f'Coorte {fase_num - 1}'  # Fallback genérico
-    
-    primeira_participacao['Coorte_Origem'] = primeira_participacao['Primeira_Fase'].apply(fase_para_coorte)
-    
-    # Merge para trazer coorte para todos os registros do aluno
-    df = df.merge(primeira_participacao[['ID_Unico', 'Coorte_Origem']], on='ID_Unico', how='left')
+    coortes = {fase: fase_para_coorte(fase) for fase in primeira_participacao['Primeira_Fase'].unique()}
+    primeira_participacao['Coorte_Origem'] = primeira_participacao['Primeira_Fase'].map(coortes)
     
     # Também criar coluna auxiliar com a turma original da primeira fase (útil para debug)
-    primeira_turma = df.merge(primeira_participacao[['ID_Unico', 'Primeira_Fase']], on='ID_Unico', how='left')
-    turma_origem_map = {}
-    for id_unico in primeira_turma['ID_Unico'].unique():
-        aluno_dados = primeira_turma[primeira_turma['ID_Unico'] == id_unico]
-        primeira_fase_aluno = aluno_dados['Primeira_Fase'].iloc[0]
-        turma_na_primeira_fase = aluno_dados[aluno_dados['Fase'] == primeira_fase_aluno]['Turma_Origem'].iloc[0] if 'Turma_Origem' in aluno_dados.columns else None
-        turma_origem_map[id_unico] = turma_na_primeira_fase
+    if 'Turma_Origem' in df.columns:
+        primeira_participacao['Turma_Primeira_Fase'] = df['Turma_Origem'].iloc[pos_primeira].to_numpy()
+    else:
+        primeira_participacao['Turma_Primeira_Fase'] = None
     
-    df['Turma_Primeira_Fase'] = df['ID_Unico'].map(turma_origem_map)
+    # Merge para trazer coorte e turma de origem para todos os registros do aluno
+    df = df.merge(
+        primeira_participacao[['ID_Unico', 'Coorte_Origem', 'Turma_Primeira_Fase']],
+        on='ID_Unico', how='left'
+    )
     
     return df
 
@@ -122,31 +244,25 @@ def get_datasets():
     
     # Processamento TDE
     if 'NomeNorm' not in tde.columns:
-        tde['NomeNorm'] = tde['Nome'].apply(normalize_name)
+        tde['NomeNorm'] = normalize_names(tde['Nome'])
     if 'Ano' not in tde.columns:
         tde['Ano'] = tde['Turma'].apply(extract_year)
     tde = create_coorte_origem(tde)
     
     # Criar identificador anonimizado (LGPD)
     if 'ID_Anonimizado' not in tde.columns:
-        tde['ID_Anonimizado'] = tde.apply(
-            lambda row: anonimizar_estudante(row['ID_Unico'], row['Nome']), 
-            axis=1
-        )
+        tde['ID_Anonimizado'] = build_id_anonimizado(tde['ID_Unico'], tde['Nome'])
     
     # Processamento Vocabulário
     if 'NomeNorm' not in vocab.columns:
-        vocab['NomeNorm'] = vocab['Nome'].apply(normalize_name)
+        vocab['NomeNorm'] = normalize_names(vocab['Nome'])
     if 'Ano' not in vocab.columns:
         vocab['Ano'] = vocab['Turma'].apply(extract_year)
     vocab = create_coorte_origem(vocab)
     
     # Criar identificador anonimizado (LGPD)
     if 'ID_Anonimizado' not in vocab.columns:
-        vocab['ID_Anonimizado'] = vocab.apply(
-            lambda row: anonimizar_estudante(row['ID_Unico'], row['Nome']), 
-            axis=1
-        )
+        vocab['ID_Anonimizado'] = build_id_anonimizado(vocab['ID_Unico'], vocab['Nome'])
     
     return tde, vocab
 
@@ -0,0 +1,75 @@
+"""
+Registro de datasets compartilhado por todas as sessões do Streamlit.
+
+O registro é criado uma vez por processo (st.cache_resource no app) e guarda
+os DataFrames enriquecidos sem cópia por sessão. Cada sessão recebe apenas
+visões rasas (`obter`), e o Copy-on-Write do pandas garante que qualquer
+filtro ou coluna nova criada pela sessão não altera os dados compartilhados:
+a memória residente deixa de crescer com o número de coordenadores conectados.
+O índice de filtros, o cubo de estatísticas e o índice de alunos de cada
+dataset também são montados aqui, uma vez por processo.
+"""
+
+from datetime import date
+from types import MappingProxyType
+
+import pandas as pd
+
+from enrich import aplicar_data_referencia
+from filter_index import IndiceFiltros
+from stats_cube import CuboEstatisticas
+from student_index import IndiceAlunos
+
+# Copy-on-Write é o padrão a partir do pandas 3.0; antes disso precisa ser ligado
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+
+class RegistroDatasets:
+    """Datasets somente leitura, indexados pelo nome da prova."""
+
+    def __init__(self, datasets: dict, data_referencia: date | None = None):
+        self.data_referencia = data_referencia
+        self._datasets = MappingProxyType(dict(datasets))
+        self._indices = MappingProxyType({nome: IndiceFiltros(df) for nome, df in self._datasets.items()})
+        self._cubos = MappingProxyType({nome: CuboEstatisticas(df, self._indices[nome])
+                                        for nome, df in self._datasets.items()})
+        self._alunos = MappingProxyType({nome: IndiceAlunos(df) for nome, df in self._datasets.items()})
+
+    @property
+    def nomes(self) -> list:
+        """Nomes das provas, na ordem de registro."""
+        return list(self._datasets.keys())
+
+    def obter(self, nome: str) -> pd.DataFrame:
+        """Visão rasa (sem cópia dos dados) do dataset compartilhado."""
+        return self._datasets[nome].copy(deep=False)
+
+    def indice(self, nome: str) -> IndiceFiltros:
+        """Índice de filtros do dataset (compartilhado, somente leitura)."""
+        return self._indices[nome]
+
+    def cubo(self, nome: str) -> CuboEstatisticas:
+        """Cubo de estatísticas suficientes do dataset."""
+        return self._cubos[nome]
+
+    def alunos(self, nome: str) -> IndiceAlunos:
+        """Índice de alunos (ID_Anonimizado) do dataset."""
+        return self._alunos[nome]
+
+    def na_data_referencia(self, data_referencia: date) -> 'RegistroDatasets':
+        """
+        Registro com Idade/FaixaEtaria recalculadas para outra data de referência.
+
+        Usa as datas de nascimento já convertidas; as colunas restantes são
+        compartilhadas com este registro.
+        """
+        if data_referencia == self.data_referencia:
+            return self
+        return RegistroDatasets({nome: aplicar_data_referencia(df, data_referencia)
+                                 for nome, df in self._datasets.items()}, data_referencia)
+
+    def memoria_mb(self) -> dict:
+        """Memória ocupada por dataset (MB), útil para acompanhar o consumo do processo."""
+        return {nome: df.memory_usage(deep=True).sum() / 1024 ** 2
+                for nome, df in self._datasets.items()}
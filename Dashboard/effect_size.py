@@ -0,0 +1,206 @@
+"""
+Núcleo vetorizado de tamanho de efeito e significância (pré × pós).
+
+Uma única chamada de `estatisticas_por_grupo` calcula, para todos os grupos de
+uma chave (escola, turma, fase, ano...), n, médias, desvios-padrão, as
+variantes do d de Cohen usadas no projeto, o teste t pareado e o teste de
+Wilcoxon, e devolve uma tabela tidy com uma linha por grupo. As somas por
+grupo saem de np.bincount sobre o código do grupo, sem laço Python por grupo.
+
+Variantes do d (Delta = Pós - Pré):
+    d_cohen    (média pós - média pré) / DP combinado ponderado por n - 1
+               (dashboard, cubo de estatísticas, relatórios da Analise1)
+    d_medio    Delta médio / raiz((var pré + var pós) / 2)
+               (relatórios visuais de Vocabulário)
+    d_pre      Delta médio / DP do pré (relatórios visuais de TDE)
+    d_pareado  Delta médio / DP do Delta, o d_z (pipelines das fases)
+
+Médias e DPs do pré e do pós usam todos os valores presentes de cada coluna;
+Delta, d_pareado, t e Wilcoxon usam apenas os pares completos. Os p-valores
+precisam do scipy; sem ele as colunas p_t e p_wilcoxon ficam NaN.
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy import special
+    SCIPY_DISPONIVEL = True
+except ImportError:
+    SCIPY_DISPONIVEL = False
+
+# Escolha do p-valor do Wilcoxon como no method='auto' de scipy.stats.wilcoxon:
+# distribuição exata até 50 pares sem empates nem zeros, permutação exata dos
+# sinais até 13 pares com empates ou zeros e aproximação normal nos demais casos
+WILCOXON_EXATO_MAX_N = 50
+WILCOXON_PERMUTACAO_MAX_N = 13
+
+
+def estatisticas_de_somas(n, soma, soma_q):
+    """Média e desvio-padrão amostral (ddof=1) a partir de n, soma e soma dos quadrados."""
+    n = np.asarray(n, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media = np.where(n > 0, soma / n, np.nan)
+        var = np.where(n > 1, (soma_q - n * media ** 2) / (n - 1), np.nan)
+    # Resíduo de arredondamento quando todos os valores são iguais: variância zero
+    var = np.where(np.abs(var) <= 1e-9 * np.maximum(media ** 2, 1.0), 0.0, var)
+    return media, np.sqrt(var)
+
+
+def d_cohen_de_estatisticas(n_pre, m_pre, sd_pre, n_pos, m_pos, sd_pos):
+    """d de Cohen com desvio combinado ponderado por n - 1, vetorizado."""
+    n_pre = np.asarray(n_pre, dtype=float)
+    n_pos = np.asarray(n_pos, dtype=float)
+    gl = n_pre + n_pos - 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pooled = np.sqrt(((n_pre - 1) * sd_pre ** 2 + (n_pos - 1) * sd_pos ** 2) / gl)
+        d = (m_pos - m_pre) / pooled
+    invalido = (n_pre < 2) | (n_pos < 2) | (gl <= 0) | ~(pooled > 0) | ((sd_pre == 0) & (sd_pos == 0))
+    return np.where(invalido, np.nan, d)
+
+
+def _codigos_grupo(df: pd.DataFrame, por: list, ordenar: bool) -> tuple[np.ndarray, pd.DataFrame]:
+    """Código 0..k-1 do grupo de cada linha (-1 para chave ausente) e a tabela das chaves."""
+    if not por:
+        return np.zeros(len(df), dtype=np.int64), pd.DataFrame(index=range(1))
+    grupos = df.groupby(por, sort=ordenar, observed=True, dropna=True)
+    codigos = grupos.ngroup().to_numpy(dtype=float, na_value=np.nan)
+    codigos = np.where(np.isnan(codigos), -1, codigos).astype(np.int64)
+    chaves = grupos.size().index.to_frame(index=False)
+    return codigos, chaves
+
+
+def _media_dp(codigos: np.ndarray, valores: np.ndarray, k: int):
+    """n, média e DP amostral por grupo em duas passadas (ignora NaN)."""
+    validos = ~np.isnan(valores)
+    cod, x = codigos[validos], valores[validos]
+    n = np.bincount(cod, minlength=k).astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media = np.bincount(cod, weights=x, minlength=k) / n
+        desvio = x - media[cod]
+        var = np.bincount(cod, weights=desvio * desvio, minlength=k) / (n - 1)
+    var = np.where(n > 1, var, np.nan)
+    return n, np.where(n > 0, media, np.nan), np.sqrt(var)
+
+
+def _distribuicao_wilcoxon(n_max: int) -> list:
+    """Frequências acumuladas da soma de postos positivos sob H0, para n = 0..n_max."""
+    contagens = np.ones(1)
+    acumuladas = [np.cumsum(contagens)]
+    for n in range(1, n_max + 1):
+        proxima = np.zeros(len(contagens) + n)
+        proxima[:len(contagens)] += contagens
+        proxima[n:] += contagens
+        contagens = proxima
+        acumuladas.append(np.cumsum(contagens))
+    return acumuladas
+
+
+def _wilcoxon(codigos: np.ndarray, delta: np.ndarray, k: int):
+    """Estatística e p-valor bilateral do Wilcoxon pareado por grupo (zeros descartados)."""
+    nao_zero = delta != 0
+    cod, d = codigos[nao_zero], delta[nao_zero]
+    modulo = np.abs(d)
+    postos = pd.Series(modulo).groupby(cod).rank(method='average').to_numpy()
+    r_mais = np.bincount(cod, weights=postos * (d > 0), minlength=k)
+    r_menos = np.bincount(cod, weights=postos * (d < 0), minlength=k)
+    count = np.bincount(cod, minlength=k).astype(float)
+
+    # Correção de empates: soma de t³ - t sobre os blocos de |Delta| iguais
+    t = pd.DataFrame({'g': cod, 'v': modulo}).groupby(['g', 'v']).size()
+    t_g = t.index.get_level_values('g').to_numpy()
+    t = t.to_numpy().astype(float)
+    empates = np.bincount(t_g, weights=t ** 3 - t, minlength=k)
+    tem_empates = np.bincount(t_g, weights=t > 1, minlength=k) > 0
+
+    estatistica = np.where(count > 0, np.minimum(r_mais, r_menos), np.nan)
+    p = np.full(k, np.nan)
+    if not SCIPY_DISPONIVEL:
+        return estatistica, p
+
+    media = count * (count + 1) / 4
+    with np.errstate(divide='ignore', invalid='ignore'):
+        se = np.sqrt((count * (count + 1) * (2 * count + 1) - empates / 2) / 24)
+        z = (r_mais - media) / se
+    p = np.where(count > 0, 2 * special.ndtr(-np.abs(z)), np.nan)
+
+    # Distribuição exata para n pequeno sem empates nem zeros
+    zeros = np.bincount(codigos[(delta == 0) & (codigos >= 0)], minlength=k)
+    exato = (count > 0) & (count <= WILCOXON_EXATO_MAX_N) & ~tem_empates & (zeros == 0)
+    if exato.any():
+        acumuladas = _distribuicao_wilcoxon(int(count[exato].max()))
+        for g in np.flatnonzero(exato):
+            n, r = int(count[g]), int(round(r_mais[g]))
+            freq = acumuladas[n]
+            total = freq[-1]
+            cdf = freq[r] / total
+            sf = 1 - (freq[r - 1] / total if r > 0 else 0.0)
+            p[g] = min(1.0, 2 * min(cdf, sf))
+
+    # Amostras muito pequenas com empates ou zeros: permutação exata dos sinais
+    permutacao = (count > 0) & (count + zeros <= WILCOXON_PERMUTACAO_MAX_N) & (tem_empates | (zeros > 0))
+    for g in np.flatnonzero(permutacao):
+        r = postos[cod == g]
+        sinais = (np.arange(2 ** len(r))[:, None] >> np.arange(len(r))) & 1
+        nulo = sinais @ r
+        tolerancia = 100 * np.finfo(float).eps * abs(r_mais[g])
+        menor = np.mean(nulo <= r_mais[g] + tolerancia)
+        maior = np.mean(nulo >= r_mais[g] - tolerancia)
+        p[g] = min(1.0, 2 * min(menor, maior))
+    return estatistica, p
+
+
+def estatisticas_por_grupo(df: pd.DataFrame, por=None, col_pre: str = 'Score_Pre',
+                           col_pos: str = 'Score_Pos', ordenar: bool = True) -> pd.DataFrame:
+    """
+    Estatísticas pré × pós de cada grupo de `por` (coluna ou lista; None = tudo) em uma chamada.
+
+    Retorna uma linha por grupo com as colunas de `por` seguidas de: n (linhas),
+    n_pre, media_pre, dp_pre, n_pos, media_pos, dp_pos, n_pares, media_delta,
+    dp_delta, n_melhora, n_piora, n_estavel, d_cohen, d_medio, d_pre, d_pareado,
+    t_pareado, p_t, w_wilcoxon e p_wilcoxon. Linhas com chave ausente ficam de
+    fora; com ordenar=False os grupos seguem a ordem de primeira ocorrência.
+    """
+    por = [por] if isinstance(por, str) else list(por or [])
+    codigos, tabela = _codigos_grupo(df, por, ordenar)
+    k = len(tabela)
+
+    presentes = codigos >= 0
+    codigos = codigos[presentes]
+    pre = df[col_pre].to_numpy(dtype=float, na_value=np.nan)[presentes]
+    pos = df[col_pos].to_numpy(dtype=float, na_value=np.nan)[presentes]
+    delta = pos - pre
+
+    tabela['n'] = np.bincount(codigos, minlength=k)
+    for medida, valores in (('pre', pre), ('pos', pos), ('delta', delta)):
+        n, media, dp = _media_dp(codigos, valores, k)
+        tabela['n_pares' if medida == 'delta' else f'n_{medida}'] = n.astype(np.int64)
+        tabela[f'media_{medida}'] = media
+        tabela[f'dp_{medida}'] = dp
+
+    pares = ~np.isnan(delta)
+    cod_pares, delta_pares = codigos[pares], delta[pares]
+    tabela['n_melhora'] = np.bincount(cod_pares[delta_pares > 0], minlength=k)
+    tabela['n_piora'] = np.bincount(cod_pares[delta_pares < 0], minlength=k)
+    tabela['n_estavel'] = np.bincount(cod_pares[delta_pares == 0], minlength=k)
+
+    n_pares = tabela['n_pares'].to_numpy(dtype=float)
+    media_delta = tabela['media_delta'].to_numpy()
+    dp_pre, dp_pos, dp_delta = (tabela[c].to_numpy() for c in ('dp_pre', 'dp_pos', 'dp_delta'))
+
+    tabela['d_cohen'] = d_cohen_de_estatisticas(
+        tabela['n_pre'].to_numpy(), tabela['media_pre'].to_numpy(), dp_pre,
+        tabela['n_pos'].to_numpy(), tabela['media_pos'].to_numpy(), dp_pos
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        medio = np.sqrt((dp_pre ** 2 + dp_pos ** 2) / 2)
+        tabela['d_medio'] = np.where(medio > 0, media_delta / medio, np.nan)
+        tabela['d_pre'] = np.where(dp_pre > 1e-12, media_delta / dp_pre, np.nan)
+        tabela['d_pareado'] = np.where(dp_delta > 0, media_delta / dp_delta, np.nan)
+        t = media_delta / (dp_delta / np.sqrt(n_pares))
+
+    tabela['t_pareado'] = np.where(n_pares > 1, t, np.nan)
+    tabela['p_t'] = (2 * special.stdtr(n_pares - 1, -np.abs(tabela['t_pareado'].to_numpy()))
+                     if SCIPY_DISPONIVEL else np.nan)
+    tabela['w_wilcoxon'], tabela['p_wilcoxon'] = _wilcoxon(cod_pares, delta_pares, k)
+    return tabela
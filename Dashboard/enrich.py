@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ENRIQUECIMENTO OFFLINE DOS DATASETS DO DASHBOARD
+Calcula uma única vez todas as colunas derivadas que o dashboard usa e grava
+um artefato versionado, com esquema verificado, que a inicialização do
+Streamlit só precisa ler (Feather sem compressão, sem nenhum cálculo).
+
+Colunas derivadas:
+- NomeNorm, Ano, Coorte_Origem, Turma_Primeira_Fase, ID_Anonimizado (get_datasets)
+- Turma_Original e Turma normalizada ("6° Ano", ...)
+- DataNascimento (DataAniversario convertida), Idade e FaixaEtaria (na data de
+  referência do build; outras datas são recalculadas sem reler as strings)
+
+Saída (Dashboard/enriched/):
+- TDE_enriquecido.arrow / vocabulario_enriquecido.arrow (Arrow IPC sem compressão)
+- manifest.json (versão, data de referência, origem e esquema de cada dataset)
+
+O artefato só é usado se a versão, o CSV de origem e o esquema conferirem;
+caso contrário o dashboard volta ao cálculo em tempo real.
+
+Uso:
+    python Dashboard/enrich.py
+    python Dashboard/enrich.py --data-referencia 2025-10-01
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, date
+
+import numpy as np
+import pandas as pd
+
+from data_loader import (ARQ_TDE, ARQ_VOC, get_datasets, impressao_digital,
+                         origem_inalterada, gravar_json_atomico)
+
+ENRICH_VERSAO = 2
+ENRICH_DIR = os.path.join(os.path.dirname(__file__), 'enriched')
+MANIFESTO = 'manifest.json'
+
+DATASETS = {
+    'TDE': (ARQ_TDE, 'TDE_enriquecido.arrow'),
+    'VOCABULARIO': (ARQ_VOC, 'vocabulario_enriquecido.arrow'),
+}
+
+COLUNAS_OBRIGATORIAS = [
+    'ID_Unico', 'Nome', 'Escola', 'Turma', 'Turma_Original', 'Fase', 'Score_Pre', 'Score_Pos',
+    'NomeNorm', 'Ano', 'Coorte_Origem', 'Turma_Primeira_Fase', 'ID_Anonimizado',
+]
+COLUNAS_IDADE = ['DataNascimento', 'Idade', 'FaixaEtaria']
+
+def normalizar_turma(turma_original: str) -> str:
+    """Normaliza valores de turma para formato padrão (5° Ano, 6° Ano, etc.)"""
+    if pd.isna(turma_original):
+        return turma_original
+
+    turma_str = str(turma_original).upper().strip()
+
+    if any(x in turma_str for x in ['5', 'QUINTO']):
+        return '5° Ano'
+    elif any(x in turma_str for x in ['6', 'SEXTO']):
+        return '6° Ano'
+    elif any(x in turma_str for x in ['7', 'SETIMO', 'SÉTIMO']):
+        return '7° Ano'
+    elif any(x in turma_str for x in ['8', 'OITAVO']):
+        return '8° Ano'
+    elif any(x in turma_str for x in ['9', 'NONO']):
+        return '9° Ano'
+    else:
+        return turma_original
+
+FORMATOS_DATA = {'/': '%d/%m/%Y', '-': '%Y-%m-%d'}
+FAIXAS_ETARIAS = ["< 10 anos", "10-11 anos", "12-13 anos", "14-15 anos", "≥ 16 anos"]
+LIMITES_FAIXAS = [-np.inf, 10, 12, 14, 16, np.inf]
+
+def parsear_datas_nascimento(datas: pd.Series) -> pd.Series:
+    """
+    Converte DataAniversario (DD/MM/YYYY ou YYYY-MM-DD) em datetime64, de forma vetorizada.
+
+    Strings com '/' são lidas como DD/MM/YYYY, senão com '-' como YYYY-MM-DD;
+    vazias, nulas ou inválidas viram NaT. Cada string distinta é convertida uma vez.
+    """
+    codigos, unicos = pd.factorize(datas, use_na_sentinel=True)
+    unicos = pd.Series(unicos, dtype=object).astype(str)
+    convertidas = pd.Series(pd.NaT, index=unicos.index, dtype='datetime64[ns]')
+    restantes = pd.Series(True, index=unicos.index)
+    for separador, formato in FORMATOS_DATA.items():
+        alvo = restantes & unicos.str.contains(separador, regex=False)
+        convertidas[alvo] = pd.to_datetime(unicos[alvo], format=formato, errors='coerce')
+        restantes &= ~alvo
+    resultado = convertidas.to_numpy()[codigos]
+    resultado[codigos < 0] = np.datetime64('NaT')
+    return pd.Series(resultado, index=datas.index, name='DataNascimento')
+
+def calcular_idades(nascimento: pd.Series, data_referencia: date | None = None) -> pd.Series:
+    """
+    Idade em anos completos na data de referência (default: hoje), vetorizada.
+
+    Datas ausentes ou posteriores à referência resultam em NaN.
+    """
+    if data_referencia is None:
+        data_referencia = date.today()
+    mes, dia = nascimento.dt.month, nascimento.dt.day
+    # Ainda não fez aniversário no ano de referência
+    pendente = (mes > data_referencia.month) | ((mes == data_referencia.month) & (dia > data_referencia.day))
+    idade = (data_referencia.year - nascimento.dt.year - pendente.astype(int)).astype(float)
+    return idade.where(idade >= 0).rename('Idade')
+
+def criar_faixas_etarias(idades: pd.Series) -> pd.Series:
+    """Faixas etárias para agrupamento (nulos ficam sem faixa)."""
+    return pd.cut(idades, bins=LIMITES_FAIXAS, right=False, labels=FAIXAS_ETARIAS).rename('FaixaEtaria')
+
+def aplicar_data_referencia(df: pd.DataFrame, data_referencia: date | None = None) -> pd.DataFrame:
+    """Recalcula Idade/FaixaEtaria a partir de DataNascimento já convertida (sem reler strings)."""
+    if 'DataNascimento' not in df.columns:
+        return df
+    df = df.copy(deep=False)
+    df['Idade'] = calcular_idades(df['DataNascimento'], data_referencia)
+    df['FaixaEtaria'] = criar_faixas_etarias(df['Idade'])
+    return df
+
+def enriquecer_dataset(df: pd.DataFrame, data_referencia: date | None = None) -> pd.DataFrame:
+    """Acrescenta Turma_Original/Turma normalizada e DataNascimento/Idade/FaixaEtaria a um dataset de get_datasets()."""
+    df = df.copy()
+
+    if 'Turma' in df.columns:
+        df['Turma_Original'] = df['Turma'].copy()
+        df['Turma'] = df['Turma'].apply(normalizar_turma)
+
+    if 'DataAniversario' in df.columns:
+        df['DataNascimento'] = parsear_datas_nascimento(df['DataAniversario'])
+        df = aplicar_data_referencia(df, data_referencia)
+
+    return df
+
+def calcular_datasets_enriquecidos(data_referencia: date | None = None):
+    """Caminho em tempo real: carrega os CSVs e calcula todas as colunas derivadas."""
+    tde, vocab = get_datasets()
+    return enriquecer_dataset(tde, data_referencia), enriquecer_dataset(vocab, data_referencia)
+
+def esquema(df: pd.DataFrame) -> dict:
+    """Esquema registrado no manifesto: coluna -> dtype."""
+    return {col: str(dtype) for col, dtype in df.dtypes.items()}
+
+def validar_esquema(df: pd.DataFrame, nome: str):
+    """Garante que o dataset enriquecido tem todas as colunas que o dashboard consome."""
+    obrigatorias = COLUNAS_OBRIGATORIAS + (COLUNAS_IDADE if 'DataAniversario' in df.columns else [])
+    faltantes = [col for col in obrigatorias if col not in df.columns]
+    if faltantes:
+        raise ValueError(f"Colunas faltantes no dataset enriquecido {nome}: {faltantes}")
+    if df['ID_Anonimizado'].isna().any():
+        raise ValueError(f"ID_Anonimizado vazio em {nome}")
+
+def gerar_artefato(saida: str = ENRICH_DIR, data_referencia: date | None = None) -> dict:
+    """Calcula os datasets enriquecidos e grava os arquivos Arrow + manifesto."""
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    data_referencia = data_referencia or date.today()
+    os.makedirs(saida, exist_ok=True)
+
+    tde, vocab = calcular_datasets_enriquecidos(data_referencia)
+    manifesto = {
+        'versao': ENRICH_VERSAO,
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'data_referencia': data_referencia.isoformat(),
+        'datasets': {},
+    }
+
+    for nome, df in (('TDE', tde), ('VOCABULARIO', vocab)):
+        origem, arquivo = DATASETS[nome]
+        validar_esquema(df, nome)
+
+        destino = os.path.join(saida, arquivo)
+        tmp = f'{destino}.{os.getpid()}.tmp'
+        # Sem compressão: a leitura não precisa descompactar as colunas
+        feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), tmp,
+                              compression='uncompressed')
+        os.replace(tmp, destino)
+
+        # Esquema registrado a partir da releitura, para comparar com o que o dashboard lerá
+        manifesto['datasets'][nome] = {
+            'arquivo': arquivo,
+            'origem': os.path.basename(origem),
+            **impressao_digital(origem),
+            'linhas': len(df),
+            'colunas': esquema(feather.read_table(destino, memory_map=True).to_pandas()),
+        }
+
+    gravar_json_atomico(os.path.join(saida, MANIFESTO), manifesto)
+    return manifesto
+
+def carregar_artefato(saida: str = ENRICH_DIR):
+    """
+    Carrega (tde, vocab, data_referencia) do artefato enriquecido.
+
+    O arquivo é aberto com memory_map, mas `to_pandas()` copia as colunas para
+    DataFrames comuns (numpy/categóricas): o dashboard depende desses dtypes,
+    então os dados ficam na memória do processo, não no mapa do arquivo.
+
+    Retorna None se o artefato não existir, for de outra versão, se algum CSV
+    de origem tiver mudado ou se o esquema lido não bater com o manifesto.
+    """
+    path_manifesto = os.path.join(saida, MANIFESTO)
+    if not os.path.exists(path_manifesto):
+        return None
+    try:
+        import pyarrow.feather as feather
+        with open(path_manifesto, 'r', encoding='utf-8') as f:
+            manifesto = json.load(f)
+    except (ImportError, OSError, ValueError):
+        return None
+    if manifesto.get('versao') != ENRICH_VERSAO:
+        return None
+
+    resultado = []
+    for nome in ('TDE', 'VOCABULARIO'):
+        origem, _ = DATASETS[nome]
+        meta = manifesto.get('datasets', {}).get(nome)
+        if meta is None or not os.path.exists(origem) or not origem_inalterada(meta, origem):
+            return None
+        try:
+            tabela = feather.read_table(os.path.join(saida, meta['arquivo']), memory_map=True)
+        except (OSError, KeyError):
+            return None
+        df = tabela.to_pandas()
+        if esquema(df) != meta['colunas'] or len(df) != meta['linhas']:
+            return None
+        resultado.append(df)
+
+    return (*resultado, date.fromisoformat(manifesto['data_referencia']))
+
+def carregar_datasets_enriquecidos():
+    """
+    Usa o artefato offline quando válido; senão calcula em tempo real.
+
+    Returns:
+        (tde, vocab, data_referencia) - data usada no cálculo de Idade/FaixaEtaria
+    """
+    artefato = carregar_artefato()
+    if artefato is not None:
+        return artefato
+    data_referencia = date.today()
+    return (*calcular_datasets_enriquecidos(data_referencia), data_referencia)
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera o artefato enriquecido do dashboard')
+    parser.add_argument('--saida', default=ENRICH_DIR, help='Diretório de saída')
+    parser.add_argument('--data-referencia', type=date.fromisoformat, default=None,
+                        help='Data de referência para o cálculo de idade (AAAA-MM-DD, padrão: hoje)')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🧩 ENRIQUECIMENTO DOS DATASETS DO DASHBOARD")
+    print("=" * 70)
+
+    manifesto = gerar_artefato(args.saida, args.data_referencia)
+
+    print(f"📅 Data de referência (idade): {manifesto['data_referencia']}")
+    for nome, meta in manifesto['datasets'].items():
+        print(f"   ✅ {nome}: {meta['linhas']} registros, {len(meta['colunas'])} colunas → {meta['arquivo']}")
+    print(f"📁 Artefato gravado em: {args.saida}")
+    print("=" * 70)
+
+if __name__ == "__main__":
+    main()
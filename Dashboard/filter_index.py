@@ -0,0 +1,84 @@
+"""
+Índice de filtros da barra "FILTROS DE ANÁLISE".
+
+Construído uma vez por dataset na carga (junto do registro compartilhado),
+guarda para cada dimensão filtrável um índice invertido valor -> posições das
+linhas. Cada interação só monta bitmaps (arrays booleanos) a partir das
+posições dos valores selecionados e os intersecta; o DataFrame é fatiado uma
+única vez no final, em vez de uma máscara booleana por filtro sobre o frame
+inteiro. As listas de opções dos widgets saem do mesmo índice.
+"""
+
+import numpy as np
+import pandas as pd
+
+DIMENSOES = ('Fase', 'Escola', 'Turma', 'Turma_Original', 'Sexo', 'FaixaEtaria', 'Idade')
+
+
+class Dimensao:
+    """Índice invertido de uma coluna: valores ordenados, códigos por linha e posições por valor."""
+
+    def __init__(self, serie: pd.Series):
+        valores = sorted(pd.unique(serie.dropna()).tolist())
+        self.valores = valores
+        self.codigos = np.asarray(pd.Categorical(serie, categories=valores).codes)
+        # Posições agrupadas por código (ordenação estável preserva a ordem das linhas)
+        ordem = np.argsort(self.codigos, kind='stable')
+        contagens = np.bincount(self.codigos[ordem] + 1, minlength=len(valores) + 1)
+        limites = np.cumsum(contagens)
+        self.posicoes = {v: ordem[limites[i]:limites[i + 1]] for i, v in enumerate(valores)}
+
+
+class IndiceFiltros:
+    """Índices invertidos das dimensões filtráveis de um dataset."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.n_linhas = len(df)
+        self._dimensoes = {col: Dimensao(df[col]) for col in DIMENSOES if col in df.columns}
+
+    def tem(self, coluna: str) -> bool:
+        return coluna in self._dimensoes
+
+    @property
+    def dimensoes(self) -> list:
+        """Colunas indexadas neste dataset."""
+        return list(self._dimensoes)
+
+    def codigos(self, coluna: str) -> np.ndarray:
+        """Código por linha (posição em `valores(coluna)`, -1 para nulos)."""
+        return self._dimensoes[coluna].codigos
+
+    def todos(self) -> np.ndarray:
+        """Bitmap com todas as linhas selecionadas."""
+        return np.ones(self.n_linhas, dtype=bool)
+
+    def valores(self, coluna: str, selecao: np.ndarray | None = None) -> list:
+        """Valores (ordenados, sem nulos) presentes nas linhas da seleção."""
+        dim = self._dimensoes[coluna]
+        if selecao is None or selecao.all():
+            return list(dim.valores)
+        codigos = dim.codigos[selecao]
+        presentes = np.bincount(codigos[codigos >= 0], minlength=len(dim.valores)) > 0
+        return [v for v, ok in zip(dim.valores, presentes) if ok]
+
+    def selecionar(self, coluna: str, valores) -> np.ndarray:
+        """Bitmap das linhas cujo valor em `coluna` está em `valores` (equivale a isin)."""
+        dim = self._dimensoes[coluna]
+        bitmap = np.zeros(self.n_linhas, dtype=bool)
+        for v in valores:
+            posicoes = dim.posicoes.get(v)
+            if posicoes is not None:
+                bitmap[posicoes] = True
+        return bitmap
+
+    def selecionar_intervalo(self, coluna: str, minimo, maximo) -> np.ndarray:
+        """Bitmap das linhas com minimo <= valor <= maximo (nulos ficam de fora)."""
+        dim = self._dimensoes[coluna]
+        return self.selecionar(coluna, [v for v in dim.valores if minimo <= v <= maximo])
+
+    @staticmethod
+    def aplicar(df: pd.DataFrame, selecao: np.ndarray) -> pd.DataFrame:
+        """Fatia o dataset uma única vez com o bitmap final."""
+        if selecao.all():
+            return df
+        return df.iloc[np.flatnonzero(selecao)]
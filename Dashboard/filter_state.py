@@ -0,0 +1,109 @@
+"""
+Estado canônico dos filtros da barra superior.
+
+Duas seleções que produzem o mesmo recorte de dados geram a mesma chave
+(listas ordenadas, tipos NumPy convertidos, coluna de turma ignorada quando
+nenhuma turma está selecionada). A chave é usada para memoizar as tabelas
+derivadas de cada seção do dashboard, compartilhadas entre sessões.
+
+O mesmo estado vai para a URL (query params), de modo que um link reproduz o
+recorte: listas viram parâmetros repetidos (`?fase=2&fase=3`), a faixa de idade
+vira `idade=10-14`, a data vai em ISO e `agregar=1` indica turmas agregadas.
+Parâmetros ausentes significam "sem filtro"; valores inválidos são ignorados.
+"""
+
+import json
+from dataclasses import asdict, dataclass
+from datetime import date
+
+# Nome do parâmetro na URL de cada campo de lista do estado
+PARAMETROS_LISTA = {
+    'fases': 'fase',
+    'escolas': 'escola',
+    'turmas': 'turma',
+    'sexos': 'sexo',
+    'faixas': 'faixa',
+}
+
+
+def _canonico(valores) -> tuple:
+    """Tupla ordenada de escalares Python (sem tipos NumPy)."""
+    return tuple(sorted(v.item() if hasattr(v, 'item') else v for v in (valores or [])))
+
+
+@dataclass(frozen=True)
+class EstadoFiltros:
+    prova: str
+    data_referencia: date | None = None
+    fases: tuple = ()
+    escolas: tuple = ()
+    coluna_turma: str | None = None
+    turmas: tuple = ()
+    sexos: tuple = ()
+    faixas: tuple = ()
+    idade: tuple | None = None
+
+    @classmethod
+    def de_selecoes(cls, prova, data_referencia=None, fases=(), escolas=(), coluna_turma=None,
+                    turmas=(), sexos=(), faixas=(), idade=None) -> 'EstadoFiltros':
+        """Monta o estado a partir dos valores dos widgets, já em forma canônica."""
+        turmas = _canonico(turmas)
+        return cls(
+            prova=prova,
+            data_referencia=data_referencia,
+            fases=_canonico(fases),
+            escolas=_canonico(escolas),
+            coluna_turma=coluna_turma if turmas else None,
+            turmas=turmas,
+            sexos=_canonico(sexos),
+            faixas=_canonico(faixas),
+            idade=tuple(int(i) for i in idade) if idade is not None else None,
+        )
+
+    def chave(self) -> str:
+        """Chave estável (JSON ordenado) do recorte de dados."""
+        return json.dumps(asdict(self), sort_keys=True, ensure_ascii=False, default=str)
+
+    def para_query_params(self) -> dict:
+        """Parâmetros de URL do estado (listas de texto na ordem canônica)."""
+        params = {'prova': [self.prova]}
+        if self.data_referencia is not None:
+            params['data'] = [self.data_referencia.isoformat()]
+        for campo, nome in PARAMETROS_LISTA.items():
+            valores = getattr(self, campo)
+            if valores:
+                params[nome] = [str(v) for v in valores]
+        if self.coluna_turma == 'Turma':
+            params['agregar'] = ['1']
+        if self.idade is not None:
+            params['idade'] = [f'{self.idade[0]}-{self.idade[1]}']
+        return params
+
+    @classmethod
+    def de_query_params(cls, params) -> 'EstadoFiltros | None':
+        """
+        Estado lido da URL (`params`: nome -> lista de valores); None sem `prova`.
+
+        Os valores das listas ficam como texto: quem usa o estado casa cada um
+        com as opções do widget correspondente por str().
+        """
+        prova = (params.get('prova') or [None])[0]
+        if not prova:
+            return None
+
+        data_referencia = None
+        try:
+            data_referencia = date.fromisoformat((params.get('data') or [''])[0])
+        except ValueError:
+            pass
+
+        idade = None
+        try:
+            minimo, maximo = sorted(int(i) for i in (params.get('idade') or [''])[0].split('-'))
+            idade = (minimo, maximo)
+        except ValueError:
+            pass
+
+        listas = {campo: params.get(nome) or () for campo, nome in PARAMETROS_LISTA.items()}
+        coluna_turma = 'Turma' if (params.get('agregar') or ['0'])[0] == '1' else 'Turma_Original'
+        return cls.de_selecoes(prova, data_referencia, coluna_turma=coluna_turma, idade=idade, **listas)
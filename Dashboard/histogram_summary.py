@@ -0,0 +1,68 @@
+"""
+Histogramas resumidos no servidor.
+
+Com `bin=alt.Bin(maxbins=...)` o Altair envia todas as linhas ao navegador,
+que calcula os intervalos a cada rerun. Aqui os intervalos são calculados com
+o mesmo algoritmo do Vega (passo "redondo" de 1, 2 ou 5 × 10^k, com no máximo
+`maxbins` intervalos e limites alinhados ao passo) e o gráfico recebe só a
+contagem por intervalo e categoria, desenhada com `bin='binned'`.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Mesmo EPSILON do transform bin do Vega (evita que 0.3 / 0.1 caia no intervalo anterior)
+EPSILON = 1e-14
+
+
+def intervalos_bin(minimo: float, maximo: float, maxbins: int = 30, base: int = 10,
+                   divisores: tuple = (5, 2)) -> tuple[float, float, float]:
+    """(início, fim, passo) dos intervalos, como o `bin` do vega-statistics com nice=True."""
+    amplitude = (maximo - minimo) or abs(minimo) or 1
+    log_base = math.log(base)
+    nivel = math.ceil(math.log(maxbins) / log_base)
+    passo = max(0.0, base ** (round(math.log(amplitude) / log_base) - nivel))
+    while math.ceil(amplitude / passo) > maxbins:
+        passo *= base
+    for divisor in divisores:
+        candidato = passo / divisor
+        if amplitude / candidato <= maxbins:
+            passo = candidato
+
+    v = math.log(passo)
+    precisao = 0 if v >= 0 else int(-v / log_base) + 1
+    eps = base ** (-precisao - 1)
+    v = math.floor(minimo / passo + eps) * passo
+    inicio = v - passo if minimo < v else v
+    fim = math.ceil(maximo / passo) * passo
+    return inicio, (inicio + passo if fim == inicio else fim), passo
+
+
+def resumir_histograma(valores, categorias=None, maxbins: int = 30) -> pd.DataFrame:
+    """
+    Contagem por intervalo (e por categoria, se informada) dos valores não nulos.
+
+    Retorna as colunas bin_inicio, bin_fim, [categoria] e n, só com os
+    intervalos que têm valores.
+    """
+    valores = np.asarray(valores, dtype=float)
+    validos = ~np.isnan(valores)
+    valores = valores[validos]
+    colunas = ['bin_inicio', 'bin_fim'] + (['categoria'] if categorias is not None else []) + ['n']
+    if len(valores) == 0:
+        return pd.DataFrame(columns=colunas)
+
+    inicio, fim, passo = intervalos_bin(valores.min(), valores.max(), maxbins)
+    limitados = np.clip(valores, inicio, fim - passo)
+    bin_inicio = inicio + passo * np.floor(EPSILON + (limitados - inicio) / passo)
+
+    dados = pd.DataFrame({'bin_inicio': bin_inicio})
+    grupos = ['bin_inicio']
+    if categorias is not None:
+        dados['categoria'] = np.asarray(categorias)[validos]
+        grupos.append('categoria')
+    contagens = dados.groupby(grupos, sort=True).size().rename('n').reset_index()
+    contagens['bin_fim'] = contagens['bin_inicio'] + passo
+    return contagens[colunas]
@@ -0,0 +1,83 @@
+"""
+Análise por questão (tabela de evolução por palavra do dashboard).
+
+O mapeamento questão -> palavra (RespostaVocabulario.json por fase e geral) é
+lido uma vez por processo, e % Pré, % Pós e Δ de todas as questões saem de uma
+única redução NumPy sobre o bloco de colunas Q*_Pre / Q*_Pos.
+"""
+
+import functools
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'Data')
+
+
+@functools.lru_cache(maxsize=None)
+def _ler_mapeamento(path: str) -> tuple:
+    """Pares (questão, palavra trabalhada) de um RespostaVocabulario.json; vazio se ausente/inválido."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            respostas = json.load(f)
+        return tuple(
+            (q_key, q_data['Palavra Trabalhada'])
+            for item in respostas
+            for q_key, q_data in item.items()
+            if 'Palavra Trabalhada' in q_data
+        )
+    except Exception:
+        return ()
+
+
+def carregar_mapeamento_palavras(fases) -> dict:
+    """
+    Mapeamento questão -> palavra para as fases selecionadas.
+
+    Usa o RespostaVocabulario.json de cada fase; se nenhuma fase tiver o
+    arquivo, cai no Data/RespostaVocabulario.json geral.
+    """
+    mapeamento = {}
+    for fase in fases:
+        mapeamento.update(_ler_mapeamento(os.path.join(DATA_DIR, f'Fase {int(fase)}', 'RespostaVocabulario.json')))
+    if not mapeamento:
+        mapeamento.update(_ler_mapeamento(os.path.join(DATA_DIR, 'RespostaVocabulario.json')))
+    return mapeamento
+
+
+def questoes_pareadas(colunas) -> list:
+    """Questões (Q1, Q2, ...) com colunas _Pre e _Pos, em ordem numérica."""
+    colunas = set(colunas)
+    questoes = {c.split('_Pre')[0] for c in colunas if c.startswith('Q') and '_Pre' in c}
+    return sorted((q for q in questoes if f'{q}_Pos' in colunas), key=lambda x: int(x[1:]))
+
+
+def tabela_evolucao_palavras(df: pd.DataFrame, mapeamento: dict) -> pd.DataFrame:
+    """
+    % de acerto Pré/Pós e Δ por questão, ordenado por Δ (decrescente).
+
+    Colunas: Palavra (ou o código da questão sem mapeamento), % Pré, % Pós, Δ.
+    Questões sem respostas válidas em um momento ficam com 0% nesse momento.
+    """
+    questoes = questoes_pareadas(df.columns)
+    if not questoes:
+        return pd.DataFrame(columns=['Palavra', '% Pré', '% Pós', 'Δ'])
+
+    # Bloco [linhas x (pré..., pós...)] e uma única redução por coluna
+    colunas = [f'{q}_Pre' for q in questoes] + [f'{q}_Pos' for q in questoes]
+    bloco = df[colunas].to_numpy(dtype=float, na_value=np.nan)
+    contagem = np.count_nonzero(~np.isnan(bloco), axis=0)
+    soma = np.nansum(bloco, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct = np.where(contagem > 0, soma / contagem * 100, 0.0)
+
+    n = len(questoes)
+    tabela = pd.DataFrame({
+        'Palavra': [mapeamento.get(q, q) for q in questoes],
+        '% Pré': pct[:n],
+        '% Pós': pct[n:],
+    })
+    tabela['Δ'] = tabela['% Pós'] - tabela['% Pré']
+    return tabela.sort_values('Δ', ascending=False)
@@ -0,0 +1,65 @@
+"""
+Conversão das respostas das questões em pontuação (TDE: 0/1; Vocabulário: 0/1/2).
+
+As planilhas trazem as respostas como números, textos ('1', ' 2.0 ', 'D',
+'M') ou vazios. Em vez de converter célula a célula (str().strip() + float()),
+o bloco de colunas é empilhado em um único array, os valores distintos são
+convertidos com um só pd.to_numeric e o bloco inteiro é classificado com
+np.select; o resultado volta como Int8 anulável (NA = sem resposta válida).
+
+Dois critérios:
+- faixas (pipeline por fase): <= 0 -> 0, (0, 1] -> 1, > 1 -> 2, limitado à
+  pontuação máxima da prova
+- exato (relatórios de Vocabulário): só 0, 1 e 2 (até a pontuação máxima)
+  são válidos; qualquer outro valor, inclusive 'D' e 'M', vira NA
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def pontuar(valores, pontuacao_maxima: int = 2, exato: bool = False) -> pd.arrays.IntegerArray:
+    """Pontuação Int8 de uma sequência de respostas (números, textos ou vazios)."""
+    valores = np.asarray(valores)
+    if valores.dtype.kind in 'biuf':
+        numeros = valores.astype(float, copy=False)
+    else:
+        # Poucos valores distintos: converte só os únicos e espalha pelos códigos.
+        # Textos com espaços nas pontas são aceitos; 'D', 'M' etc. viram NaN
+        codigos, unicos = pd.factorize(valores.astype(object, copy=False))
+        unicos = pd.to_numeric(pd.Series(unicos, dtype=object), errors='coerce').to_numpy(dtype=float)
+        numeros = np.append(unicos, np.nan)[codigos]
+
+    ausente = np.isnan(numeros)
+    if exato:
+        ausente |= ~np.isin(numeros, np.arange(pontuacao_maxima + 1))
+        pontos = np.where(ausente, 0, numeros)
+    else:
+        pontos = np.select([numeros <= 0, numeros <= 1], [0, 1], default=2)
+        pontos = np.clip(pontos, 0, pontuacao_maxima)
+    return pd.arrays.IntegerArray(pontos.astype(np.int8), ausente)
+
+
+def converter_respostas(df: pd.DataFrame, colunas, pontuacao_maxima: int = 2,
+                        exato: bool = False) -> pd.DataFrame:
+    """
+    Bloco convertido das colunas de questão presentes em `df` (Int8 anulável).
+
+    Uso: `df[bloco.columns] = bloco` com `bloco = converter_respostas(df, colunas)`.
+    """
+    colunas = [c for c in colunas if c in df.columns]
+    bloco = df[colunas]
+    if all(pd.api.types.is_numeric_dtype(t) for t in bloco.dtypes):
+        valores = bloco.to_numpy(dtype=float, na_value=np.nan)
+    else:
+        valores = bloco.to_numpy(dtype=object)
+    # Empilhado coluna a coluna: a coluna j ocupa o trecho [j*n, (j+1)*n)
+    pontos = pontuar(valores.ravel(order='F'), pontuacao_maxima, exato)
+    n = len(df)
+    return pd.DataFrame({col: pontos[j * n:(j + 1) * n] for j, col in enumerate(colunas)}, index=df.index)
+
+
+def converter_resposta(valor, pontuacao_maxima: int = 2, exato: bool = False):
+    """Versão escalar de `pontuar` (NaN quando a resposta não é válida)."""
+    pontos = pontuar([valor], pontuacao_maxima, exato)[0]
+    return np.nan if pd.isna(pontos) else int(pontos)
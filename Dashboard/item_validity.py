@@ -0,0 +1,63 @@
+"""
+Questões válidas por registro (respostas não nulas no bloco de questões).
+
+Os pipelines e relatórios descartam registros com poucas questões
+respondidas. A contagem sai de um único `notna().sum(axis=1)` sobre o bloco
+já convertido (ver item_scoring); o limiar fica com cada prova/relatório e
+pode ser absoluto (int, ex.: 25 questões) ou uma fração do total (float < 1,
+ex.: 0.25 -> ceil(25% das questões)).
+
+A distribuição das contagens (quantos registros têm 0, 1, ..., N questões
+válidas) sai junto, para os relatórios de qualidade dos dados.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+
+def minimo_questoes(limiar, n_questoes: int) -> int:
+    """Número mínimo de questões válidas: `limiar` absoluto ou fração de `n_questoes`."""
+    if isinstance(limiar, float) and limiar < 1:
+        return math.ceil(n_questoes * limiar)
+    return int(limiar)
+
+
+def contar_questoes_validas(df: pd.DataFrame, colunas) -> pd.Series:
+    """Questões respondidas por registro (colunas ausentes em `df` são ignoradas)."""
+    colunas = [c for c in colunas if c in df.columns]
+    return df[colunas].notna().sum(axis=1)
+
+
+def contar_questoes_pareadas(df_pre: pd.DataFrame, df_pos: pd.DataFrame, colunas) -> pd.Series:
+    """
+    Questões respondidas no Pré e no Pós, linha a linha (os dois DataFrames
+    alinhados por posição; resultado com o índice de `df_pre`).
+    """
+    colunas = [c for c in colunas if c in df_pre.columns and c in df_pos.columns]
+    pareadas = df_pre[colunas].notna().to_numpy() & df_pos[colunas].notna().to_numpy()
+    return pd.Series(pareadas.sum(axis=1), index=df_pre.index)
+
+
+def distribuicao_questoes_validas(contagens: pd.Series, n_questoes: int, minimo: int | None = None) -> pd.DataFrame:
+    """
+    Registros por número de questões válidas (0..n_questoes, inclusive as
+    contagens sem registros), com o percentual e, se `minimo` for informado,
+    a marcação de quem fica abaixo dele.
+    """
+    n = np.bincount(np.asarray(contagens, dtype=np.int64), minlength=n_questoes + 1)
+    distribuicao = pd.DataFrame({'questoes_validas': np.arange(len(n)), 'n': n})
+    distribuicao['percentual'] = distribuicao['n'] / max(len(contagens), 1) * 100
+    if minimo is not None:
+        distribuicao['abaixo_minimo'] = distribuicao['questoes_validas'] < minimo
+    return distribuicao
+
+
+def resumo_questoes_validas(contagens: pd.Series, n_questoes: int) -> str:
+    """Linha de log: mínimo, quartis e máximo das questões válidas por registro."""
+    if len(contagens) == 0:
+        return "sem registros"
+    q1, mediana, q3 = np.percentile(contagens, [25, 50, 75])
+    return (f"mín {contagens.min()} | Q1 {q1:g} | mediana {mediana:g} | Q3 {q3:g} | "
+            f"máx {contagens.max()} (de {n_questoes})")
@@ -0,0 +1,198 @@
+"""
+Instrumentação por seção do dashboard (tempo e pico de memória).
+
+Cada execução do script cria um MonitorSecoes; as seções (carga, filtros,
+cards, demografia, boxplot, palavras, histograma, drill-down, individual) são
+medidas com `with monitor.secao(nome):` ou, nos fragments, com o decorador
+`@monitor.cronometrar(nome)`. Com o monitor ativo (?debug=1 na URL ou a
+variável DASHBOARD_PERF_LOG definida) os tempos aparecem no painel oculto
+de desempenho e são anexados como JSON lines ao log, para acompanhar
+regressões entre versões. Inativo, o monitor não mede nada.
+
+Além das seções, o monitor guarda marcos medidos a partir do início do script:
+`importacoes` (tempo dos imports do app.py, alto só na primeira execução do
+processo) e `primeira_pintura` (início do script até os cards de resumo, o
+primeiro conteúdo com dados, serem enviados ao navegador). Marcos não têm pico
+de memória.
+
+O pico de memória é opcional (?debug=memoria na URL ou DASHBOARD_PERF_MEMORIA=1)
+e vem do tracemalloc: alocações Python/NumPy feitas durante a seção, acima do
+que já estava alocado na entrada. O tracemalloc é global ao processo e deixa
+todas as alocações mais lentas (as de outras sessões também), por isso só fica
+ligado enquanto alguma seção medida com memória está aberta e é desligado ao
+fim dela. Se outra sessão estiver em uma seção medida no mesmo intervalo, o
+pico não é atribuível a esta e é descartado (fica vazio). Tempos medidos com
+memória não são comparáveis aos medidos sem.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import subprocess
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+CAMINHO_LOG_PADRAO = os.path.join(os.path.dirname(__file__), '.cache', 'perf.jsonl')
+_trava_log = threading.Lock()
+
+# Seções externas abertas no processo (threads de sessões diferentes) e quantas já começaram
+_trava_secoes = threading.Lock()
+_secoes_abertas = {'total': 0, 'inicios': 0, 'tracemalloc_proprio': False}
+
+
+def memoria_solicitada() -> bool:
+    """Pico de memória pedido pelo ambiente (DASHBOARD_PERF_MEMORIA=1)."""
+    return os.environ.get('DASHBOARD_PERF_MEMORIA') == '1'
+
+
+def _abrir_secao_externa() -> tuple[int, bool]:
+    """Liga o tracemalloc na primeira seção aberta do processo; retorna (inícios, havia outra aberta)."""
+    with _trava_secoes:
+        outra_aberta = _secoes_abertas['total'] > 0
+        _secoes_abertas['total'] += 1
+        _secoes_abertas['inicios'] += 1
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _secoes_abertas['tracemalloc_proprio'] = True
+        return _secoes_abertas['inicios'], outra_aberta
+
+
+def _fechar_secao_externa() -> int:
+    """Desliga o tracemalloc (se foi ligado aqui) quando a última seção fecha; retorna os inícios."""
+    with _trava_secoes:
+        _secoes_abertas['total'] -= 1
+        if _secoes_abertas['total'] == 0 and _secoes_abertas['tracemalloc_proprio']:
+            tracemalloc.stop()
+            _secoes_abertas['tracemalloc_proprio'] = False
+        return _secoes_abertas['inicios']
+
+
+def caminho_log() -> str:
+    """Arquivo do log (DASHBOARD_PERF_LOG, se definida; senão Dashboard/.cache/perf.jsonl)."""
+    return os.environ.get('DASHBOARD_PERF_LOG') or CAMINHO_LOG_PADRAO
+
+
+@functools.lru_cache(maxsize=1)
+def versao_codigo() -> str | None:
+    """Commit atual do repositório (None fora de um checkout git)."""
+    try:
+        saida = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5
+        )
+        return saida.stdout.strip() or None
+    except Exception:
+        return None
+
+
+class MonitorSecoes:
+    """Tempo e pico de memória por seção de uma execução do script."""
+
+    def __init__(self, ativo: bool = False, caminho: str | None = None, inicio: float | None = None,
+                 memoria: bool = False):
+        self.ativo = ativo
+        self.memoria = ativo and memoria
+        self.inicio = inicio if inicio is not None else time.perf_counter()
+        self.caminho = caminho or caminho_log()
+        self.execucao = uuid.uuid4().hex[:12]
+        self.contexto = {}
+        self.resultados = {}
+        self._pilha = []
+        self._pendentes = []
+
+    @contextlib.contextmanager
+    def secao(self, nome: str):
+        """Mede o bloco como a seção `nome` (seções podem ser aninhadas)."""
+        if not self.ativo:
+            yield
+            return
+        if not self.memoria:
+            inicio = time.perf_counter()
+            try:
+                yield
+            finally:
+                self._registrar(nome, (time.perf_counter() - inicio) * 1000, None)
+            return
+
+        if self._pilha:
+            inicios, outra_aberta = self._pilha[0]['inicios'], self._pilha[0]['outra_aberta']
+            # O pico acumulado até aqui pertence à seção externa
+            self._pilha[-1]['pico'] = max(self._pilha[-1]['pico'], tracemalloc.get_traced_memory()[1])
+        else:
+            inicios, outra_aberta = _abrir_secao_externa()
+        atual = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        quadro = {'inicio_mem': atual, 'pico': atual, 'inicios': inicios, 'outra_aberta': outra_aberta}
+        self._pilha.append(quadro)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - inicio) * 1000
+            pico = max(quadro['pico'], tracemalloc.get_traced_memory()[1])
+            self._pilha.pop()
+            if self._pilha:
+                self._pilha[-1]['pico'] = max(self._pilha[-1]['pico'], pico)
+                # Só as seções externas contam como inícios; qualquer um a mais é de outra sessão
+                inicios = _secoes_abertas['inicios']
+            else:
+                inicios = _fechar_secao_externa()
+            concorrente = quadro['outra_aberta'] or inicios != quadro['inicios']
+            self._registrar(nome, ms, None if concorrente else (pico - quadro['inicio_mem']) / 1024 ** 2)
+
+    def cronometrar(self, nome: str):
+        """Decorador: mede a função como a seção `nome` e grava o log ao final (uso em fragments)."""
+        def decorador(func):
+            @functools.wraps(func)
+            def envoltorio(*args, **kwargs):
+                with self.secao(nome):
+                    resultado = func(*args, **kwargs)
+                self.gravar_log()
+                return resultado
+            return envoltorio
+        return decorador
+
+    def marco(self, nome: str, ms: float | None = None):
+        """Registra `nome` com `ms` ou, se omitido, com o tempo desde o início do script."""
+        if self.ativo:
+            self._registrar(nome, ms if ms is not None else (time.perf_counter() - self.inicio) * 1000, None)
+
+    def _registrar(self, nome: str, ms: float, pico_mb: float | None):
+        self.resultados[nome] = {'ms': ms, 'pico_mb': pico_mb}
+        self._pendentes.append({
+            'ts': datetime.now().isoformat(timespec='milliseconds'),
+            'execucao': self.execucao,
+            'secao': nome,
+            'ms': round(ms, 3),
+            'pico_mb': round(pico_mb, 3) if pico_mb is not None else None,
+        })
+
+    def tabela(self) -> pd.DataFrame:
+        """Resultados da execução atual (uma linha por seção, na ordem medida)."""
+        return pd.DataFrame(
+            [{'Seção': nome, 'Tempo (ms)': r['ms'], 'Pico de memória (MB)': r['pico_mb']}
+             for nome, r in self.resultados.items()],
+            columns=['Seção', 'Tempo (ms)', 'Pico de memória (MB)']
+        )
+
+    def gravar_log(self):
+        """Anexa as medições pendentes ao log (uma linha JSON por seção)."""
+        if not self.ativo or not self._pendentes:
+            return
+        extras = {'versao': versao_codigo(), **self.contexto}
+        linhas = [json.dumps({**registro, **extras}, ensure_ascii=False, default=str)
+                  for registro in self._pendentes]
+        self._pendentes = []
+        try:
+            os.makedirs(os.path.dirname(self.caminho) or '.', exist_ok=True)
+            with _trava_log, open(self.caminho, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(linhas) + '\n')
+        except OSError:
+            pass
@@ -0,0 +1,109 @@
+"""
+Cubo de estatísticas suficientes do dashboard.
+
+Para cada célula (combinação de Fase × Escola × Turma/Turma_Original × Sexo ×
+FaixaEtaria/Idade de uma prova) guarda n, soma e soma dos quadrados de
+Score_Pre, Score_Pos e Delta (Pós - Pré), além do conjunto de alunos
+(códigos de ID_Unico). Médias, desvios-padrão e d de Cohen de qualquer
+combinação de filtros saem da soma das células selecionadas, sem varrer as
+linhas do dataset.
+
+Como todos os filtros da barra superior são sobre dimensões do cubo, cada
+célula está inteira dentro ou fora da seleção: basta olhar o bitmap de filtros
+na linha representante de cada célula.
+"""
+
+import numpy as np
+import pandas as pd
+
+from effect_size import d_cohen_de_estatisticas, estatisticas_de_somas
+from filter_index import IndiceFiltros
+
+MEDIDAS = ('pre', 'pos', 'delta')  # delta = Score_Pos - Score_Pre, apenas onde os dois existem
+
+
+class CuboEstatisticas:
+    """Estatísticas suficientes por célula de um dataset, alinhadas ao índice de filtros."""
+
+    def __init__(self, df: pd.DataFrame, indice: IndiceFiltros):
+        self.dimensoes = indice.dimensoes
+
+        # Chave da célula em base mista a partir dos códigos do índice (-1 -> 0)
+        chave = np.zeros(len(df), dtype=np.int64)
+        for col in self.dimensoes:
+            chave = chave * (len(indice.valores(col)) + 1) + (indice.codigos(col) + 1)
+        self.celula, chaves = pd.factorize(chave)
+        n_celulas = len(chaves)
+
+        # Linha representante de cada célula (primeira ocorrência)
+        self.representante = np.full(n_celulas, len(df), dtype=np.int64)
+        np.minimum.at(self.representante, self.celula, np.arange(len(df)))
+
+        celulas = {}
+        for col in self.dimensoes:
+            valores = np.array(indice.valores(col) + [None], dtype=object)
+            celulas[col] = valores[indice.codigos(col)[self.representante]]
+        celulas['n_linhas'] = np.bincount(self.celula, minlength=n_celulas)
+
+        pre = df['Score_Pre'].to_numpy(dtype=float, na_value=np.nan)
+        pos = df['Score_Pos'].to_numpy(dtype=float, na_value=np.nan)
+        for medida, valores in zip(MEDIDAS, (pre, pos, pos - pre)):
+            validos = ~np.isnan(valores)
+            x = np.where(validos, valores, 0.0)
+            celulas[f'n_{medida}'] = np.bincount(self.celula, weights=validos, minlength=n_celulas)
+            celulas[f'soma_{medida}'] = np.bincount(self.celula, weights=x, minlength=n_celulas)
+            celulas[f'somaq_{medida}'] = np.bincount(self.celula, weights=x * x, minlength=n_celulas)
+        self._celulas = pd.DataFrame(celulas)
+
+        # Conjunto de alunos por célula: códigos únicos de ID_Unico, agrupados por célula
+        ids, _ = pd.factorize(df['ID_Unico'])
+        ordem = np.argsort(self.celula, kind='stable')
+        limites = np.cumsum(np.r_[0, celulas['n_linhas']])
+        ids_ordenados = ids[ordem]
+        self._alunos = [np.unique(ids_ordenados[limites[i]:limites[i + 1]]) for i in range(n_celulas)]
+        self._alunos = [a[a >= 0] for a in self._alunos]
+
+    def selecao_celulas(self, selecao: np.ndarray) -> np.ndarray:
+        """Máscara de células a partir do bitmap de linhas do IndiceFiltros."""
+        return selecao[self.representante]
+
+    def celulas(self, selecao: np.ndarray | None = None) -> pd.DataFrame:
+        """Células selecionadas (dimensões + somas)."""
+        if selecao is None:
+            return self._celulas
+        return self._celulas[self.selecao_celulas(selecao)]
+
+    def n_alunos(self, posicoes_celulas) -> int:
+        """Alunos únicos (ID_Unico) na união das células indicadas."""
+        conjuntos = [self._alunos[i] for i in posicoes_celulas]
+        if not conjuntos:
+            return 0
+        return len(np.unique(np.concatenate(conjuntos)))
+
+    def resumo(self, selecao: np.ndarray | None = None, por: str | None = None) -> pd.DataFrame:
+        """
+        Estatísticas da seleção, no total (uma linha) ou agrupadas por uma dimensão.
+
+        Colunas: n_linhas, n_alunos e, para pre/pos/delta, n_, media_ e dp_;
+        mais d_cohen (pré vs pós, desvio combinado).
+        """
+        sel = self.celulas(selecao)
+        posicoes = sel.index.to_numpy()
+        somas = [c for c in sel.columns if c not in self.dimensoes]
+
+        if por is None:
+            tabela = sel[somas].sum().to_frame().T
+            tabela['n_alunos'] = [self.n_alunos(posicoes)]
+        else:
+            agrupado = sel.groupby(por, sort=True)
+            tabela = agrupado[somas].sum()
+            tabela['n_alunos'] = [self.n_alunos(posicoes[agrupado.indices[g]]) for g in tabela.index]
+            tabela = tabela.reset_index()
+
+        for medida in MEDIDAS:
+            tabela[f'media_{medida}'], tabela[f'dp_{medida}'] = estatisticas_de_somas(
+                tabela[f'n_{medida}'], tabela[f'soma_{medida}'], tabela[f'somaq_{medida}'])
+        tabela['d_cohen'] = d_cohen_de_estatisticas(
+            tabela['n_pre'], tabela['media_pre'], tabela['dp_pre'],
+            tabela['n_pos'], tabela['media_pos'], tabela['dp_pos'])
+        return tabela
@@ -0,0 +1,68 @@
+"""
+Índice de alunos da seção "Evolução Individual".
+
+Montado uma vez por dataset na carga: ID_Anonimizado -> posições das linhas,
+com as fases de cada linha codificadas em bits. A lista de opções (com o
+rótulo de fases) e a busca por prefixo respeitam o bitmap de filtros ativo, e
+abrir um aluno é uma consulta direta às suas posições, sem varrer o dataset.
+"""
+
+import numpy as np
+import pandas as pd
+
+from filter_index import Dimensao
+
+SEM_SELECAO = "<selecione>"
+
+
+class IndiceAlunos:
+    """Posições e fases por aluno (ID_Anonimizado) de um dataset."""
+
+    def __init__(self, df: pd.DataFrame, coluna_id: str = 'ID_Anonimizado'):
+        self.n_linhas = len(df)
+        self._ids = Dimensao(df[coluna_id])
+        self._ids_ordenados = np.array(self._ids.valores, dtype=object)
+
+        # Bit da fase de cada linha (0 quando a fase é nula)
+        fases = Dimensao(df['Fase'])
+        self._fases = fases.valores
+        self._bits_fase = np.where(fases.codigos >= 0, np.left_shift(1, np.maximum(fases.codigos, 0)), 0).astype(np.int64)
+        self._rotulos = {}
+
+    def _rotulo(self, mascara: int) -> str:
+        """'2, 3, 4' a partir da máscara de bits de fases (memoizado por máscara)."""
+        if mascara not in self._rotulos:
+            fases = [str(int(f)) for i, f in enumerate(self._fases) if mascara >> i & 1]
+            self._rotulos[mascara] = ', '.join(sorted(fases))
+        return self._rotulos[mascara]
+
+    def rotulos_fases(self, selecao: np.ndarray | None = None) -> dict:
+        """ID -> fases em que o aluno aparece nas linhas da seleção (ordenado por ID)."""
+        codigos = self._ids.codigos
+        linhas = codigos >= 0 if selecao is None else (codigos >= 0) & selecao
+        presentes = np.bincount(codigos[linhas], minlength=len(self._ids.valores)) > 0
+        mascaras = np.zeros(len(self._ids.valores), dtype=np.int64)
+        np.bitwise_or.at(mascaras, codigos[linhas], self._bits_fase[linhas])
+        return {self._ids.valores[i]: self._rotulo(int(mascaras[i])) for i in np.flatnonzero(presentes)}
+
+    def opcoes(self, selecao: np.ndarray | None = None, prefixo: str = '') -> list:
+        """Opções do seletor ("ID - Fases: X, Y"), opcionalmente restritas a um prefixo de ID."""
+        rotulos = self.rotulos_fases(selecao)
+        if prefixo:
+            inicio = np.searchsorted(self._ids_ordenados, prefixo, side='left')
+            fim = np.searchsorted(self._ids_ordenados, prefixo + '\uffff', side='right')
+            candidatos = self._ids_ordenados[inicio:fim]
+            rotulos = {i: rotulos[i] for i in candidatos if i in rotulos}
+        return [SEM_SELECAO] + [f"{id_aluno} - Fases: {fases}" for id_aluno, fases in rotulos.items()]
+
+    @staticmethod
+    def id_da_opcao(opcao: str) -> str:
+        """Extrai o ID de uma opção do seletor."""
+        return opcao.split(" - Fases:")[0] if opcao != SEM_SELECAO else SEM_SELECAO
+
+    def posicoes(self, id_aluno: str, selecao: np.ndarray | None = None) -> np.ndarray:
+        """Posições das linhas do aluno (restritas à seleção, se informada)."""
+        posicoes = self._ids.posicoes.get(id_aluno, np.empty(0, dtype=np.intp))
+        if selecao is None:
+            return posicoes
+        return posicoes[selecao[posicoes]]
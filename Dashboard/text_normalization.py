@@ -0,0 +1,100 @@
+"""
+Normalização de texto compartilhada (nomes de alunos, identificadores anonimizados).
+
+Todas as funções de Series normalizam cada valor distinto uma única vez
+(pd.factorize + dicionário de valores únicos) e propagam o resultado para as
+linhas: nomes se repetem entre fases e provas, então a maior parte do
+trabalho linha a linha era redundante.
+
+Modos de tratamento de caracteres especiais (mantêm o comportamento dos
+scripts que antes tinham cópias próprias da normalização):
+- None:       apenas acentos e espaços (data_loader, LongitudinalMatching)
+- 'espaco':   pontuação vira espaço, regex [^\\w\\s] (adicionar_data_aniversario)
+- 'remover':  tudo fora de [A-Z0-9\\s] é removido (refatorar_dados_longitudinais)
+"""
+
+import functools
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+MODOS_ESPECIAIS = (None, 'espaco', 'remover')
+
+_RE_ESPACOS = re.compile(r'\s+')
+_RE_ESPECIAIS_ESPACO = re.compile(r'[^\w\s]')
+_RE_ESPECIAIS_REMOVER = re.compile(r'[^A-Z0-9\s]')
+
+
+def remover_acentos(s: str) -> str:
+    """Remove marcas diacríticas (decomposição NFD)."""
+    return ''.join(c for c in unicodedata.normalize('NFD', s) if unicodedata.category(c) != 'Mn')
+
+
+@functools.lru_cache(maxsize=65536)
+def _normalizar_texto(s: str, especiais) -> str:
+    s = remover_acentos(s.strip().upper())
+    if especiais == 'espaco':
+        s = _RE_ESPECIAIS_ESPACO.sub(' ', s)
+    elif especiais == 'remover':
+        s = _RE_ESPECIAIS_REMOVER.sub('', s)
+    s = _RE_ESPACOS.sub(' ', s)
+    return s.strip() if especiais else s
+
+
+def normalize_name(s, especiais=None) -> str:
+    """
+    Normaliza um nome: maiúsculas, sem acentos, espaços colapsados.
+
+    Args:
+        s: Nome (qualquer valor; NaN/None viram '')
+        especiais: Tratamento de caracteres especiais (ver MODOS_ESPECIAIS)
+
+    Returns:
+        Nome normalizado
+    """
+    if especiais not in MODOS_ESPECIAIS:
+        raise ValueError(f"Modo de caracteres especiais inválido: {especiais!r}")
+    if pd.isna(s):
+        return ''
+    return _normalizar_texto(str(s), especiais)
+
+
+def mapear_unicos(serie: pd.Series, func, valor_nulo='') -> pd.Series:
+    """
+    Aplica `func` a cada valor distinto de `serie` uma única vez e propaga o
+    resultado para todas as linhas (NaN recebem `valor_nulo`).
+    """
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+    resultados = np.empty(len(unicos) + 1, dtype=object)
+    resultados[:len(unicos)] = [func(v) for v in unicos]
+    resultados[-1] = valor_nulo  # código -1 (NaN) aponta para a última posição
+    return pd.Series(resultados[codigos], index=serie.index, name=serie.name)
+
+
+def normalize_names(serie: pd.Series, especiais=None) -> pd.Series:
+    """Versão de normalize_name para uma Series inteira."""
+    if especiais not in MODOS_ESPECIAIS:
+        raise ValueError(f"Modo de caracteres especiais inválido: {especiais!r}")
+    return mapear_unicos(serie, lambda v: _normalizar_texto(str(v), especiais))
+
+
+def iniciais_nome(nome_normalizado: str, max_iniciais: int = 4) -> str:
+    """Primeira letra de cada palavra do nome (no máximo `max_iniciais`)."""
+    return ''.join(p[0] for p in nome_normalizado.split() if p)[:max_iniciais]
+
+
+def build_id_anonimizado(ids: pd.Series, nomes: pd.Series) -> pd.Series:
+    """
+    Monta a coluna ID_Anonimizado (LGPD) para um dataset inteiro.
+
+    Formato: [PRIMEIRAS_6_LETRAS_ID] - [INICIAIS_NOME], ou "DESCONHECIDO"
+    quando ID ou nome estão ausentes. Equivale a aplicar
+    data_loader.anonimizar_estudante linha a linha.
+    """
+    iniciais = mapear_unicos(nomes, lambda v: iniciais_nome(_normalizar_texto(str(v), None)))
+    prefixos = mapear_unicos(ids, lambda v: str(v)[:6])
+    resultado = (prefixos + ' - ' + iniciais).astype(object)
+    resultado[ids.isna().to_numpy() | nomes.isna().to_numpy()] = 'DESCONHECIDO'
+    return resultado.rename('ID_Anonimizado')
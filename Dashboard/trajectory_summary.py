@@ -0,0 +1,26 @@
+"""
+Nível de detalhe (LOD) das trajetórias do drill-down hierárquico.
+
+Até LIMIAR_ENTIDADES_LINHAS entidades o gráfico desenha uma linha por
+entidade; acima disso (ex.: milhares de alunos) desenha faixas de quantis por
+fase, que resumem a distribuição das trajetórias em poucas linhas de dados.
+"""
+
+import pandas as pd
+
+LIMIAR_ENTIDADES_LINHAS = 150
+QUANTIS = {'p10': 0.10, 'p25': 0.25, 'p50': 0.50, 'p75': 0.75, 'p90': 0.90}
+
+
+def usar_linhas_individuais(df_viz: pd.DataFrame, limiar: int | None = None) -> bool:
+    """True quando a seleção é pequena o bastante para uma linha por entidade."""
+    limiar = LIMIAR_ENTIDADES_LINHAS if limiar is None else limiar
+    return df_viz['Entidade'].nunique() <= limiar
+
+
+def faixas_quantis(df_viz: pd.DataFrame, coluna_x: str = 'Fase', valor: str = 'Valor') -> pd.DataFrame:
+    """Quantis (p10, p25, p50, p75, p90) e n de entidades de `valor` em cada `coluna_x`."""
+    agrupado = df_viz.dropna(subset=[valor]).groupby(coluna_x, sort=True)[valor]
+    faixas = pd.DataFrame({nome: agrupado.quantile(q) for nome, q in QUANTIS.items()})
+    faixas['n'] = agrupado.size()
+    return faixas.reset_index()
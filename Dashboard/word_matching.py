@@ -0,0 +1,62 @@
+"""
+Correspondência entre palavras do teste de vocabulário e palavras ensinadas.
+
+Regra (mantida dos scripts anteriores): a palavra do teste corresponde a uma
+palavra ensinada se as duas forem iguais após normalização, ou se ambas
+tiverem pelo menos 6 caracteres e a mesma raiz (6 primeiros caracteres).
+
+O índice normaliza as palavras ensinadas uma única vez e guarda um conjunto
+de formas exatas e um conjunto de raízes, então cada consulta custa O(1) em
+vez de percorrer e renormalizar toda a lista de palavras ensinadas.
+"""
+
+import functools
+import unicodedata
+
+TAMANHO_RAIZ = 6
+
+
+def normalizar_palavra(palavra: str) -> str:
+    """Normaliza palavra removendo acentos, convertendo para minúsculas e removendo pontuação final."""
+    if not palavra:
+        return ""
+    palavra_nfd = unicodedata.normalize('NFD', str(palavra).strip())
+    palavra_sem_acentos = ''.join(char for char in palavra_nfd if unicodedata.category(char) != 'Mn')
+    return palavra_sem_acentos.lower().rstrip('.,;:!?')
+
+
+class IndicePalavrasEnsinadas:
+    """Formas normalizadas exatas + raízes de 6 caracteres das palavras ensinadas."""
+
+    def __init__(self, palavras_ensinadas):
+        normalizadas = {normalizar_palavra(p) for p in palavras_ensinadas}
+        self.exatas = frozenset(normalizadas)
+        self.raizes = frozenset(p[:TAMANHO_RAIZ] for p in normalizadas if len(p) >= TAMANHO_RAIZ)
+
+    def __len__(self):
+        return len(self.exatas)
+
+    def corresponde(self, palavra_teste: str) -> bool:
+        """A palavra do teste corresponde a alguma palavra ensinada?"""
+        if not palavra_teste or not self.exatas:
+            return False
+        norm = normalizar_palavra(palavra_teste)
+        return norm in self.exatas or (len(norm) >= TAMANHO_RAIZ and norm[:TAMANHO_RAIZ] in self.raizes)
+
+    def corresponde_lote(self, palavras_teste) -> list:
+        """Versão em lote de `corresponde` (uma consulta O(1) por palavra)."""
+        return [self.corresponde(p) for p in palavras_teste]
+
+
+@functools.lru_cache(maxsize=32)
+def indice_palavras_ensinadas(palavras_ensinadas: frozenset) -> IndicePalavrasEnsinadas:
+    """Índice memoizado por conjunto de palavras (ex.: uma seleção de fases)."""
+    return IndicePalavrasEnsinadas(palavras_ensinadas)
+
+
+def palavra_ensinada_match(palavra_teste: str, palavras_ensinadas) -> bool:
+    """Verifica se palavra do teste corresponde a alguma palavra ensinada.
+
+    Usa correspondência exata normalizada e correspondência de raiz com no mínimo 6 caracteres.
+    """
+    return indice_palavras_ensinadas(frozenset(palavras_ensinadas)).corresponde(palavra_teste)
@@ -9,16 +9,18 @@ Autor: Sistema de Análise WordGen
 Data: 2025
 """
 
+import sys
 import pandas as pd
 import numpy as np
 import pathlib
 from datetime import datetime
-import math
 
 # Configurações de paths
 BASE_DIR = pathlib.Path(__file__).parent.parent.parent.resolve()
 DATA_DIR = BASE_DIR / "Data"
 ANALISE_DIR = pathlib.Path(__file__).parent
+sys.path.append(str(BASE_DIR / "Dashboard"))
+from effect_size import estatisticas_por_grupo
 
 # Arquivos de entrada
 ARQUIVOS_TDE = {
@@ -64,28 +66,10 @@ def extrair_ano_turma(turma: str) -> str:
     
     return "Não identificado"
 
-def calcular_d_cohen(df: pd.DataFrame, col_pre: str = 'Score_Pre', col_pos: str = 'Score_Pos') -> float:
-    """Calcula d de Cohen para medidas pré e pós"""
-    if df.empty:
-        return np.nan
-    
-    pre = df[col_pre].dropna()
-    pos = df[col_pos].dropna()
-    
-    if len(pre) < 2 or len(pos) < 2:
-        return np.nan
-    
-    m_pre, m_pos = pre.mean(), pos.mean()
-    sd_pre, sd_pos = pre.std(ddof=1), pos.std(ddof=1)
-    
-    # Desvio padrão agrupado
-    n_pre, n_pos = len(pre), len(pos)
-    pooled_sd = math.sqrt(((n_pre - 1) * sd_pre**2 + (n_pos - 1) * sd_pos**2) / (n_pre + n_pos - 2))
-    
-    if pooled_sd == 0:
-        return np.nan
-    
-    return (m_pos - m_pre) / pooled_sd
+def d_cohen_por_grupo(df: pd.DataFrame, por) -> dict:
+    """d de Cohen (desvio combinado) de cada grupo de `por`, indexado pela chave do grupo"""
+    tabela = estatisticas_por_grupo(df, por)
+    return tabela.set_index(por)['d_cohen'].to_dict()
 
 def classificar_d_cohen(d: float) -> str:
     """Classifica o tamanho do efeito (Cohen, 1988)"""
@@ -150,11 +134,8 @@ def gerar_estatisticas_agregadas(df: pd.DataFrame) -> dict:
         'Delta_Score': ['mean', 'std']
     }).round(2)
     
-    # Calcular d de Cohen por ano
-    d_cohen_por_ano = {}
-    for ano in df['Ano_Calendario'].unique():
-        df_ano = df[df['Ano_Calendario'] == ano]
-        d_cohen_por_ano[ano] = calcular_d_cohen(df_ano)
+    # Calcular d de Cohen por ano (todos os anos em uma chamada)
+    d_cohen_por_ano = d_cohen_por_grupo(df, 'Ano_Calendario')
     
     resultados['por_ano'] = {
         'estatisticas': por_ano,
@@ -169,10 +150,7 @@ def gerar_estatisticas_agregadas(df: pd.DataFrame) -> dict:
         'Delta_Score': ['mean', 'std']
     }).round(2)
     
-    d_cohen_por_fase = {}
-    for fase in df['Fase'].unique():
-        df_fase = df[df['Fase'] == fase]
-        d_cohen_por_fase[fase] = calcular_d_cohen(df_fase)
+    d_cohen_por_fase = d_cohen_por_grupo(df, 'Fase')
     
     resultados['por_fase'] = {
         'estatisticas': por_fase,
@@ -187,10 +165,7 @@ def gerar_estatisticas_agregadas(df: pd.DataFrame) -> dict:
         'Delta_Score': ['mean', 'std']
     }).round(2)
     
-    d_cohen_por_turma = {}
-    for turma in df['Ano_Turma'].unique():
-        df_turma = df[df['Ano_Turma'] == turma]
-        d_cohen_por_turma[turma] = calcular_d_cohen(df_turma)
+    d_cohen_por_turma = d_cohen_por_grupo(df, 'Ano_Turma')
     
     resultados['por_turma'] = {
         'estatisticas': por_turma,
@@ -205,10 +180,7 @@ def gerar_estatisticas_agregadas(df: pd.DataFrame) -> dict:
         'Delta_Score': ['mean', 'std']
     }).round(2)
     
-    d_cohen_cruzado = {}
-    for (ano_cal, ano_turma) in df.groupby(['Ano_Calendario', 'Ano_Turma']).groups.keys():
-        df_grupo = df[(df['Ano_Calendario'] == ano_cal) & (df['Ano_Turma'] == ano_turma)]
-        d_cohen_cruzado[(ano_cal, ano_turma)] = calcular_d_cohen(df_grupo)
+    d_cohen_cruzado = d_cohen_por_grupo(df, ['Ano_Calendario', 'Ano_Turma'])
     
     resultados['cruzado'] = {
         'estatisticas': cruzado,
@@ -9,16 +9,18 @@ Autor: Sistema de Análise WordGen
 Data: 2025
 """
 
+import sys
 import pandas as pd
 import numpy as np
 import pathlib
 from datetime import datetime
-import math
 
 # Configurações de paths
 BASE_DIR = pathlib.Path(__file__).parent.parent.parent.resolve()
 DATA_DIR = BASE_DIR / "Data"
 ANALISE_DIR = pathlib.Path(__file__).parent
+sys.path.append(str(BASE_DIR / "Dashboard"))
+from effect_size import estatisticas_por_grupo
 
 # Arquivos de entrada
 ARQUIVOS_TDE = {
@@ -64,32 +66,6 @@ def extrair_ano_turma(turma: str) -> str:
     
     return "Não identificado"
 
-def calcular_d_cohen(df: pd.DataFrame, col_pre: str = 'Score_Pre', col_pos: str = 'Score_Pos') -> float:
-    """Calcula d de Cohen para medidas pré e pós"""
-    if df.empty:
-        return np.nan
-    
-    pre = df[col_pre].dropna()
-    pos = df[col_pos].dropna()
-    
-    if len(pre) < 2 or len(pos) < 2:
-        return np.nan
-    
-    m_pre, m_pos = pre.mean(), pos.mean()
-    sd_pre, sd_pos = pre.std(ddof=1), pos.std(ddof=1)
-    
-    # Desvio padrão agrupado
-    n_pre, n_pos = len(pre), len(pos)
-    if n_pre + n_pos - 2 <= 0:
-        return np.nan
-    
-    pooled_sd = math.sqrt(((n_pre - 1) * sd_pre**2 + (n_pos - 1) * sd_pos**2) / (n_pre + n_pos - 2))
-    
-    if pooled_sd == 0:
-        return np.nan
-    
-    return (m_pos - m_pre) / pooled_sd
-
 def classificar_d_cohen(d: float, prova: str = None) -> tuple:
     """Classifica o tamanho do efeito com benchmarks específicos por prova"""
     if np.isnan(d):
@@ -156,36 +132,56 @@ def processar_dataset(df: pd.DataFrame, tipo: str) -> pd.DataFrame:
     
     return df
 
-def calcular_estatisticas_descritivas(grupo_df: pd.DataFrame) -> dict:
-    """Calcula estatísticas descritivas completas para um grupo"""
-    if grupo_df.empty:
+def estatisticas_descritivas_por_grupo(df: pd.DataFrame, por=None, n_minimo: int = 1) -> dict:
+    """Estatísticas descritivas completas de cada grupo de `por` (None = grupo único), em uma chamada"""
+    if df.empty:
         return {}
     
-    stats = {
-        'n': len(grupo_df),
-        'pre_mean': grupo_df['Score_Pre'].mean(),
-        'pre_std': grupo_df['Score_Pre'].std(),
-        'pre_min': grupo_df['Score_Pre'].min(),
-        'pre_max': grupo_df['Score_Pre'].max(),
-        'pos_mean': grupo_df['Score_Pos'].mean(),
-        'pos_std': grupo_df['Score_Pos'].std(),
-        'pos_min': grupo_df['Score_Pos'].min(),
-        'pos_max': grupo_df['Score_Pos'].max(),
-        'delta_mean': grupo_df['Delta_Score'].mean(),
-        'delta_std': grupo_df['Delta_Score'].std(),
-        'delta_min': grupo_df['Delta_Score'].min(),
-        'delta_max': grupo_df['Delta_Score'].max(),
-        'd_cohen': calcular_d_cohen(grupo_df),
-        'melhoria_pct': (grupo_df['Delta_Score'] > 0).sum() / len(grupo_df) * 100,
-        'declinio_pct': (grupo_df['Delta_Score'] < 0).sum() / len(grupo_df) * 100,
-        'estavel_pct': (grupo_df['Delta_Score'] == 0).sum() / len(grupo_df) * 100
-    }
-    
-    return stats
+    por_lista = [por] if isinstance(por, str) else list(por or [])
+    tabela = estatisticas_por_grupo(df, por_lista)
+    colunas = ['Score_Pre', 'Score_Pos', 'Delta_Score']
+    if por_lista:
+        extremos = df.groupby(por_lista, observed=True)[colunas].agg(['min', 'max'])
+    else:
+        extremos = df[colunas].agg(['min', 'max']).unstack().to_frame().T
+    
+    resultados = {}
+    for i, linha in tabela.iterrows():
+        if linha['n'] < n_minimo:
+            continue
+        chave = tuple(linha[por_lista]) if len(por_lista) > 1 else (linha[por_lista[0]] if por_lista else None)
+        ext = extremos.iloc[i]
+        n = int(linha['n'])
+        resultados[chave] = {
+            'n': n,
+            'pre_mean': linha['media_pre'],
+            'pre_std': linha['dp_pre'],
+            'pre_min': ext[('Score_Pre', 'min')],
+            'pre_max': ext[('Score_Pre', 'max')],
+            'pos_mean': linha['media_pos'],
+            'pos_std': linha['dp_pos'],
+            'pos_min': ext[('Score_Pos', 'min')],
+            'pos_max': ext[('Score_Pos', 'max')],
+            'delta_mean': linha['media_delta'],
+            'delta_std': linha['dp_delta'],
+            'delta_min': ext[('Delta_Score', 'min')],
+            'delta_max': ext[('Delta_Score', 'max')],
+            'd_cohen': linha['d_cohen'],
+            'melhoria_pct': linha['n_melhora'] / n * 100,
+            'declinio_pct': linha['n_piora'] / n * 100,
+            'estavel_pct': linha['n_estavel'] / n * 100
+        }
+    
+    return resultados
+
+def calcular_estatisticas_descritivas(grupo_df: pd.DataFrame) -> dict:
+    """Calcula estatísticas descritivas completas para um grupo"""
+    return estatisticas_descritivas_por_grupo(grupo_df).get(None, {})
 
 def gerar_analise_completa(df: pd.DataFrame, tipo_prova: str) -> dict:
     """Gera análise completa por múltiplas dimensões"""
     resultados = {}
+    df_turma_identificada = df[df['Ano_Turma'] != "Não identificado"]
     
     print(f"   Analisando {tipo_prova}...")
     
@@ -195,70 +191,33 @@ def gerar_analise_completa(df: pd.DataFrame, tipo_prova: str) -> dict:
     
     # 2. Por Ano Calendário (2023 vs 2024)
     print("     - Por ano calendário")
-    resultados['por_ano'] = {}
-    for ano in sorted(df['Ano_Calendario'].unique()):
-        df_ano = df[df['Ano_Calendario'] == ano]
-        resultados['por_ano'][ano] = calcular_estatisticas_descritivas(df_ano)
+    resultados['por_ano'] = estatisticas_descritivas_por_grupo(df, 'Ano_Calendario')
     
     # 3. Por Fase
     print("     - Por fase")
-    resultados['por_fase'] = {}
-    for fase in sorted(df['Fase'].unique()):
-        df_fase = df[df['Fase'] == fase]
-        resultados['por_fase'][fase] = calcular_estatisticas_descritivas(df_fase)
+    resultados['por_fase'] = estatisticas_descritivas_por_grupo(df, 'Fase')
     
     # 4. Por Ano de Turma
     print("     - Por ano de turma")
-    resultados['por_turma'] = {}
-    for turma in sorted(df['Ano_Turma'].unique()):
-        if turma != "Não identificado":
-            df_turma = df[df['Ano_Turma'] == turma]
-            if not df_turma.empty:
-                resultados['por_turma'][turma] = calcular_estatisticas_descritivas(df_turma)
+    resultados['por_turma'] = estatisticas_descritivas_por_grupo(df_turma_identificada, 'Ano_Turma')
     
     # 5. Análise Cruzada: Ano Calendário × Fase
     print("     - Cruzamento ano × fase")
-    resultados['ano_x_fase'] = {}
-    for ano in sorted(df['Ano_Calendario'].unique()):
-        for fase in sorted(df['Fase'].unique()):
-            df_cruzado = df[(df['Ano_Calendario'] == ano) & (df['Fase'] == fase)]
-            if not df_cruzado.empty:
-                resultados['ano_x_fase'][(ano, fase)] = calcular_estatisticas_descritivas(df_cruzado)
+    resultados['ano_x_fase'] = estatisticas_descritivas_por_grupo(df, ['Ano_Calendario', 'Fase'])
     
     # 6. Análise Cruzada: Ano Calendário × Ano de Turma
     print("     - Cruzamento ano × turma")
-    resultados['ano_x_turma'] = {}
-    for ano in sorted(df['Ano_Calendario'].unique()):
-        for turma in sorted(df['Ano_Turma'].unique()):
-            if turma != "Não identificado":
-                df_cruzado = df[(df['Ano_Calendario'] == ano) & (df['Ano_Turma'] == turma)]
-                if not df_cruzado.empty:
-                    resultados['ano_x_turma'][(ano, turma)] = calcular_estatisticas_descritivas(df_cruzado)
+    resultados['ano_x_turma'] = estatisticas_descritivas_por_grupo(
+        df_turma_identificada, ['Ano_Calendario', 'Ano_Turma'])
     
     # 7. Análise Cruzada: Fase × Ano de Turma
     print("     - Cruzamento fase × turma")
-    resultados['fase_x_turma'] = {}
-    for fase in sorted(df['Fase'].unique()):
-        for turma in sorted(df['Ano_Turma'].unique()):
-            if turma != "Não identificado":
-                df_cruzado = df[(df['Fase'] == fase) & (df['Ano_Turma'] == turma)]
-                if not df_cruzado.empty:
-                    resultados['fase_x_turma'][(fase, turma)] = calcular_estatisticas_descritivas(df_cruzado)
+    resultados['fase_x_turma'] = estatisticas_descritivas_por_grupo(df_turma_identificada, ['Fase', 'Ano_Turma'])
     
     # 8. Análise Tripla: Ano × Fase × Turma
     print("     - Análise tripla (ano × fase × turma)")
-    resultados['tripla'] = {}
-    for ano in sorted(df['Ano_Calendario'].unique()):
-        for fase in sorted(df['Fase'].unique()):
-            for turma in sorted(df['Ano_Turma'].unique()):
-                if turma != "Não identificado":
-                    df_tripla = df[
-                        (df['Ano_Calendario'] == ano) & 
-                        (df['Fase'] == fase) & 
-                        (df['Ano_Turma'] == turma)
-                    ]
-                    if not df_tripla.empty and len(df_tripla) >= 10:  # Mínimo de 10 casos
-                        resultados['tripla'][(ano, fase, turma)] = calcular_estatisticas_descritivas(df_tripla)
+    resultados['tripla'] = estatisticas_descritivas_por_grupo(
+        df_turma_identificada, ['Ano_Calendario', 'Fase', 'Ano_Turma'], n_minimo=10)  # Mínimo de 10 casos
     
     return resultados
 
@@ -8,16 +8,18 @@ Autor: Sistema de Análise WordGen
 Data: 2025
 """
 
+import sys
 import pandas as pd
 import numpy as np
 import pathlib
 from datetime import datetime
-import math
 
 # Configurações de paths
 BASE_DIR = pathlib.Path(__file__).parent.parent.parent.resolve()
 DATA_DIR = BASE_DIR / "Data"
 ANALISE_DIR = pathlib.Path(__file__).parent
+sys.path.append(str(BASE_DIR / "Dashboard"))
+from effect_size import estatisticas_por_grupo
 
 # Arquivos de entrada
 ARQUIVOS_TDE = {
@@ -58,31 +60,6 @@ def extrair_ano_turma(turma: str) -> str:
     
     return "Não identificado"
 
-def calcular_d_cohen(df: pd.DataFrame, col_pre: str = 'Score_Pre', col_pos: str = 'Score_Pos') -> float:
-    """Calcula d de Cohen para medidas pré e pós"""
-    if df.empty:
-        return np.nan
-    
-    pre = df[col_pre].dropna()
-    pos = df[col_pos].dropna()
-    
-    if len(pre) < 2 or len(pos) < 2:
-        return np.nan
-    
-    m_pre, m_pos = pre.mean(), pos.mean()
-    sd_pre, sd_pos = pre.std(ddof=1), pos.std(ddof=1)
-    
-    n_pre, n_pos = len(pre), len(pos)
-    if n_pre + n_pos - 2 <= 0:
-        return np.nan
-    
-    pooled_sd = math.sqrt(((n_pre - 1) * sd_pre**2 + (n_pos - 1) * sd_pos**2) / (n_pre + n_pos - 2))
-    
-    if pooled_sd == 0:
-        return np.nan
-    
-    return (m_pos - m_pre) / pooled_sd
-
 def carregar_e_processar_dados():
     """Carrega e processa todos os dados"""
     # Carregar TDE
@@ -123,19 +100,16 @@ def criar_tabela_resumo(df_tde: pd.DataFrame, df_vocab: pd.DataFrame) -> pd.Data
     resultados = []
     
     # Função auxiliar para calcular métricas
-    def calcular_metricas(df_grupo, nome_grupo, prova):
-        if df_grupo.empty:
-            return None
-        
-        n = len(df_grupo)
-        pre_mean = df_grupo['Score_Pre'].mean()
-        pos_mean = df_grupo['Score_Pos'].mean()
-        delta_mean = df_grupo['Delta_Score'].mean()
-        d_cohen = calcular_d_cohen(df_grupo)
+    def calcular_metricas(linha, nome_grupo, prova):
+        n = int(linha['n'])
+        pre_mean = linha['media_pre']
+        pos_mean = linha['media_pos']
+        delta_mean = linha['media_delta']
+        d_cohen = linha['d_cohen']
         
         # Distribuição de resultados
-        melhoria_pct = (df_grupo['Delta_Score'] > 0).sum() / n * 100
-        declinio_pct = (df_grupo['Delta_Score'] < 0).sum() / n * 100
+        melhoria_pct = linha['n_melhora'] / n * 100
+        declinio_pct = linha['n_piora'] / n * 100
         
         # Classificação do d de Cohen
         if np.isnan(d_cohen):
@@ -172,53 +146,46 @@ def criar_tabela_resumo(df_tde: pd.DataFrame, df_vocab: pd.DataFrame) -> pd.Data
             'Declinio_Pct': declinio_pct
         }
     
-    # 1. Análise geral
+    # Estatísticas de todos os grupos de cada dimensão: uma chamada por prova e dimensão
+    dimensoes = {
+        'geral': None,
+        'ano': 'Ano_Calendario',
+        'fase': 'Fase',
+        'turma': 'Ano_Turma',
+        'ano_x_turma': ['Ano_Calendario', 'Ano_Turma']
+    }
+    tabelas = {}
     for df, prova in [(df_tde, 'TDE'), (df_vocab, 'VOCABULARIO')]:
         if not df.empty:
-            resultado = calcular_metricas(df, 'GERAL', prova)
-            if resultado:
-                resultados.append(resultado)
+            for dimensao, por in dimensoes.items():
+                tabela = estatisticas_por_grupo(df, por)
+                tabelas[(prova, dimensao)] = tabela.set_index(por) if por else tabela
+    
+    def adicionar(dimensao, chave, nome_grupo):
+        for prova in ['TDE', 'VOCABULARIO']:
+            tabela = tabelas.get((prova, dimensao))
+            if tabela is not None and chave in tabela.index:
+                resultados.append(calcular_metricas(tabela.loc[chave], nome_grupo, prova))
+    
+    # 1. Análise geral
+    adicionar('geral', 0, 'GERAL')
     
     # 2. Por ano calendário
     for ano in [2023, 2024]:
-        for df, prova in [(df_tde, 'TDE'), (df_vocab, 'VOCABULARIO')]:
-            if not df.empty:
-                df_ano = df[df['Ano_Calendario'] == ano]
-                if not df_ano.empty:
-                    resultado = calcular_metricas(df_ano, f'ANO_{ano}', prova)
-                    if resultado:
-                        resultados.append(resultado)
+        adicionar('ano', ano, f'ANO_{ano}')
     
     # 3. Por fase
     for fase in [2, 3, 4]:
-        for df, prova in [(df_tde, 'TDE'), (df_vocab, 'VOCABULARIO')]:
-            if not df.empty:
-                df_fase = df[df['Fase'] == fase]
-                if not df_fase.empty:
-                    resultado = calcular_metricas(df_fase, f'FASE_{fase}', prova)
-                    if resultado:
-                        resultados.append(resultado)
+        adicionar('fase', fase, f'FASE_{fase}')
     
     # 4. Por ano de turma
     for turma in ['6º Ano', '7º Ano', '8º Ano', '9º Ano']:
-        for df, prova in [(df_tde, 'TDE'), (df_vocab, 'VOCABULARIO')]:
-            if not df.empty:
-                df_turma = df[df['Ano_Turma'] == turma]
-                if not df_turma.empty:
-                    resultado = calcular_metricas(df_turma, f'TURMA_{turma.replace("º", "")}', prova)
-                    if resultado:
-                        resultados.append(resultado)
+        adicionar('turma', turma, f'TURMA_{turma.replace("º", "")}')
     
     # 5. Cruzamento Ano × Turma (principais)
     for ano in [2023, 2024]:
         for turma in ['6º Ano', '7º Ano', '8º Ano', '9º Ano']:
-            for df, prova in [(df_tde, 'TDE'), (df_vocab, 'VOCABULARIO')]:
-                if not df.empty:
-                    df_cruzado = df[(df['Ano_Calendario'] == ano) & (df['Ano_Turma'] == turma)]
-                    if not df_cruzado.empty:
-                        resultado = calcular_metricas(df_cruzado, f'{ano}x{turma.replace("º", "")}', prova)
-                        if resultado:
-                            resultados.append(resultado)
+            adicionar('ano_x_turma', (ano, turma), f'{ano}x{turma.replace("º", "")}')
     
     return pd.DataFrame(resultados)
 
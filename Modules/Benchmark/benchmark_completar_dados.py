@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BENCHMARK - completar_dados_faltantes
+Compara a versão antiga (iterrows com nova varredura do DataFrame para cada
+registro incompleto) com a versão groupby por nome do
+Modules/PipelineFases/pipeline_fases.py em exportações sintéticas de até 100
+mil linhas.
+
+Cada aluno aparece em ~2 registros (mesma escola e turma); uma fração
+(--faltantes) dos registros perde Escola e/ou Turma (vazio, NaN ou 'nan') e
+parte dos nomes vem com espaços nas pontas. Com --homonimos, alunos diferentes
+podem ter o mesmo nome e os doadores de um registro podem discordar: a versão
+atual usa, campo a campo, o primeiro registro preenchido do nome; a antiga
+dependia da ordem de processamento (registros já completados viravam
+doadores e um registro sem os dois campos podia trocar de doador no meio da
+busca). A coluna "Saída" mostra quantas células diferem.
+
+Para cada tamanho:
+- mede o tempo da versão atual
+- mede o tempo da versão antiga (até --limite-legado linhas, pois é O(incompletos × linhas))
+- compara Escola e Turma das duas saídas
+
+Uso:
+    python Modules/Benchmark/benchmark_completar_dados.py
+    python Modules/Benchmark/benchmark_completar_dados.py --tamanhos 10000 100000 --limite-legado 100000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(BASE_DIR, 'Modules', 'PipelineFases'))
+from pipeline_fases import completar_dados_faltantes
+
+
+def completar_dados_faltantes_legado(df, nome_dataset):
+    """Implementação anterior, mantida apenas como referência de desempenho e saída."""
+    print(f"   Verificando dados incompletos em {nome_dataset}...")
+    registros_incompletos = 0
+    registros_completados = 0
+
+    for idx, row in df.iterrows():
+        nome = str(row['Nome']).strip()
+        escola_faltante = pd.isna(row['Escola']) or str(row['Escola']).strip() == '' or str(row['Escola']).strip().lower() == 'nan'
+        turma_faltante = pd.isna(row['Turma']) or str(row['Turma']).strip() == '' or str(row['Turma']).strip().lower() == 'nan'
+
+        if escola_faltante or turma_faltante:
+            registros_incompletos += 1
+
+            # Buscar registros do mesmo aluno com dados completos
+            registros_mesmo_aluno = df[df['Nome'].str.strip() == nome]
+
+            for _, reg_completo in registros_mesmo_aluno.iterrows():
+                if reg_completo.name == idx:
+                    continue
+
+                escola_completa = not (pd.isna(reg_completo['Escola']) or str(reg_completo['Escola']).strip() == '' or str(reg_completo['Escola']).strip().lower() == 'nan')
+                turma_completa = not (pd.isna(reg_completo['Turma']) or str(reg_completo['Turma']).strip() == '' or str(reg_completo['Turma']).strip().lower() == 'nan')
+
+                if escola_faltante and escola_completa:
+                    df.at[idx, 'Escola'] = reg_completo['Escola']
+                    registros_completados += 1
+                    print(f"     Completado Escola para {nome}: {reg_completo['Escola']}")
+
+                if turma_faltante and turma_completa:
+                    df.at[idx, 'Turma'] = reg_completo['Turma']
+                    registros_completados += 1
+                    print(f"     Completado Turma para {nome}: {reg_completo['Turma']}")
+
+                # Se ambos foram completados, parar a busca
+                if not (escola_faltante and not escola_completa) and not (turma_faltante and not turma_completa):
+                    break
+
+    print(f"   {registros_incompletos} registros com dados incompletos encontrados")
+    print(f"   {registros_completados} campos completados")
+    return df
+
+
+def gerar_exportacao(n_linhas: int, fracao_faltantes: float, homonimos: bool, seed: int = 42) -> pd.DataFrame:
+    """Exportação sintética Nome/Escola/Turma (~2 registros por aluno, ordem embaralhada)."""
+    rng = np.random.default_rng(seed)
+    n_alunos = max(1, n_linhas // 2)
+    aluno = rng.integers(0, n_alunos, n_linhas)
+    # Homônimos: ~1/4 dos nomes repetidos entre alunos de escolas diferentes
+    id_nome = aluno // 4 if homonimos else aluno
+    escolas = np.array([f'ESCOLA MUNICIPAL {i:02d}' for i in range(40)])
+    turmas = np.array([f'{s}º ANO {t}' for s in (6, 7, 8, 9) for t in 'ABCD'])
+
+    df = pd.DataFrame({
+        'Nome': pd.Series([f'ALUNO {i:07d}' for i in id_nome]),
+        'Escola': escolas[aluno % len(escolas)],
+        'Turma': turmas[(aluno // len(escolas)) % len(turmas)],
+        'P1': rng.integers(0, 2, n_linhas),
+    })
+    com_espaco = rng.random(n_linhas) < 0.05
+    df.loc[com_espaco, 'Nome'] = ' ' + df.loc[com_espaco, 'Nome'] + ' '
+
+    # Campos faltando: Escola, Turma ou ambos, como '', NaN ou 'nan'
+    sujos = np.flatnonzero(rng.random(n_linhas) < fracao_faltantes)
+    qual = rng.integers(0, 3, len(sujos))
+    vazios = np.array(['', np.nan, 'nan'], dtype=object)[rng.integers(0, 3, len(sujos))]
+    for col, alvo in (('Escola', qual != 1), ('Turma', qual != 0)):
+        df[col] = df[col].astype(object)
+        df.loc[sujos[alvo], col] = vazios[alvo]
+    return df
+
+
+def cronometrar(func, df, repeticoes: int):
+    """Menor tempo entre as repetições (o log impresso pela função é descartado)."""
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        copia = df.copy()
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultado = func(copia, 'benchmark')
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def celulas_diferentes(a: pd.DataFrame, b: pd.DataFrame) -> int:
+    diferentes = 0
+    for col in ('Escola', 'Turma'):
+        x, y = a[col].astype(object), b[col].astype(object)
+        diferentes += int((~((x == y) | (x.isna() & y.isna()))).sum())
+    return diferentes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de completar_dados_faltantes')
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--limite-legado', type=int, default=100_000,
+                        help='Maior tamanho em que a versão antiga é executada')
+    parser.add_argument('--faltantes', type=float, default=0.05, help='Fração de registros incompletos')
+    parser.add_argument('--homonimos', action='store_true', help='Nomes repetidos entre alunos diferentes')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("⏱️  BENCHMARK completar_dados_faltantes")
+    print("=" * 72)
+    print(f"{'Linhas':>10} {'Incompletos':>12} {'Atual (s)':>11} {'Legado (s)':>11} {'Speedup':>9}  Saída")
+
+    for n in args.tamanhos:
+        df = gerar_exportacao(n, args.faltantes, args.homonimos)
+        incompletos = int((df[['Escola', 'Turma']].isna() | df[['Escola', 'Turma']].isin(['', 'nan'])).any(axis=1).sum())
+        t_novo, res_novo = cronometrar(completar_dados_faltantes, df, args.repeticoes)
+
+        if n <= args.limite_legado:
+            t_legado, res_legado = cronometrar(completar_dados_faltantes_legado, df, 1)
+            diferentes = celulas_diferentes(res_novo, res_legado)
+            legado_str = f"{t_legado:11.3f}"
+            speedup_str = f"{t_legado / t_novo:8.1f}x"
+            saida = "idêntica" if diferentes == 0 else f"{diferentes} células diferentes"
+        else:
+            legado_str = f"{'—':>11}"
+            speedup_str = f"{'—':>9}"
+            saida = "(legado omitido)"
+
+        print(f"{n:>10} {incompletos:>12} {t_novo:11.3f} {legado_str} {speedup_str}  {saida}")
+
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BENCHMARK - create_coorte_origem
+Compara a versão antiga (laço por ID_Unico) com a versão groupby/idxmin do
+Dashboard/data_loader.py em datasets sintéticos de 5 mil a 500 mil linhas.
+
+Para cada tamanho:
+- mede o tempo da versão atual
+- mede o tempo da versão antiga (até --limite-legado linhas, pois é O(alunos × linhas))
+- confirma que as duas saídas são idênticas
+
+Uso:
+    python Modules/Benchmark/benchmark_coorte_origem.py
+    python Modules/Benchmark/benchmark_coorte_origem.py --tamanhos 5000 50000 500000 --limite-legado 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(BASE_DIR, 'Dashboard'))
+from data_loader import create_coorte_origem
+
+
+def create_coorte_origem_legado(df):
+    """Implementação anterior, mantida apenas como referência de desempenho e saída."""
+    primeira_participacao = df.groupby('ID_Unico')['Fase'].min().reset_index()
+    primeira_participacao = primeira_participacao.rename(columns={'Fase': 'Primeira_Fase'})
+
+    def fase_para_coorte(fase):
+        if pd.isna(fase):
+            return None
+        fase_num = int(fase)
+        if fase_num == 2:
+            return 'Coorte 1'
+        elif fase_num == 3:
+            return 'Coorte 2'
+        elif fase_num == 4:
+            return 'Coorte 3'
+        else:
+            return f'Coorte {fase_num - 1}'
+
+    primeira_participacao['Coorte_Origem'] = primeira_participacao['Primeira_Fase'].apply(fase_para_coorte)
+    df = df.merge(primeira_participacao[['ID_Unico', 'Coorte_Origem']], on='ID_Unico', how='left')
+
+    primeira_turma = df.merge(primeira_participacao[['ID_Unico', 'Primeira_Fase']], on='ID_Unico', how='left')
+    turma_origem_map = {}
+    for id_unico in primeira_turma['ID_Unico'].unique():
+        aluno_dados = primeira_turma[primeira_turma['ID_Unico'] == id_unico]
+        primeira_fase_aluno = aluno_dados['Primeira_Fase'].iloc[0]
+        turma_na_primeira_fase = aluno_dados[aluno_dados['Fase'] == primeira_fase_aluno]['Turma_Origem'].iloc[0] if 'Turma_Origem' in aluno_dados.columns else None
+        turma_origem_map[id_unico] = turma_na_primeira_fase
+
+    df['Turma_Primeira_Fase'] = df['ID_Unico'].map(turma_origem_map)
+    return df
+
+
+def gerar_dataset(n_linhas: int, seed: int = 42) -> pd.DataFrame:
+    """Gera registros longitudinais sintéticos (~2 fases por aluno, em ordem embaralhada)."""
+    rng = np.random.default_rng(seed)
+    n_alunos = max(1, n_linhas // 2)
+    ids = rng.integers(0, n_alunos, n_linhas)
+    turmas = np.array(['6º ANO A', '6º ANO B', '7º ANO A', '8º ANO A', '9º ANO B'])
+    return pd.DataFrame({
+        'ID_Unico': [f'{i:012X}' for i in ids],
+        'Fase': rng.choice([2, 3, 4], n_linhas),
+        'Turma_Origem': turmas[rng.integers(0, len(turmas), n_linhas)],
+        'Score_Pre': rng.integers(0, 40, n_linhas),
+        'Score_Pos': rng.integers(0, 40, n_linhas),
+    })
+
+
+def cronometrar(func, df, repeticoes: int):
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = func(df.copy())
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de create_coorte_origem')
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[5_000, 50_000, 500_000])
+    parser.add_argument('--limite-legado', type=int, default=50_000,
+                        help='Maior tamanho em que a versão antiga é executada')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("⏱️  BENCHMARK create_coorte_origem")
+    print("=" * 72)
+    print(f"{'Linhas':>10} {'Alunos':>10} {'Atual (s)':>12} {'Legado (s)':>12} {'Speedup':>10}  Saída")
+
+    for n in args.tamanhos:
+        df = gerar_dataset(n)
+        t_novo, res_novo = cronometrar(create_coorte_origem, df, args.repeticoes)
+
+        if n <= args.limite_legado:
+            t_legado, res_legado = cronometrar(create_coorte_origem_legado, df, 1)
+            pd.testing.assert_frame_equal(res_novo, res_legado)
+            legado_str = f"{t_legado:12.3f}"
+            speedup_str = f"{t_legado / t_novo:9.1f}x"
+            saida = "idêntica"
+        else:
+            legado_str = f"{'—':>12}"
+            speedup_str = f"{'—':>10}"
+            saida = "(legado omitido)"
+
+        print(f"{n:>10} {df['ID_Unico'].nunique():>10} {t_novo:12.3f} {legado_str} {speedup_str}  {saida}")
+
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
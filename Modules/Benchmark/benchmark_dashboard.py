@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BENCHMARK - Dashboard/app.py sem navegador (Streamlit AppTest)
+Reproduz uma sequência fixa de interações com o dashboard e mede o tempo
+(wall time) e o pico de memória de cada rerun, com os datasets do dashboard
+replicados 1×, 10× e 100× (cada réplica com alunos/IDs próprios).
+
+Sequência:
+    carga_inicial → trocar_prova (VOCABULÁRIO) → escolher_escolas (2 primeiras)
+    → agregar_turmas (alterna o checkbox) → drill_alunos (nível Alunos)
+    → abrir_aluno (primeiro aluno da lista) → rerun_sem_mudanca
+
+Os expanders que só executam quando abertos (evolução hierárquica e
+individual) ficam abertos durante toda a sequência, como um usuário que os
+expandiu; assim os passos de drill-down e aluno continuam medindo essas seções.
+
+Cada repetição começa com os caches do Streamlit limpos (sessão fria). O tempo
+reportado é a mediana das repetições; o pico de memória (tracemalloc) vem de
+uma passada extra, separada, para não inflar os tempos.
+
+A saída JSON (--saida) guarda commit, versões das bibliotecas e os resultados
+por escala/passo; com --comparar, a execução atual é comparada passo a passo
+com um JSON anterior (ex.: gerado em outro commit).
+
+Uso:
+    python Modules/Benchmark/benchmark_dashboard.py
+    python Modules/Benchmark/benchmark_dashboard.py --escalas 1 10 --repeticoes 5 --saida bench_atual.json
+    python Modules/Benchmark/benchmark_dashboard.py --saida bench_novo.json --comparar bench_atual.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DASHBOARD_DIR = os.path.join(BASE_DIR, 'Dashboard')
+APP = os.path.join(DASHBOARD_DIR, 'app.py')
+sys.path.append(DASHBOARD_DIR)
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import enrich
+from perf_monitor import versao_codigo
+
+COLUNAS_IDENTIDADE = ['ID_Unico', 'ID_Anonimizado', 'Nome', 'NomeNorm']
+EXPANDERS_ABERTOS = ('expander_hierarquica', 'expander_individual')
+
+
+# ========== DATASETS ESCALADOS ==========
+def replicar(df: pd.DataFrame, fator: int) -> pd.DataFrame:
+    """Concatena `fator` cópias do dataset; a partir da 2ª, as colunas de identidade ganham sufixo."""
+    if fator <= 1:
+        return df
+    copias = [df]
+    for k in range(1, fator):
+        copia = df.copy()
+        for col in COLUNAS_IDENTIDADE:
+            if col in copia.columns:
+                copia[col] = copia[col] + f'-{k}'
+        copias.append(copia)
+    return pd.concat(copias, ignore_index=True)
+
+
+def instalar_datasets(tde: pd.DataFrame, vocab: pd.DataFrame, data_referencia):
+    """Faz o app carregar os datasets informados e descarta os caches do Streamlit."""
+    enrich.carregar_datasets_enriquecidos = lambda: (tde, vocab, data_referencia)
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+# ========== SEQUÊNCIA DE INTERAÇÕES ==========
+def _por_rotulo(widgets, rotulo):
+    return next(w for w in widgets if w.label == rotulo)
+
+
+def _escolher_escolas(at):
+    escolas = _por_rotulo(at.multiselect, "🏫 Escola(s)")
+    for escola in escolas.options[:2]:
+        escolas.select(escola)
+    return at.run()
+
+
+def _alternar_agregacao(at):
+    agregar = at.checkbox(key='agregar_checkbox')
+    return agregar.set_value(not agregar.value).run()
+
+
+def _abrir_aluno(at):
+    alunos = at.selectbox(key='aluno_individual_evolucao')
+    return alunos.select(alunos.options[1]).run() if len(alunos.options) > 1 else at.run()
+
+
+PASSOS = [
+    ('carga_inicial', lambda at: at.run()),
+    ('trocar_prova', lambda at: _por_rotulo(at.selectbox, "📝 Prova").select('VOCABULÁRIO').run()),
+    ('escolher_escolas', _escolher_escolas),
+    ('agregar_turmas', _alternar_agregacao),
+    ('drill_alunos', lambda at: at.selectbox(key='nivel_visualizacao_selector').select('Alunos').run()),
+    ('abrir_aluno', _abrir_aluno),
+    ('rerun_sem_mudanca', lambda at: at.run()),
+]
+
+
+def executar_sequencia(timeout: int, medir_memoria: bool = False) -> list:
+    """Uma sessão fria percorrendo PASSOS; retorna (passo, segundos, pico_mb, erro) por rerun."""
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    medicoes = []
+    for nome, acao in PASSOS:
+        # O AppTest não guarda o estado dos expanders entre reruns: reabre a cada passo
+        for chave in EXPANDERS_ABERTOS:
+            at.session_state[chave] = True
+        if medir_memoria:
+            tracemalloc.start()
+        inicio = time.perf_counter()
+        try:
+            at = acao(at)
+            erro = '; '.join(str(e.value)[:120] for e in at.exception) or None
+        except Exception as e:
+            erro = f'{type(e).__name__}: {e}'[:120]
+        segundos = time.perf_counter() - inicio
+        pico_mb = None
+        if medir_memoria:
+            pico_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+            tracemalloc.stop()
+        medicoes.append((nome, segundos, pico_mb, erro))
+    return medicoes
+
+
+def medir_escala(fator: int, base: tuple, repeticoes: int, timeout: int, medir_memoria: bool) -> list:
+    tde, vocab, data_referencia = base
+    tde_k, vocab_k = replicar(tde, fator), replicar(vocab, fator)
+    instalar_datasets(tde_k, vocab_k, data_referencia)
+
+    tempos = {nome: [] for nome, _ in PASSOS}
+    erros = {}
+    for _ in range(repeticoes):
+        for nome, segundos, _, erro in executar_sequencia(timeout):
+            tempos[nome].append(segundos)
+            if erro:
+                erros.setdefault(nome, erro)
+
+    picos = {}
+    if medir_memoria:
+        picos = {nome: pico for nome, _, pico, _ in executar_sequencia(timeout, medir_memoria=True)}
+
+    return [{
+        'escala': fator,
+        'linhas_tde': len(tde_k),
+        'linhas_vocabulario': len(vocab_k),
+        'passo': nome,
+        'ms_mediana': round(statistics.median(tempos[nome]) * 1000, 1),
+        'ms_min': round(min(tempos[nome]) * 1000, 1),
+        'pico_mb': round(picos[nome], 2) if picos.get(nome) is not None else None,
+        'erro': erros.get(nome),
+    } for nome, _ in PASSOS]
+
+
+# ========== SAÍDA ==========
+def metadados(args) -> dict:
+    return {
+        'versao': versao_codigo(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'streamlit': st.__version__,
+        'repeticoes': args.repeticoes,
+        'escalas': args.escalas,
+    }
+
+
+def imprimir(resultados: list, anterior: dict | None = None):
+    print(f"{'Escala':>6} {'Linhas':>9} {'Passo':<20} {'Mediana (ms)':>13} {'Mín (ms)':>10} {'Pico (MB)':>10} {'vs base':>9}")
+    for r in resultados:
+        pico = f"{r['pico_mb']:10.1f}" if r['pico_mb'] is not None else f"{'—':>10}"
+        comparacao = f"{'—':>9}"
+        base = (anterior or {}).get((r['escala'], r['passo']))
+        if base and base['ms_mediana']:
+            comparacao = f"{r['ms_mediana'] / base['ms_mediana']:8.2f}x"
+        print(f"{r['escala']:>5}× {r['linhas_tde'] + r['linhas_vocabulario']:>9} {r['passo']:<20} "
+              f"{r['ms_mediana']:13.1f} {r['ms_min']:10.1f} {pico} {comparacao}")
+        if r['erro']:
+            print(f"{'':>17}⚠️  {r['erro']}")
+
+
+def carregar_anterior(path: str) -> tuple[dict, dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        dados = json.load(f)
+    return dados['metadados'], {(r['escala'], r['passo']): r for r in dados['resultados']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark headless do dashboard (AppTest)')
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--timeout', type=int, default=600, help='Timeout de cada rerun (s)')
+    parser.add_argument('--sem-memoria', action='store_true', help='Não faz a passada com tracemalloc')
+    parser.add_argument('--saida', help='Grava os resultados em JSON')
+    parser.add_argument('--comparar', help='JSON de uma execução anterior para comparação')
+    args = parser.parse_args()
+
+    meta_anterior, anterior = carregar_anterior(args.comparar) if args.comparar else (None, None)
+
+    print("=" * 88)
+    print("⏱️  BENCHMARK DASHBOARD (AppTest)")
+    print("=" * 88)
+    meta = metadados(args)
+    print(f"Commit: {meta['versao']} • pandas {meta['pandas']} • streamlit {meta['streamlit']}")
+    if meta_anterior:
+        print(f"Comparando com: {args.comparar} (commit {meta_anterior.get('versao')})")
+
+    base = enrich.carregar_datasets_enriquecidos()
+    resultados = []
+    for fator in args.escalas:
+        print(f"\n📦 Escala {fator}× ...")
+        resultados_escala = medir_escala(fator, base, args.repeticoes, args.timeout, not args.sem_memoria)
+        imprimir(resultados_escala, anterior)
+        resultados.extend(resultados_escala)
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump({'metadados': meta, 'resultados': resultados}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Resultados gravados em {args.saida}")
+    print("=" * 88)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GERADOR DE DADOS SINTÉTICOS (TESTES DE CARGA)
+Gera, de forma reprodutível (seed), arquivos com os mesmos esquemas que os
+pipelines e o dashboard consomem, sem nenhum dado real de aluno (LGPD).
+
+Saída (espelha a estrutura do repositório dentro de --saida):
+- Dashboard/TDE_longitudinal.csv e Dashboard/vocabulario_longitudinal.csv
+  (ID_Unico, Nome, Escola, Fase, Turma, Score_Pre, Score_Pos, Sexo,
+  DataAniversario, Turma_Origem, Q*_Pre/Q*_Pos)
+- Data/Fase N/Pre|Pos/DadosTDE.csv (Nome, Escola, Turma, P1..P40) e
+  DadosVocabulario.csv (Nome, Escola, Turma, Q1..Q50), com a "sujeira" que os
+  pipelines tratam: Escola/Turma faltando, duplicados, valores como texto
+- Data/Fase 5/Lingua_Portuguesa_CONSOLIDADO.csv e Matematica_CONSOLIDADO.csv
+  (Nome, Escola, Serie, Turma, Municipio, Estado, Fase Pre/Pos, Q1..Qn com
+  alternativas A-D) + cópia dos gabaritos de Data/Fase 5/Gabarito
+- Data/RespostaTED.json e Data/RespostaVocabulario.json (cópia do mapeamento
+  questão -> palavra, lido pelos pipelines junto com os Dados*.csv)
+
+Modelo: cada aluno tem uma habilidade latente (efeito de escola + ruído); as
+respostas seguem um modelo logístico por item (TDE 0/1, Vocabulário 0/1/2), o
+pós-teste soma um ganho individual e o aluno avança uma série por fase. Entre
+fases uma fração dos alunos sai do programa (evasão) e novos alunos entram.
+
+Uso:
+    python Modules/Benchmark/gerar_dados_sinteticos.py --saida /tmp/wordgen_sintetico
+    python Modules/Benchmark/gerar_dados_sinteticos.py --escolas 40 --turmas-por-escola 6 --alunos-por-turma 30 --seed 7
+    python Modules/Benchmark/gerar_dados_sinteticos.py --fases 2 3 4 5 --evasao 0.25 --novos 0.10
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import string
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+GABARITO_DIR = os.path.join(BASE_DIR, 'Data', 'Fase 5', 'Gabarito')
+MAPEAMENTOS = ('RespostaTED.json', 'RespostaVocabulario.json')
+
+N_QUESTOES = {'TDE': 40, 'VOCABULARIO': 50}
+ANO_DA_FASE = {2: 2023, 3: 2024, 4: 2025, 5: 2026}
+SERIES = [6, 7, 8, 9]
+
+NOMES_FEMININOS = ['MARIA', 'ANA', 'JULIA', 'BEATRIZ', 'LARISSA', 'GABRIELA', 'FERNANDA', 'LETICIA',
+                   'CAMILA', 'AMANDA', 'BRUNA', 'VITORIA', 'ISABELA', 'LAURA', 'SOFIA', 'ALICE']
+NOMES_MASCULINOS = ['JOSÉ', 'JOÃO', 'LUCAS', 'PEDRO', 'GABRIEL', 'MATEUS', 'RAFAEL', 'GUSTAVO',
+                    'FELIPE', 'DANIEL', 'BRUNO', 'THIAGO', 'ARTHUR', 'DAVI', 'MIGUEL', 'HEITOR']
+SOBRENOMES = ['SILVA', 'SANTOS', 'OLIVEIRA', 'SOUZA', 'LIMA', 'PEREIRA', 'FERREIRA', 'ALVES',
+              'COSTA', 'RODRIGUES', 'GOMES', 'MARTINS', 'ARAÚJO', 'CARVALHO', 'RIBEIRO', 'BARBOSA',
+              'ROCHA', 'DIAS', 'NASCIMENTO', 'MOREIRA', 'CAVALCANTI', 'MONTEIRO', 'FREITAS', 'TEIXEIRA']
+MUNICIPIOS = [('MACEIÓ', 'AL'), ('ARAPIRACA', 'AL'), ('RECIFE', 'PE'), ('CARUARU', 'PE')]
+
+
+@dataclass
+class ConfigSintetico:
+    escolas: int = 8
+    turmas_por_escola: int = 5
+    alunos_por_turma: int = 28
+    fases: tuple = (2, 3, 4)
+    evasao: float = 0.25           # fração que sai do programa entre fases consecutivas
+    novos: float = 0.10            # novos alunos por fase (fração do total da 1ª fase)
+    ausencia_pos: float = 0.08     # fez o pré mas não o pós (na mesma fase)
+    item_em_branco: float = 0.03
+    sem_sexo: float = 0.30
+    sem_data: float = 0.35
+    sujeira: float = 0.01          # Escola/Turma faltando e duplicados nos arquivos brutos
+    seed: int = 42
+
+
+# ========== ALUNOS E PARTICIPAÇÕES ==========
+def _sigmoide(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _id_unico(nomes, escolas, nascimentos) -> np.ndarray:
+    return np.array([
+        hashlib.md5(f'{n}_{e}_{d}'.encode()).hexdigest()[:12].upper()
+        for n, e, d in zip(nomes, escolas, nascimentos)
+    ])
+
+
+def gerar_alunos(n: int, cfg: ConfigSintetico, rng: np.random.Generator, fase_entrada: int,
+                 efeito_escola: np.ndarray) -> pd.DataFrame:
+    """Novos alunos entrando no programa em `fase_entrada` (série, turma, escola, habilidade)."""
+    feminino = rng.random(n) < 0.5
+    primeiros = np.where(feminino, rng.choice(NOMES_FEMININOS, n), rng.choice(NOMES_MASCULINOS, n))
+    nomes = [f'{p} {a} {b}' for p, a, b in zip(primeiros, rng.choice(SOBRENOMES, n), rng.choice(SOBRENOMES, n))]
+
+    escola = rng.integers(0, cfg.escolas, n)
+    serie = rng.choice(SERIES, n)
+    letra = rng.integers(0, max(1, -(-cfg.turmas_por_escola // len(SERIES))), n)
+    nascimento = pd.to_datetime(pd.DataFrame({
+        'year': ANO_DA_FASE[fase_entrada] - (serie + 5) - (rng.random(n) < 0.15),
+        'month': rng.integers(1, 13, n),
+        'day': rng.integers(1, 29, n),
+    }))
+    nomes_escola = np.array([f'ESCOLA MUNICIPAL {i + 1:02d}' for i in range(cfg.escolas)])
+
+    return pd.DataFrame({
+        'ID_Unico': _id_unico(nomes, nomes_escola[escola], nascimento),
+        'Nome': nomes,
+        'Feminino': feminino,
+        'Escola': nomes_escola[escola],
+        'IdxEscola': escola,
+        'Serie': serie,
+        'Letra': letra,
+        'Nascimento': nascimento,
+        'Habilidade': efeito_escola[escola] + (serie - 7.5) * 0.15 + rng.normal(0, 1, n),
+        'Ganho': rng.normal(0.35, 0.35, n),
+    })
+
+
+def gerar_participacoes(cfg: ConfigSintetico, rng: np.random.Generator) -> pd.DataFrame:
+    """Uma linha por (aluno, fase), com evasão entre fases e entrada de novos alunos."""
+    efeito_escola = rng.normal(0, 0.4, cfg.escolas)
+    n_inicial = cfg.escolas * cfg.turmas_por_escola * cfg.alunos_por_turma
+    fases = sorted(cfg.fases)
+
+    participacoes = []
+    ativos = gerar_alunos(n_inicial, cfg, rng, fases[0], efeito_escola)
+    for i, fase in enumerate(fases):
+        if i > 0:
+            ficam = (rng.random(len(ativos)) >= cfg.evasao) & (ativos['Serie'] < 9)
+            ativos = ativos[ficam].copy()
+            ativos['Serie'] += 1
+            # Habilidade do pré da fase seguinte parte do pós anterior, com perda de férias
+            ativos['Habilidade'] += ativos['Ganho'] - rng.normal(0.1, 0.1, len(ativos))
+            ativos['Ganho'] = rng.normal(0.35, 0.35, len(ativos))
+            novos = gerar_alunos(int(n_inicial * cfg.novos), cfg, rng, fase, efeito_escola)
+            ativos = pd.concat([ativos, novos], ignore_index=True)
+        participacoes.append(ativos.assign(Fase=fase))
+    return pd.concat(participacoes, ignore_index=True)
+
+
+def _turma(serie: pd.Series, letra: pd.Series, rng: np.random.Generator) -> pd.Series:
+    """Rótulo de turma como aparece nas planilhas ('6º ANO A', às vezes '6 ANO' ou '6° ANO A')."""
+    letras = np.array(list(string.ascii_uppercase))[letra.to_numpy()]
+    sorteio = rng.random(len(serie))
+    rotulo = np.where(sorteio < 0.90, serie.astype(str) + 'º ANO ' + letras,
+                      np.where(sorteio < 0.95, serie.astype(str) + '° ANO ' + letras, serie.astype(str) + ' ANO'))
+    return pd.Series(rotulo, index=serie.index)
+
+
+# ========== RESPOSTAS ==========
+def gerar_respostas(habilidade: np.ndarray, dificuldade: np.ndarray, prova: str, cfg: ConfigSintetico,
+                    rng: np.random.Generator) -> np.ndarray:
+    """Matriz [alunos x questões]: TDE 0/1, Vocabulário 0/1/2; NaN para itens em branco."""
+    logito = habilidade[:, None] - dificuldade[None, :]
+    u = rng.random(logito.shape)
+    if prova == 'TDE':
+        respostas = (u < _sigmoide(logito)).astype(float)
+    else:
+        respostas = (u < _sigmoide(logito + 0.8)).astype(float) + (u < _sigmoide(logito - 0.8))
+    respostas[rng.random(logito.shape) < cfg.item_em_branco] = np.nan
+    return respostas
+
+
+def tabela_longitudinal(part: pd.DataFrame, prova: str, cfg: ConfigSintetico,
+                        rng: np.random.Generator) -> pd.DataFrame:
+    """Dataset longitudinal do dashboard (uma linha por aluno e fase com pré e pós)."""
+    part = part[part['Fase'].isin([2, 3, 4])].reset_index(drop=True)
+    n_q = N_QUESTOES[prova]
+    dificuldade = rng.normal(0, 1, n_q)
+    pre = gerar_respostas(part['Habilidade'].to_numpy(), dificuldade, prova, cfg, rng)
+    pos = gerar_respostas((part['Habilidade'] + part['Ganho']).to_numpy(), dificuldade, prova, cfg, rng)
+
+    turma = _turma(part['Serie'], part['Letra'], rng)
+    sexo = np.where(part['Feminino'], 'Feminino', 'Masculino').astype(object)
+    sexo[rng.random(len(part)) < cfg.sem_sexo] = np.nan
+    nascimento = part['Nascimento']
+    data = np.where(rng.random(len(part)) < 0.65, nascimento.dt.strftime('%d/%m/%Y'),
+                    nascimento.dt.strftime('%Y-%m-%d')).astype(object)
+    data[rng.random(len(part)) < cfg.sem_data] = np.nan
+
+    df = pd.DataFrame({
+        'ID_Unico': part['ID_Unico'],
+        'Nome': part['Nome'],
+        'Escola': part['Escola'],
+        'Fase': part['Fase'],
+        'Turma': turma,
+        'Score_Pre': np.nansum(pre, axis=1),
+        'Score_Pos': np.nansum(pos, axis=1),
+        'Sexo': sexo,
+        'DataAniversario': data,
+        'Turma_Origem': turma,
+    })
+    questoes = {}
+    for q in range(n_q):
+        questoes[f'Q{q + 1}_Pre'] = pre[:, q]
+        questoes[f'Q{q + 1}_Pos'] = pos[:, q]
+    return pd.concat([df, pd.DataFrame(questoes)], axis=1)
+
+
+# ========== ARQUIVOS BRUTOS POR FASE ==========
+def _sujar(df: pd.DataFrame, cfg: ConfigSintetico, rng: np.random.Generator) -> pd.DataFrame:
+    """Escola/Turma faltando (com o registro completo duplicado) e respostas gravadas como texto."""
+    n_sujos = int(len(df) * cfg.sujeira)
+    if n_sujos:
+        sujos = df.sample(n_sujos, random_state=int(rng.integers(1 << 31))).copy()
+        coluna = np.where(rng.random(n_sujos) < 0.5, 'Escola', 'Turma')
+        for col in ('Escola', 'Turma'):
+            sujos.loc[coluna == col, col] = np.nan
+        duplicados = df.sample(n_sujos, random_state=int(rng.integers(1 << 31)))
+        df = pd.concat([df, sujos, duplicados]).sort_index(kind='stable').reset_index(drop=True)
+    return df
+
+
+def tabela_bruta(longitudinal: pd.DataFrame, fase: int, momento: str, prova: str,
+                 cfg: ConfigSintetico, rng: np.random.Generator) -> pd.DataFrame:
+    """Planilha bruta Pré ou Pós de uma fase (formato lido por PipelineFases/pipeline_fases.py)."""
+    dados = longitudinal[longitudinal['Fase'] == fase]
+    if momento == 'Pos':
+        dados = dados[rng.random(len(dados)) >= cfg.ausencia_pos]
+    prefixo = 'P' if prova == 'TDE' else 'Q'
+    respostas = {
+        f'{prefixo}{q + 1}': dados[f'Q{q + 1}_{momento}'].map(lambda v: '' if pd.isna(v) else str(int(v)))
+        for q in range(N_QUESTOES[prova])
+    }
+    bruto = pd.concat([dados[['Nome', 'Escola', 'Turma']], pd.DataFrame(respostas)], axis=1)
+    return _sujar(bruto.reset_index(drop=True), cfg, rng)
+
+
+# ========== FASE 5 (CONSOLIDADO) ==========
+def _carregar_gabarito(arquivo: str) -> dict:
+    """Série ('6º ANO') -> lista de alternativas corretas, na ordem das questões."""
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        dados = json.load(f)
+    return {item['Serie']: [q['GABARITO'] for q in item['Questoes']] for item in dados['Gabaritos']}
+
+
+def tabela_consolidada_fase5(part: pd.DataFrame, gabarito: dict, cfg: ConfigSintetico,
+                             rng: np.random.Generator) -> pd.DataFrame:
+    """Planilha CONSOLIDADO da Fase 5 (uma linha por aluno e momento, alternativas A-D)."""
+    alunos = part[part['Fase'] == 5].reset_index(drop=True)
+    municipio = rng.integers(0, len(MUNICIPIOS), cfg.escolas)
+    # Grafia da série ('6 ANO' ou '6º ANO') fixa por aluno: entra no ID_Aluno do pipeline
+    alunos['SerieRotulo'] = np.where(rng.random(len(alunos)) < 0.5, alunos['Serie'].astype(str) + ' ANO',
+                                     alunos['Serie'].astype(str) + 'º ANO')
+    linhas = []
+    for momento, deslocamento in (('Pre', 0.0), ('Pos', 1.0)):
+        if momento == 'Pos':
+            alunos = alunos[rng.random(len(alunos)) >= cfg.ausencia_pos].reset_index(drop=True)
+        indice_escola = alunos['IdxEscola'].to_numpy()
+        habilidade = (alunos['Habilidade'] + deslocamento * alunos['Ganho']).to_numpy()
+        base = pd.DataFrame({
+            'Nome': alunos['Nome'],
+            'Escola': alunos['Escola'],
+            'Serie': alunos['SerieRotulo'],
+            'Turma': np.array(list(string.ascii_uppercase))[alunos['Letra'].to_numpy()],
+            'Municipio': [MUNICIPIOS[m][0] for m in municipio[indice_escola]],
+            'Estado': [MUNICIPIOS[m][1] for m in municipio[indice_escola]],
+            'Fase': momento,
+        })
+        n_max = max(len(v) for v in gabarito.values())
+        respostas = np.full((len(alunos), n_max), None, dtype=object)
+        for serie, chaves in gabarito.items():
+            linhas_serie = np.flatnonzero(alunos['Serie'].to_numpy() == int(serie[0]))
+            if not len(linhas_serie):
+                continue
+            acerto = rng.random((len(linhas_serie), len(chaves))) < _sigmoide(habilidade[linhas_serie, None])
+            erradas = rng.choice(list('ABCD'), (len(linhas_serie), len(chaves)))
+            marcadas = np.where(acerto, np.array(chaves)[None, :], erradas).astype(object)
+            marcadas[rng.random(marcadas.shape) < cfg.item_em_branco] = None
+            respostas[linhas_serie[:, None], np.arange(len(chaves))[None, :]] = marcadas
+        linhas.append(pd.concat([base, pd.DataFrame(respostas, columns=[f'Q{i + 1}' for i in range(n_max)])], axis=1))
+
+    df = pd.concat(linhas, ignore_index=True)
+    # Séries fora do escopo (descartadas pelo pipeline) e testes em branco
+    extras = df.sample(max(1, int(len(df) * cfg.sujeira)), random_state=int(rng.integers(1 << 31))).copy()
+    extras['Serie'] = rng.choice(['2 ANO', '5 ANO'], len(extras))
+    brancos = df.sample(max(1, int(len(df) * cfg.sujeira)), random_state=int(rng.integers(1 << 31))).copy()
+    brancos.loc[:, [c for c in df.columns if c.startswith('Q')]] = None
+    return pd.concat([df, extras, brancos], ignore_index=True)
+
+
+# ========== ORQUESTRAÇÃO ==========
+def gerar(cfg: ConfigSintetico, saida: str) -> dict:
+    """Gera todos os arquivos em `saida`; retorna {caminho relativo: nº de linhas}."""
+    rng = np.random.default_rng(cfg.seed)
+    part = gerar_participacoes(cfg, rng)
+    gerados = {}
+
+    def gravar(df, *partes):
+        caminho = os.path.join(saida, *partes)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        df.to_csv(caminho, index=False)
+        gerados[os.path.join(*partes)] = len(df)
+
+    fases_longitudinais = [f for f in sorted(cfg.fases) if f in (2, 3, 4)]
+    for prova, arq_longitudinal, arq_bruto in (('TDE', 'TDE_longitudinal.csv', 'DadosTDE.csv'),
+                                               ('VOCABULARIO', 'vocabulario_longitudinal.csv', 'DadosVocabulario.csv')):
+        if not fases_longitudinais:
+            break
+        longitudinal = tabela_longitudinal(part, prova, cfg, rng)
+        gravar(longitudinal, 'Dashboard', arq_longitudinal)
+        for fase in fases_longitudinais:
+            for momento in ('Pre', 'Pos'):
+                gravar(tabela_bruta(longitudinal, fase, momento, prova, cfg, rng),
+                       'Data', f'Fase {fase}', momento, arq_bruto)
+
+    if fases_longitudinais:
+        # Mapeamento das palavras (não contém dados de alunos)
+        for arq_mapeamento in MAPEAMENTOS:
+            shutil.copy(os.path.join(BASE_DIR, 'Data', arq_mapeamento), os.path.join(saida, 'Data'))
+
+    if 5 in cfg.fases:
+        destino_gabarito = os.path.join(saida, 'Data', 'Fase 5', 'Gabarito')
+        os.makedirs(destino_gabarito, exist_ok=True)
+        for disciplina, arq_gabarito in (('Lingua_Portuguesa', 'Gabarito_Portugues.json'),
+                                         ('Matematica', 'Gabarito_Matematica.json')):
+            origem = os.path.join(GABARITO_DIR, arq_gabarito)
+            shutil.copy(origem, destino_gabarito)
+            gravar(tabela_consolidada_fase5(part, _carregar_gabarito(origem), cfg, rng),
+                   'Data', 'Fase 5', f'{disciplina}_CONSOLIDADO.csv')
+    return gerados
+
+
+def main():
+    padrao = ConfigSintetico()
+    parser = argparse.ArgumentParser(description='Gera dados sintéticos com os esquemas do WordGen')
+    parser.add_argument('--saida', default=os.path.join(BASE_DIR, 'Data', 'Sintetico'))
+    parser.add_argument('--escolas', type=int, default=padrao.escolas)
+    parser.add_argument('--turmas-por-escola', type=int, default=padrao.turmas_por_escola)
+    parser.add_argument('--alunos-por-turma', type=int, default=padrao.alunos_por_turma)
+    parser.add_argument('--fases', type=int, nargs='+', default=list(padrao.fases), choices=[2, 3, 4, 5])
+    parser.add_argument('--evasao', type=float, default=padrao.evasao,
+                        help='Fração de alunos que deixam o programa entre fases')
+    parser.add_argument('--novos', type=float, default=padrao.novos,
+                        help='Novos alunos por fase (fração do total inicial)')
+    parser.add_argument('--seed', type=int, default=padrao.seed)
+    args = parser.parse_args()
+
+    cfg = ConfigSintetico(
+        escolas=args.escolas, turmas_por_escola=args.turmas_por_escola,
+        alunos_por_turma=args.alunos_por_turma, fases=tuple(args.fases),
+        evasao=args.evasao, novos=args.novos, seed=args.seed,
+    )
+
+    print("=" * 72)
+    print("🧪 GERADOR DE DADOS SINTÉTICOS")
+    print("=" * 72)
+    print(f"Escolas: {cfg.escolas} • Turmas/escola: {cfg.turmas_por_escola} • Alunos/turma: {cfg.alunos_por_turma}")
+    print(f"Fases: {list(cfg.fases)} • Evasão: {cfg.evasao:.0%} • Novos: {cfg.novos:.0%} • Seed: {cfg.seed}")
+
+    gerados = gerar(cfg, args.saida)
+
+    print(f"\n📁 Saída: {args.saida}")
+    for caminho, n in gerados.items():
+        print(f"   ✅ {caminho} ({n} linhas)")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
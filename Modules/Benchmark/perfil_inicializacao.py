@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PERFIL DE INICIALIZAÇÃO - Dashboard/app.py
+Mede o custo de subir o dashboard em um processo novo:
+
+1. Tempo de import de cada módulo importado no topo do app.py (python -X
+   importtime em um processo limpo, na ordem do app), além dos módulos que o
+   app só importa no primeiro uso (Plotly), para mostrar o que a carga
+   sob demanda economiza. O tempo é cumulativo e fica com o primeiro módulo
+   que importa cada dependência (ex.: numpy aparece dentro de streamlit/pandas).
+2. Tempo da primeira renderização (AppTest, processo limpo, caches vazios) e
+   de um rerun logo em seguida, com o monitor de desempenho desligado.
+3. Em uma passada separada (outro processo, monitor ligado com pico de
+   memória), as seções do monitor (Dashboard/perf_monitor.py), incluindo os
+   marcos `importacoes` e `primeira_pintura` (início do script até os cards
+   de resumo). O tracemalloc deixa essa passada bem mais lenta, por isso os
+   tempos das seções servem para comparar seções entre si, não com os
+   tempos totais do item 2.
+
+Cada medição roda --repeticoes vezes em processos separados; o relatório usa
+a mediana.
+
+Uso:
+    python Modules/Benchmark/perfil_inicializacao.py
+    python Modules/Benchmark/perfil_inicializacao.py --repeticoes 5 --saida perfil.json
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DASHBOARD_DIR = os.path.join(BASE_DIR, 'Dashboard')
+APP = os.path.join(DASHBOARD_DIR, 'app.py')
+
+# Importados pelo app apenas no primeiro uso (evolução individual / fallbacks)
+MODULOS_SOB_DEMANDA = ['plotly.express']
+
+
+# ========== IMPORTS ==========
+def modulos_do_topo(caminho: str = APP) -> list:
+    """Módulos importados no nível de módulo do app.py, na ordem em que aparecem."""
+    with open(caminho, 'r', encoding='utf-8') as f:
+        arvore = ast.parse(f.read())
+    modulos = []
+    for no in arvore.body:
+        if isinstance(no, ast.Import):
+            modulos.extend(alias.name for alias in no.names)
+        elif isinstance(no, ast.ImportFrom) and no.module:
+            modulos.append(no.module)
+    return list(dict.fromkeys(modulos))
+
+
+def tempos_de_import(modulos: list) -> dict:
+    """Tempo cumulativo (ms) de cada módulo, importados em sequência em um processo limpo."""
+    codigo = '; '.join(f'import {m}' for m in modulos)
+    saida = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', codigo],
+        cwd=DASHBOARD_DIR, capture_output=True, text=True,
+        env={**os.environ, 'PYTHONPATH': DASHBOARD_DIR}
+    )
+    if saida.returncode != 0:
+        raise RuntimeError(saida.stderr.strip().splitlines()[-1])
+
+    # Linhas "import time: self | cumulative | pacote"; sem recuo = import direto do -c
+    tempos = {}
+    for linha in saida.stderr.splitlines():
+        if not linha.startswith('import time:') or 'cumulative' in linha:
+            continue
+        _, cumulativo, pacote = linha[len('import time:'):].split('|')
+        if not pacote.startswith('  ') and pacote.strip() in modulos:
+            tempos[pacote.strip()] = int(cumulativo) / 1000
+    return tempos
+
+
+# ========== PRIMEIRA RENDERIZAÇÃO ==========
+def medir_render_unico(timeout: int, instrumentado: bool) -> dict:
+    """
+    Executado no processo filho: primeira renderização e rerun.
+
+    Sem instrumentação mede só o tempo total; instrumentado, liga o monitor
+    (com pico de memória) e lê as seções do log.
+    """
+    log = os.path.join(tempfile.mkdtemp(), 'perf.jsonl')
+    if instrumentado:
+        os.environ['DASHBOARD_PERF_LOG'] = log
+        os.environ['DASHBOARD_PERF_MEMORIA'] = '1'
+
+    inicio = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    ms_streamlit = (time.perf_counter() - inicio) * 1000
+
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    inicio = time.perf_counter()
+    at.run()
+    ms_primeira = (time.perf_counter() - inicio) * 1000
+    inicio = time.perf_counter()
+    at.run()
+    ms_rerun = (time.perf_counter() - inicio) * 1000
+
+    execucoes = {}
+    if instrumentado:
+        with open(log, 'r', encoding='utf-8') as f:
+            for linha in f:
+                registro = json.loads(linha)
+                execucoes.setdefault(registro['execucao'], {})[registro['secao']] = registro
+    secoes_primeira, secoes_rerun = (list(execucoes.values()) + [{}, {}])[:2]
+
+    return {
+        'ms_import_streamlit': ms_streamlit,
+        'ms_primeira_renderizacao': ms_primeira,
+        'ms_rerun': ms_rerun,
+        'secoes_primeira': {s: r['ms'] for s, r in secoes_primeira.items()},
+        'secoes_rerun': {s: r['ms'] for s, r in secoes_rerun.items()},
+        'picos_primeira': {s: r['pico_mb'] for s, r in secoes_primeira.items()},
+        'sob_demanda_carregados': [m for m in MODULOS_SOB_DEMANDA if m in sys.modules],
+        'erros': [str(e.value)[:120] for e in at.exception],
+    }
+
+
+def medir_render(timeout: int, instrumentado: bool = False) -> dict:
+    comando = [sys.executable, os.path.abspath(__file__), '--render-unico', '--timeout', str(timeout)]
+    saida = subprocess.run(comando + (['--instrumentado'] if instrumentado else []),
+                           capture_output=True, text=True)
+    if saida.returncode != 0:
+        raise RuntimeError(saida.stderr.strip().splitlines()[-1])
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+# ========== RELATÓRIO ==========
+def mediana(valores: list):
+    valores = [v for v in valores if v is not None]
+    return statistics.median(valores) if valores else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Perfil de inicialização do dashboard')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--timeout', type=int, default=600, help='Timeout de cada rerun (s)')
+    parser.add_argument('--saida', help='Grava o perfil em JSON')
+    parser.add_argument('--render-unico', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--instrumentado', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.render_unico:
+        print(json.dumps(medir_render_unico(args.timeout, args.instrumentado), ensure_ascii=False))
+        return
+
+    print("=" * 72)
+    print("🚀 PERFIL DE INICIALIZAÇÃO DO DASHBOARD")
+    print("=" * 72)
+
+    # 1. Imports
+    modulos = modulos_do_topo()
+    todos = modulos + [m for m in MODULOS_SOB_DEMANDA if m not in modulos]
+    amostras = [tempos_de_import(todos) for _ in range(args.repeticoes)]
+    imports = {m: mediana([a.get(m) for a in amostras]) for m in todos}
+
+    print(f"\n📦 Imports (ms cumulativos, processo limpo, mediana de {args.repeticoes})")
+    for m in modulos:
+        print(f"   {m:<28} {imports[m] or 0:9.1f}")
+    print(f"   {'TOTAL no topo do app.py':<28} {sum(imports[m] or 0 for m in modulos):9.1f}")
+    for m in MODULOS_SOB_DEMANDA:
+        print(f"   {m + ' (sob demanda)':<28} {imports[m] or 0:9.1f}")
+
+    # 2. Primeira renderização (monitor desligado)
+    renders = [medir_render(args.timeout) for _ in range(args.repeticoes)]
+    render = {
+        chave: mediana([r[chave] for r in renders])
+        for chave in ('ms_import_streamlit', 'ms_primeira_renderizacao', 'ms_rerun')
+    }
+
+    print(f"\n🖥️  Renderização (AppTest, processo limpo, monitor desligado, mediana de {args.repeticoes})")
+    print(f"   Import do streamlit (AppTest): {render['ms_import_streamlit']:9.1f} ms")
+    print(f"   Primeira renderização:         {render['ms_primeira_renderizacao']:9.1f} ms")
+    print(f"   Rerun seguinte:                {render['ms_rerun']:9.1f} ms")
+
+    # 3. Seções e picos (passada separada, monitor ligado com tracemalloc)
+    instrumentados = [medir_render(args.timeout, instrumentado=True) for _ in range(args.repeticoes)]
+    secoes = list(dict.fromkeys(s for r in instrumentados for s in r['secoes_primeira']))
+    render['secoes_primeira'] = {s: mediana([r['secoes_primeira'].get(s) for r in instrumentados]) for s in secoes}
+    render['secoes_rerun'] = {s: mediana([r['secoes_rerun'].get(s) for r in instrumentados]) for s in secoes}
+    render['picos_primeira'] = {s: mediana([r['picos_primeira'].get(s) for r in instrumentados]) for s in secoes}
+
+    print(f"\n🔬 Seções (passada instrumentada com tracemalloc: tempos inflados, só para comparar seções)")
+    print(f"   {'Seção':<20} {'1ª execução (ms)':>17} {'Rerun (ms)':>12} {'Pico 1ª (MB)':>13}")
+    for s in secoes:
+        rerun, pico = render['secoes_rerun'].get(s), render['picos_primeira'].get(s)
+        print(f"   {s:<20} {render['secoes_primeira'][s]:17.1f} "
+              f"{rerun if rerun is not None else float('nan'):12.1f} "
+              f"{pico if pico is not None else float('nan'):13.2f}")
+
+    carregados = sorted({m for r in renders for m in r['sob_demanda_carregados']})
+    print(f"\n   Sob demanda carregados na primeira renderização: {', '.join(carregados) or 'nenhum'}")
+    erros = sorted({e for r in renders + instrumentados for e in r['erros']})
+    for erro in erros:
+        print(f"   ⚠️  {erro}")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump({'imports': imports, 'renderizacao': render, 'erros': erros},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Perfil gravado em {args.saida}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
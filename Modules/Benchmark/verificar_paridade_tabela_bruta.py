@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PARIDADE - tabela bruta do pipeline_fases × scripts antigos por fase
+Roda os scripts por fase anteriores ao Modules/PipelineFases/pipeline_fases.py
+(Modules/FaseN/TDE/PipelineDataTDE.py e Modules/FaseN/Vocabulario/PipelineData.py,
+recuperados do git em uma worktree temporária) e o pipeline atual sobre as
+mesmas planilhas, e compara byte a byte os tabela_bruta_fase{N}_*_wordgen.csv.
+
+A pasta --dados precisa ter as entradas do pipeline (Fase N/Pre|Pos/DadosTDE.csv
+e DadosVocabulario.csv, RespostaTED.json, RespostaVocabulario.json), por
+exemplo a gerada por gerar_dados_sinteticos.py. Ela não é alterada: cada lado
+roda sobre uma cópia, e a Data/ versionada da worktree é descartada antes,
+para que os dois lados leiam exatamente as mesmas entradas.
+
+Por padrão a referência é o último commit que ainda tinha os scripts antigos.
+
+Uso:
+    python Modules/Benchmark/verificar_paridade_tabela_bruta.py --dados /tmp/wordgen_sintetico/Data
+    python Modules/Benchmark/verificar_paridade_tabela_bruta.py --dados /tmp/wordgen_sintetico/Data --revisao 5f0e3b0 --fases 2
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(BASE_DIR, 'Modules', 'PipelineFases'))
+from pipeline_fases import FASES, PROVAS, executar_todas
+
+# Script antigo de cada prova, relativo a Modules/FaseN
+SCRIPTS_ANTIGOS = {
+    'TDE': os.path.join('TDE', 'PipelineDataTDE.py'),
+    'VOCABULARIO': os.path.join('Vocabulario', 'PipelineData.py'),
+}
+
+
+def git(*args) -> str:
+    saida = subprocess.run(['git', *args], cwd=BASE_DIR, capture_output=True, text=True)
+    if saida.returncode != 0:
+        raise RuntimeError(saida.stderr.strip() or f"git {' '.join(args)} falhou")
+    return saida.stdout.strip()
+
+
+def revisao_padrao() -> str:
+    """Pai do commit que removeu os scripts antigos."""
+    remocao = git('log', '--diff-filter=D', '-1', '--format=%H', '--',
+                  os.path.join('Modules', 'Fase2', 'Vocabulario', 'PipelineData.py'))
+    if not remocao:
+        raise RuntimeError("Commit de remoção dos scripts antigos não encontrado; informe --revisao")
+    return git('rev-parse', '--short', f'{remocao}^')
+
+
+def nome_saida(fase: int, prova: str) -> str:
+    return f"tabela_bruta_fase{fase}_{PROVAS[prova]['sufixo_saida']}_wordgen.csv"
+
+
+def primeira_diferenca(a: str, b: str) -> str | None:
+    """None se os arquivos forem idênticos; senão, a primeira linha que difere."""
+    with open(a, 'rb') as fa, open(b, 'rb') as fb:
+        if fa.read() == fb.read():
+            return None
+    with open(a, 'r', encoding='utf-8-sig') as fa, open(b, 'r', encoding='utf-8-sig') as fb:
+        for n, (la, lb) in enumerate(zip(fa, fb), 1):
+            if la != lb:
+                return f"linha {n}"
+    return "número de linhas"
+
+
+def rodar_antigos(revisao: str, dados: str, combinacoes: list, raiz: str) -> dict:
+    """Scripts antigos em uma worktree da `revisao`; retorna {(fase, prova): erro ou None}."""
+    worktree = os.path.join(raiz, 'antigo')
+    git('worktree', 'add', '--detach', worktree, revisao)
+    try:
+        # Só as entradas de --dados: nada da Data/ versionada na revisão
+        shutil.rmtree(os.path.join(worktree, 'Data'), ignore_errors=True)
+        shutil.copytree(dados, os.path.join(worktree, 'Data'))
+        erros = {}
+        for fase, prova in combinacoes:
+            script = os.path.join(worktree, 'Modules', f'Fase{fase}', SCRIPTS_ANTIGOS[prova])
+            saida = subprocess.run([sys.executable, script], cwd=os.path.dirname(script),
+                                   capture_output=True, text=True)
+            erros[(fase, prova)] = (saida.stderr.strip().splitlines() or ['erro'])[-1] if saida.returncode else None
+            arquivo = os.path.join(worktree, 'Data', nome_saida(fase, prova))
+            if os.path.exists(arquivo):
+                shutil.copy(arquivo, os.path.join(raiz, 'saida_antiga_' + nome_saida(fase, prova)))
+        return erros
+    finally:
+        git('worktree', 'remove', '--force', worktree)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Paridade da tabela bruta com os scripts antigos por fase')
+    parser.add_argument('--dados', required=True, help='Pasta Data com as planilhas de entrada')
+    parser.add_argument('--revisao', help='Commit com os scripts antigos (padrão: o último que os tinha)')
+    parser.add_argument('--fases', type=int, nargs='+', choices=sorted(FASES), help='Padrão: todas')
+    parser.add_argument('--provas', nargs='+', choices=sorted(PROVAS), help='Padrão: todas')
+    args = parser.parse_args()
+
+    fases = args.fases or sorted(FASES)
+    provas = args.provas or list(PROVAS)
+    combinacoes = [(fase, prova) for fase in fases for prova in provas]
+    faltando = sorted({PROVAS[p]['arquivo_mapeamento'] for p in provas
+                       if not os.path.exists(os.path.join(args.dados, PROVAS[p]['arquivo_mapeamento']))})
+    if faltando:
+        parser.error(f"--dados sem o mapeamento das palavras: {', '.join(faltando)} "
+                     f"(gerar_dados_sinteticos.py copia os de Data/)")
+    revisao = args.revisao or revisao_padrao()
+
+    print("=" * 72)
+    print("🔍 PARIDADE DA TABELA BRUTA (pipeline_fases × scripts por fase)")
+    print("=" * 72)
+    print(f"Referência: {revisao} • Dados: {args.dados}")
+
+    with tempfile.TemporaryDirectory() as raiz:
+        erros_antigos = rodar_antigos(revisao, args.dados, combinacoes, raiz)
+
+        dados_novos = os.path.join(raiz, 'Data')
+        shutil.copytree(args.dados, dados_novos)
+        resultados = {(r['fase'], r['prova']): r for r in executar_todas(fases, provas, 1, dados_novos)}
+
+        divergentes = 0
+        print(f"\n{'Combinação':<22} Resultado")
+        for fase, prova in combinacoes:
+            antigo = os.path.join(raiz, 'saida_antiga_' + nome_saida(fase, prova))
+            novo = os.path.join(dados_novos, nome_saida(fase, prova))
+            if erros_antigos[(fase, prova)] or not os.path.exists(antigo):
+                situacao = f"❌ script antigo: {erros_antigos[(fase, prova)]}"
+            elif resultados[(fase, prova)]['erro']:
+                situacao = f"❌ pipeline: {resultados[(fase, prova)]['erro']}"
+            else:
+                diferenca = primeira_diferenca(antigo, novo)
+                situacao = "✅ idêntico" if diferenca is None else f"❌ difere ({diferenca})"
+            divergentes += not situacao.startswith("✅")
+            print(f"Fase {fase} {prova:<15} {situacao}")
+
+    print("=" * 72)
+    if divergentes:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ Este módulo contém todas as ferramentas para processamento e análise
 dos dados do Teste de Escrita (TDE) do projeto WordGen Fase 2.
 
 Componentes:
-- PipelineDataTDE: Geração da tabela bruta com dados TDE
+- gerar_tabela_tde: Geração da tabela bruta com dados TDE (Modules/PipelineFases)
 - GeradorDicionarioDadosTDE: Documentação detalhada dos dados
 - PipelineTabelaBrutaTDE_CLI: Interface de linha de comando
 
@@ -16,10 +16,19 @@ Autor: Sistema de Análise WordGen
 Data: 2024
 """
 
+import pathlib
+import sys
+
 # Imports dos módulos principais
-from .PipelineDataTDE import main as gerar_tabela_tde
+sys.path.append(str(pathlib.Path(__file__).parent.parent.parent / "PipelineFases"))
+from pipeline_fases import executar_pipeline
 from .GeradorDicionarioDadosTDE import main as gerar_dicionario_tde
 
+
+def gerar_tabela_tde():
+    """Gera a tabela bruta TDE da Fase 2 (pipeline compartilhado entre as fases)"""
+    return executar_pipeline(2, 'TDE')
+
 # Metadados do módulo
 __version__ = "1.0.0"
 __author__ = "Sistema de Análise WordGen"
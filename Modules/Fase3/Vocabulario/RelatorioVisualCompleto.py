@@ -3,7 +3,7 @@ import io
 import base64
 import pathlib
 import json
-import unicodedata
+import sys
 from typing import List, Tuple, Dict, Any
 from datetime import datetime
 
@@ -11,7 +11,6 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy import stats
 
 plt.switch_backend("Agg")
 sns.set_theme(style="whitegrid")
@@ -22,8 +21,17 @@ sns.set_theme(style="whitegrid")
 BASE_DIR = pathlib.Path(__file__).parent.parent.parent.parent.resolve()
 DATA_DIR = BASE_DIR / "Data"
 DASHBOARD_DIR = BASE_DIR / "Dashboard"
+sys.path.append(str(DASHBOARD_DIR))
+from word_matching import IndicePalavrasEnsinadas
+from effect_size import estatisticas_por_grupo
+from item_scoring import converter_resposta, converter_respostas
+from item_validity import contar_questoes_pareadas, contar_questoes_validas, resumo_questoes_validas
 FIG_DIR = DATA_DIR / "figures"
 
+# Questões válidas: mínimo em cada teste (50%) e nas respondidas nos dois (80%)
+MINIMO_QUESTOES_POR_TESTE = 25
+MINIMO_QUESTOES_PAREADAS = 40
+
 # Dados da Fase 3 - Usando CSV longitudinal
 ARQUIVO_LONGITUDINAL = DASHBOARD_DIR / "vocabulario_longitudinal.csv"
 ARQUIVO_RESPOSTAS = DATA_DIR / "Fase 3/RespostaVocabulario.json"
@@ -50,58 +58,6 @@ plt.rcParams.update({
 # Funções de utilidade
 # ======================
 
-def normalizar_palavra(palavra: str) -> str:
-    """Normaliza palavra removendo acentos, convertendo para minúsculas e removendo pontuação final."""
-    if not palavra:
-        return ""
-    
-    # Remover espaços extras
-    palavra = palavra.strip()
-    
-    # Normalização NFD para separar caracteres base de diacríticos
-    palavra_nfd = unicodedata.normalize('NFD', palavra)
-    
-    # Remover diacríticos (acentos)
-    palavra_sem_acentos = ''.join(
-        char for char in palavra_nfd
-        if unicodedata.category(char) != 'Mn'
-    )
-    
-    # Converter para minúsculas
-    palavra_lower = palavra_sem_acentos.lower()
-    
-    # Remover pontuação final comum
-    palavra_limpa = palavra_lower.rstrip('.,;:!?')
-    
-    return palavra_limpa
-
-
-def palavra_ensinada_match(palavra_teste: str, palavras_ensinadas: set) -> bool:
-    """Verifica se palavra do teste corresponde a alguma palavra ensinada.
-    
-    Usa correspondência exata normalizada e correspondência de raiz com no mínimo 6 caracteres.
-    """
-    if not palavra_teste or not palavras_ensinadas:
-        return False
-    
-    palavra_teste_norm = normalizar_palavra(palavra_teste)
-    
-    # Verificar correspondência exata normalizada
-    for palavra_ensinada in palavras_ensinadas:
-        palavra_ensinada_norm = normalizar_palavra(palavra_ensinada)
-        
-        # Correspondência exata
-        if palavra_teste_norm == palavra_ensinada_norm:
-            return True
-        
-        # Correspondência de raiz (primeiras 6 letras) - mais rigoroso
-        if len(palavra_teste_norm) >= 6 and len(palavra_ensinada_norm) >= 6:
-            if palavra_teste_norm[:6] == palavra_ensinada_norm[:6]:
-                return True
-    
-    return False
-
-
 def obter_escolas_disponiveis():
     """Obtém a lista de escolas disponíveis nos dados da Fase 3"""
     try:
@@ -162,33 +118,8 @@ def interpretar_cohen_d(d):
     }
 
 def converter_valor_questao(valor):
-    """Converte valores das questões para sistema numérico"""
-    if pd.isna(valor):
-        return np.nan
-    
-    valor_str = str(valor).strip().upper()
-    
-    if valor_str in ['0', '0.0']:
-        return 0  # Erro
-    elif valor_str in ['1', '1.0']:
-        return 1  # Acerto parcial
-    elif valor_str in ['2', '2.0']:
-        return 2  # Acerto total
-    elif valor_str in ['D', 'M']:
-        return np.nan  # Neutro
-    else:
-        try:
-            num_valor = float(valor_str)
-            if num_valor == 0:
-                return 0
-            elif num_valor == 1:
-                return 1
-            elif num_valor == 2:
-                return 2
-            else:
-                return np.nan
-        except:
-            return np.nan
+    """Converte valores das questões para sistema numérico (0, 1, 2; demais valores, inclusive D/M, viram NaN)"""
+    return converter_resposta(valor, exato=True)
 
 def classificar_grupo_etario(turma):
     """Classifica estudantes em grupos etários individuais por ano"""
@@ -219,12 +150,14 @@ def carregar_mapeamento_palavras():
         # Tentar ambas as chaves possíveis
         palavras_ensinadas = set(dados_ensinadas.get("palavras_ensinadas", dados_ensinadas.get("Palavras Ensinadas", [])))
         
+        indice_ensinadas = IndicePalavrasEnsinadas(palavras_ensinadas)
+        
         mapeamento = {}
         for item in dados_respostas:
             for questao, info in item.items():
                 palavra = info['Palavra Trabalhada']
                 # Usar matching inteligente com normalização
-                foi_ensinada = palavra_ensinada_match(palavra, palavras_ensinadas)
+                foi_ensinada = indice_ensinadas.corresponde(palavra)
                 mapeamento[questao] = {
                     'palavra': palavra,
                     'ensinada': foi_ensinada
@@ -276,11 +209,8 @@ def carregar_e_preparar_dados(escola_filtro=None):
     colunas_pos = [f'Q{i}_Pos' for i in range(1, 51)]
     
     # Aplicar conversão de valores para colunas pré e pós
-    for col_pre, col_pos in zip(colunas_pre, colunas_pos):
-        if col_pre in df.columns:
-            df[col_pre] = df[col_pre].apply(converter_valor_questao)
-        if col_pos in df.columns:
-            df[col_pos] = df[col_pos].apply(converter_valor_questao)
+    bloco = converter_respostas(df, colunas_pre + colunas_pos, exato=True)
+    df[bloco.columns] = bloco
     
     # Adicionar grupos etários baseado na coluna Turma
     # Usar .loc para evitar warning de fragmentação
@@ -292,27 +222,13 @@ def carregar_e_preparar_dados(escola_filtro=None):
     
     print("2. Limpando dados...")
     
-    # Função para verificar questões válidas no pré-teste
-    def tem_questoes_validas_pre(row):
-        valores_validos = 0
-        for i in range(1, 51):
-            col = f'Q{i}_Pre'
-            if col in row.index and not pd.isna(row[col]):
-                valores_validos += 1
-        return valores_validos >= 25  # Pelo menos 50% das questões
-    
-    # Função para verificar questões válidas no pós-teste
-    def tem_questoes_validas_pos(row):
-        valores_validos = 0
-        for i in range(1, 51):
-            col = f'Q{i}_Pos'
-            if col in row.index and not pd.isna(row[col]):
-                valores_validos += 1
-        return valores_validos >= 25  # Pelo menos 50% das questões
-    
-    # Aplicar filtro - manter apenas estudantes com dados válidos em ambos os testes
-    mask_pre = df.apply(tem_questoes_validas_pre, axis=1)
-    mask_pos = df.apply(tem_questoes_validas_pos, axis=1)
+    # Manter apenas estudantes com questões válidas suficientes em ambos os testes
+    validas_pre = contar_questoes_validas(df, colunas_pre)
+    validas_pos = contar_questoes_validas(df, colunas_pos)
+    print(f"   Questões válidas no pré: {resumo_questoes_validas(validas_pre, len(colunas_pre))}")
+    print(f"   Questões válidas no pós: {resumo_questoes_validas(validas_pos, len(colunas_pos))}")
+    mask_pre = validas_pre >= MINIMO_QUESTOES_POR_TESTE
+    mask_pos = validas_pos >= MINIMO_QUESTOES_POR_TESTE
     
     df_final = df[mask_pre & mask_pos].copy()
     
@@ -337,51 +253,35 @@ def carregar_e_preparar_dados(escola_filtro=None):
     return df_pre_final, df_pos_final, colunas_q, mapeamento_palavras
 
 def calcular_scores(df_pre_final, df_pos_final, colunas_q):
-    """Calcula scores por estudante"""
+    """Calcula scores por estudante (questões respondidas no pré e no pós)"""
     print("3. Calculando scores...")
     
-    scores_data = []
-    
-    for _, row_pre in df_pre_final.iterrows():
-        id_unico = row_pre['ID_Unico']
-        grupo = row_pre['GrupoEtario']
-        
-        # Encontrar correspondente no pós-teste
-        pos_rows = df_pos_final[df_pos_final['ID_Unico'] == id_unico]
-        if len(pos_rows) == 0:
-            continue
-            
-        row_pos = pos_rows.iloc[0]
-        
-        # Calcular scores
-        score_pre = 0
-        score_pos = 0
-        questoes_validas = 0
-        
-        for col in colunas_q:
-            if col in df_pre_final.columns and col in df_pos_final.columns:
-                val_pre = row_pre[col]
-                val_pos = row_pos[col]
-                
-                if not pd.isna(val_pre) and not pd.isna(val_pos):
-                    score_pre += val_pre
-                    score_pos += val_pos
-                    questoes_validas += 1
-        
-        if questoes_validas >= 40:  # Pelo menos 80% das questões
-            scores_data.append({
-                'ID_Unico': id_unico,
-                'GrupoEtario': grupo,
-                'Score_Pre': score_pre,
-                'Score_Pos': score_pos,
-                'Delta': score_pos - score_pre,
-                'N_Questoes': questoes_validas
-            })
-    
-    return pd.DataFrame(scores_data)
+    # Correspondente no pós-teste: primeiro registro com o mesmo ID_Unico
+    df_pos_final = df_pos_final.drop_duplicates('ID_Unico').set_index('ID_Unico')
+    df_pre_final = df_pre_final[df_pre_final['ID_Unico'].isin(df_pos_final.index)]
+    df_pos_final = df_pos_final.reindex(df_pre_final['ID_Unico'])
+    
+    colunas = [col for col in colunas_q if col in df_pre_final.columns and col in df_pos_final.columns]
+    pre = df_pre_final[colunas].to_numpy(dtype=float, na_value=np.nan)
+    pos = df_pos_final[colunas].to_numpy(dtype=float, na_value=np.nan)
+    pareadas = ~np.isnan(pre) & ~np.isnan(pos)
+    score_pre = np.where(pareadas, pre, 0).sum(axis=1).astype(np.int64)
+    score_pos = np.where(pareadas, pos, 0).sum(axis=1).astype(np.int64)
+    questoes_validas = contar_questoes_pareadas(df_pre_final, df_pos_final, colunas).to_numpy()
+    
+    scores_df = pd.DataFrame({
+        'ID_Unico': df_pre_final['ID_Unico'].to_numpy(),
+        'GrupoEtario': df_pre_final['GrupoEtario'].to_numpy(),
+        'Score_Pre': score_pre,
+        'Score_Pos': score_pos,
+        'Delta': score_pos - score_pre,
+        'N_Questoes': questoes_validas
+    })
+    # Pelo menos 80% das questões respondidas nos dois testes
+    return scores_df[questoes_validas >= MINIMO_QUESTOES_PAREADAS].reset_index(drop=True)
 
 def calcular_indicadores(scores_df, grupo_filtro=None):
-    """Calcula indicadores estatísticos"""
+    """Calcula indicadores estatísticos (via effect_size.estatisticas_por_grupo)"""
     if grupo_filtro:
         dados = scores_df[scores_df['GrupoEtario'] == grupo_filtro]
     else:
@@ -403,43 +303,25 @@ def calcular_indicadores(scores_df, grupo_filtro=None):
             'perc_unchanged': 0
         }
     
-    pre_scores = dados['Score_Pre']
-    pos_scores = dados['Score_Pos']
-    deltas = dados['Delta']
-    
-    # Estatísticas básicas
-    indicadores = {
-        'n': len(dados),
-        'mean_pre': pre_scores.mean(),
-        'std_pre': pre_scores.std(),
-        'mean_pos': pos_scores.mean(),
-        'std_pos': pos_scores.std(),
-        'mean_delta': deltas.mean(),
-        'std_delta': deltas.std()
-    }
+    linha = estatisticas_por_grupo(dados, col_pre='Score_Pre', col_pos='Score_Pos').iloc[0]
+    total = int(linha['n'])
     
-    # Cohen's d
-    pooled_std = np.sqrt((pre_scores.var() + pos_scores.var()) / 2)
-    indicadores['cohen_d'] = deltas.mean() / pooled_std if pooled_std > 0 else 0
-    
-    # Teste estatístico
-    try:
-        _, p_value = stats.wilcoxon(pre_scores, pos_scores, alternative='two-sided')
-        indicadores['p_value'] = p_value
-    except:
-        indicadores['p_value'] = 1.0
-    
-    # Percentuais de mudança
-    melhoraram = (deltas > 0).sum()
-    pioraram = (deltas < 0).sum()
-    mantiveram = (deltas == 0).sum()
-    total = len(deltas)
-    
-    indicadores['perc_improved'] = (melhoraram / total) * 100
-    indicadores['perc_worsened'] = (pioraram / total) * 100
-    indicadores['perc_unchanged'] = (mantiveram / total) * 100
-    
-    return indicadores
+    return {
+        'n': total,
+        'mean_pre': linha['media_pre'],
+        'std_pre': linha['dp_pre'],
+        'mean_pos': linha['media_pos'],
+        'std_pos': linha['dp_pos'],
+        'mean_delta': linha['media_delta'],
+        'std_delta': linha['dp_delta'],
+        # Cohen's d: Delta médio / raiz da média das variâncias pré e pós
+        'cohen_d': linha['d_medio'] if np.isfinite(linha['d_medio']) else 0,
+        # Teste de Wilcoxon pareado (bilateral)
+        'p_value': linha['p_wilcoxon'] if np.isfinite(linha['p_wilcoxon']) else 1.0,
+        'perc_improved': (linha['n_melhora'] / total) * 100,
+        'perc_worsened': (linha['n_piora'] / total) * 100,
+        'perc_unchanged': (linha['n_estavel'] / total) * 100
+    }
 
 def analisar_palavras(df_pre_final, df_pos_final, colunas_q, mapeamento_palavras, grupo_filtro=None):
     """Analisa performance por palavra"""
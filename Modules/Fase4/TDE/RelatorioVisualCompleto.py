@@ -16,6 +16,7 @@ import io
 import re
 import base64
 import pathlib
+import sys
 import argparse
 from typing import List, Tuple, Dict
 from datetime import datetime
@@ -24,7 +25,6 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from PipelineDataTDE import carregar_mapeamento_tde
 
 # Configurações matplotlib para compatibilidade
 plt.switch_backend("Agg")
@@ -36,6 +36,10 @@ sns.set_theme(style="whitegrid")
 BASE_DIR = pathlib.Path(__file__).parent.parent.parent.parent.resolve()  # Sair de TDE/Fase4/Modules/
 DATA_DIR = BASE_DIR / "Data"
 DASHBOARD_DIR = BASE_DIR / "Dashboard"
+sys.path.append(str(DASHBOARD_DIR))
+sys.path.append(str(BASE_DIR / "Modules" / "PipelineFases"))
+from effect_size import estatisticas_por_grupo
+from pipeline_fases import carregar_mapeamento_tde
 FIG_DIR = DATA_DIR / "figures"
 
 # Arquivos de dados TDE - ALTERADO PARA TDE_longitudinal.csv
@@ -234,7 +238,7 @@ def carregar_dados_tde(csv_path: str = None, escola_filtro: str = None) -> Tuple
     return df, meta
 
 def calcular_indicadores_tde(df: pd.DataFrame, grupo_filtro: str = None) -> Dict[str, float]:
-    """Calcula indicadores estatísticos específicos para TDE."""
+    """Calcula indicadores estatísticos específicos para TDE (via effect_size.estatisticas_por_grupo)."""
     
     # Aplicar filtro de grupo se especificado
     if grupo_filtro:
@@ -255,40 +259,22 @@ def calcular_indicadores_tde(df: pd.DataFrame, grupo_filtro: str = None) -> Dict
             "cohen_d_global": np.nan
         }
     
-    pre_scores = df['Score_Pre']
-    pos_scores = df['Score_Pos'] 
-    deltas = df['Delta_Score']
-    
-    n = len(df)
-    
-    # Estatísticas básicas
-    mean_pre = float(pre_scores.mean())
-    std_pre = float(pre_scores.std(ddof=1)) if n > 1 else 0.0
-    mean_pos = float(pos_scores.mean())
-    std_pos = float(pos_scores.std(ddof=1)) if n > 1 else 0.0
-    mean_delta = float(deltas.mean())
-    std_delta = float(deltas.std(ddof=1)) if n > 1 else 0.0
-    
-    # Percentuais de mudança
-    improved = (deltas > 0).mean() * 100.0
-    worsened = (deltas < 0).mean() * 100.0  
-    unchanged = (deltas == 0).mean() * 100.0
-    
-    # Effect size global (Delta médio / SD do pré-teste)
-    cohen_d = mean_delta / std_pre if std_pre > 1e-12 else np.nan
+    linha = estatisticas_por_grupo(df, col_pre='Score_Pre', col_pos='Score_Pos').iloc[0]
+    n = int(linha['n'])
     
     return {
         "n": n,
-        "mean_pre": mean_pre,
-        "std_pre": std_pre,
-        "mean_pos": mean_pos,
-        "std_pos": std_pos,
-        "mean_delta": mean_delta,
-        "std_delta": std_delta,
-        "percent_improved": improved,
-        "percent_worsened": worsened,
-        "percent_unchanged": unchanged,
-        "cohen_d_global": cohen_d
+        "mean_pre": float(linha['media_pre']),
+        "std_pre": float(linha['dp_pre']) if n > 1 else 0.0,
+        "mean_pos": float(linha['media_pos']),
+        "std_pos": float(linha['dp_pos']) if n > 1 else 0.0,
+        "mean_delta": float(linha['media_delta']),
+        "std_delta": float(linha['dp_delta']) if n > 1 else 0.0,
+        "percent_improved": linha['n_melhora'] / n * 100.0,
+        "percent_worsened": linha['n_piora'] / n * 100.0,
+        "percent_unchanged": linha['n_estavel'] / n * 100.0,
+        # Effect size global (Delta médio / SD do pré-teste)
+        "cohen_d_global": float(linha['d_pre'])
     }
 
 # ======================
@@ -30,13 +30,15 @@ Resumo JSON traz contagens agregadas.
 """
 
 import pandas as pd
-import unicodedata
 import re
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
 
 BASE_DIR = Path(__file__).parents[2]  # volta até raiz do projeto
+sys.path.append(str(BASE_DIR / 'Dashboard'))
+from text_normalization import normalize_names
 DATA_DIR = BASE_DIR / 'Data'
 OUT_DIR = DATA_DIR / 'Longitudinal'
 OUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -46,14 +48,6 @@ ARQ_VOC = DATA_DIR / 'vocabulario_consolidado_fases_2_3_4.csv'
 
 FASE_PARES = [(2,3),(3,4)]
 
-def normalizar_nome(nome: str) -> str:
-	if pd.isna(nome):
-		return ''
-	s = str(nome).strip().upper()
-	s = ''.join(c for c in unicodedata.normalize('NFD', s) if unicodedata.category(c) != 'Mn')
-	s = re.sub(r'\s+', ' ', s)
-	return s
-
 def extrair_ano_turma(turma: str) -> int | None:
 	if pd.isna(turma):
 		return None
@@ -75,7 +69,7 @@ def carregar_dataframe(path: Path, prova: str) -> pd.DataFrame:
 	faltantes = col_esperadas - set(df.columns)
 	if faltantes:
 		raise ValueError(f"Colunas faltantes em {prova}: {faltantes}")
-	df['NomeNorm'] = df['Nome'].apply(normalizar_nome)
+	df['NomeNorm'] = normalize_names(df['Nome'])
 	df['Ano'] = df['Turma'].apply(extrair_ano_turma)
 	return df
 
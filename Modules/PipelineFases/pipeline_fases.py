@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PIPELINE DE TABELA BRUTA POR FASE - WORDGEN (TDE e Vocabulário)
+Gera, para cada fase × prova, a tabela bruta pareada Pré/Pós a partir das
+planilhas Data/Fase N/Pre|Pos/DadosTDE.csv e DadosVocabulario.csv:
+
+1. Carga (nomes de coluna ESCOLA/NOME/TURMA padronizados para Escola/Nome/Turma)
+2. Pré-processamento: completa Escola/Turma faltantes, remove duplicados,
+   converte as respostas, descarta registros abaixo do mínimo de questões
+   respondidas da prova (25%), classifica o grupo pela série e mantém só
+   quem fez Pré e Pós
+3. Tabela bruta: scores, percentuais e Pré/Pós/Delta de cada questão
+4. Estatísticas por grupo, escola e turma (teste t e d pareados)
+5. Data/tabela_bruta_fase{N}_{TDE|vocabulario}_wordgen.csv
+
+As provas (colunas, escala de pontuação, mapeamento das palavras) e as fases
+(diretório e particularidades das planilhas) ficam em PROVAS e FASES: uma
+fase nova é uma entrada em FASES. Cada mapeamento JSON é lido uma única vez e
+repassado às combinações que o usam; as combinações rodam em paralelo em um
+pool de processos e o log de cada uma é impresso inteiro, na ordem.
+
+Uso:
+    python Modules/PipelineFases/pipeline_fases.py
+    python Modules/PipelineFases/pipeline_fases.py --fases 3 4 --provas TDE
+    python Modules/PipelineFases/pipeline_fases.py --processos 1 --dados /tmp/wordgen_sintetico/Data
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import pathlib
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Configurar caminhos
+BASE_DIR = pathlib.Path(__file__).parent.parent.parent.resolve()
+DATA_DIR = BASE_DIR / "Data"
+sys.path.append(str(BASE_DIR / "Dashboard"))
+from effect_size import estatisticas_por_grupo
+from item_scoring import converter_respostas
+from item_validity import (contar_questoes_validas, distribuicao_questoes_validas,
+                           minimo_questoes, resumo_questoes_validas)
+
+# ========== CONFIGURAÇÃO ==========
+PROVAS = {
+    'TDE': {
+        'titulo': 'TDE',
+        'arquivo_dados': 'DadosTDE.csv',
+        'arquivo_mapeamento': 'RespostaTED.json',
+        'sufixo_saida': 'TDE',
+        'prefixo': 'P',              # P1..P40
+        'n_questoes': 40,
+        'pontuacao_maxima': 1,       # 0 = erro, 1 = acerto
+        'minimo_questoes': 0.25,     # fração (float < 1) ou número de questões respondidas
+        'coluna_grupo': 'GrupoTDE',
+        'titulo_grupo': 'GRUPO TDE',
+        'grupos': ('Grupo A (6º/7º anos)', 'Grupo B (8º/9º anos)'),
+    },
+    'VOCABULARIO': {
+        'titulo': 'VOCABULÁRIO',
+        'arquivo_dados': 'DadosVocabulario.csv',
+        'arquivo_mapeamento': 'RespostaVocabulario.json',
+        'sufixo_saida': 'vocabulario',
+        'prefixo': 'Q',              # Q1..Q50
+        'n_questoes': 50,
+        'pontuacao_maxima': 2,       # 0 = erro, 1 = parcial, 2 = acerto
+        'minimo_questoes': 0.25,
+        'coluna_grupo': 'GrupoEtario',
+        'titulo_grupo': 'GRUPO ETÁRIO',
+        'grupos': ('6º/7º anos', '8º/9º anos'),
+    },
+}
+
+# Uma entrada por fase; turma_sem_ordinal aceita turmas escritas como "6 ANO A"
+FASES = {
+    2: {'diretorio': 'Fase 2'},
+    3: {'diretorio': 'Fase 3'},
+    4: {'diretorio': 'Fase 4', 'turma_sem_ordinal': True},
+}
+
+# Planilhas com cabeçalho em maiúsculas (Fase 4)
+COLUNAS_PADRONIZADAS = {'ESCOLA': 'Escola', 'NOME': 'Nome', 'TURMA': 'Turma'}
+
+
+# ========== MAPEAMENTOS ==========
+def carregar_mapeamento(prova: str, data_dir=DATA_DIR) -> dict:
+    """Mapeamento questão -> palavra trabalhada ({'P1': 'boi', ...} / {'Q1': 'enorme', ...})."""
+    config = PROVAS[prova]
+    try:
+        with open(os.path.join(data_dir, config['arquivo_mapeamento']), 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+
+        mapeamento = {}
+        for item in dados:
+            for chave, info in item.items():
+                # TDE usa "Pergunta N"; Vocabulário já usa "QN"
+                numero = chave.split(' ')[1] if chave.startswith('Pergunta') else chave[len(config['prefixo']):]
+                questao = f"{config['prefixo']}{numero}"
+                mapeamento[questao] = info.get('Palavra Trabalhada', f'Palavra_{numero}')
+        return mapeamento
+    except Exception as e:
+        print(f"Erro ao carregar mapeamento: {e}")
+        return {}
+
+
+def carregar_mapeamento_tde(data_dir=DATA_DIR) -> dict:
+    """Carrega mapeamento das questões TDE"""
+    return carregar_mapeamento('TDE', data_dir)
+
+
+def carregar_mapeamento_vocabulario(data_dir=DATA_DIR) -> dict:
+    """Carrega mapeamento das questões de vocabulário"""
+    return carregar_mapeamento('VOCABULARIO', data_dir)
+
+
+# ========== PRÉ-PROCESSAMENTO ==========
+def campo_faltante(valores: pd.Series) -> pd.Series:
+    """Valor ausente, vazio ou o texto 'nan' (após strip)."""
+    texto = valores.astype(str).str.strip()
+    return valores.isna() | (texto == '') | (texto.str.lower() == 'nan')
+
+
+def completar_dados_faltantes(df, nome_dataset):
+    """
+    Completa Escola e/ou Turma faltantes com o primeiro registro (na ordem do
+    arquivo) do mesmo aluno (Nome sem espaços nas pontas) que tem o campo preenchido
+    """
+    print(f"   Verificando dados incompletos em {nome_dataset}...")
+    nomes = df['Nome'].str.strip()
+    faltantes = {col: campo_faltante(df[col]) for col in ('Escola', 'Turma')}
+    registros_incompletos = int((faltantes['Escola'] | faltantes['Turma']).sum())
+
+    completados = {}
+    for col, faltante in faltantes.items():
+        # Primeiro valor preenchido de cada aluno, propagado a todas as linhas do aluno
+        doador = df[col].where(~faltante).groupby(nomes, sort=False).transform('first')
+        preencher = faltante & doador.notna()
+        df.loc[preencher, col] = doador[preencher]
+        completados[col] = int(preencher.sum())
+
+    print(f"   {registros_incompletos} registros com dados incompletos encontrados")
+    print(f"   {sum(completados.values())} campos completados "
+          f"(Escola: {completados['Escola']}, Turma: {completados['Turma']})")
+    return df
+
+
+def remover_duplicados(df, nome_dataset):
+    """
+    Remove dados duplicados considerando Escola, Turma e Nome
+    """
+    print(f"   Verificando duplicados em {nome_dataset}...")
+    len_inicial = len(df)
+
+    # Identificar duplicados
+    duplicados = df.duplicated(subset=['Escola', 'Turma', 'Nome'], keep='first')
+
+    if duplicados.sum() > 0:
+        print(f"     Encontrados {duplicados.sum()} registros duplicados:")
+        for idx in df[duplicados].index:
+            row = df.loc[idx]
+            print(f"       - {row['Nome']} | {row['Escola']} | {row['Turma']}")
+
+        # Remover duplicados
+        df = df.drop_duplicates(subset=['Escola', 'Turma', 'Nome'], keep='first')
+        print(f"     {len_inicial - len(df)} duplicados removidos")
+    else:
+        print(f"     Nenhum duplicado encontrado")
+
+    return df
+
+
+def verificar_questoes_validas(df, colunas_q, nome_dataset, limiar=0.25):
+    """
+    Remove registros com menos questões respondidas que o limiar da prova
+    (padrão: 25%, ou seja, 13 de 50 / 10 de 40).
+
+    Retorna o DataFrame filtrado e a distribuição de questões válidas por
+    registro (antes do filtro).
+    """
+    print(f"   Verificando questões válidas em {nome_dataset}...")
+    len_inicial = len(df)
+    minimo = minimo_questoes(limiar, len(colunas_q))
+
+    # Identificar registros com questões suficientes
+    contagens = contar_questoes_validas(df, colunas_q)
+    registros_validos = contagens >= minimo
+    registros_invalidos = (~registros_validos).sum()
+    print(f"     Questões válidas por registro: {resumo_questoes_validas(contagens, len(colunas_q))}")
+
+    if registros_invalidos > 0:
+        print(f"     {registros_invalidos} registros com questões insuficientes encontrados")
+        # Mostrar alguns exemplos
+        for idx in df[~registros_validos].head(5).index:
+            row = df.loc[idx]
+            print(f"       - {row['Nome']} | {row['Escola']} | {row['Turma']} | Questões: {contagens[idx]}/{len(colunas_q)}")
+
+        # Remover registros inválidos
+        df = df[registros_validos]
+        print(f"     {len_inicial - len(df)} registros com questões insuficientes removidos")
+    else:
+        print(f"     Todos os registros possuem questões suficientes (≥{minimo})")
+
+    return df, distribuicao_questoes_validas(contagens, len(colunas_q), minimo)
+
+
+def classificar_grupo(turma, grupos: tuple, turma_sem_ordinal: bool = False):
+    """Classifica a turma no grupo de 6º/7º ou de 8º/9º anos"""
+    turma_str = str(turma).upper()
+    marcas = ('º', '°') + ((' ANO',) if turma_sem_ordinal else ())
+
+    if any(f'{serie}{marca}' in turma_str for serie in '67' for marca in marcas):
+        return grupos[0]
+    elif any(f'{serie}{marca}' in turma_str for serie in '89' for marca in marcas):
+        return grupos[1]
+    else:
+        return "Indefinido"
+
+
+# ========== PIPELINE ==========
+def executar_pipeline(fase: int, prova: str, mapeamento: dict | None = None,
+                      data_dir=DATA_DIR) -> pd.DataFrame:
+    """Pipeline de uma fase × prova; grava e retorna a tabela bruta."""
+    config, config_fase = PROVAS[prova], FASES[fase]
+    fase_dir = os.path.join(data_dir, config_fase['diretorio'])
+    arquivo_pre = os.path.join(fase_dir, 'Pre', config['arquivo_dados'])
+    arquivo_pos = os.path.join(fase_dir, 'Pos', config['arquivo_dados'])
+    output_csv = os.path.join(data_dir, f"tabela_bruta_fase{fase}_{config['sufixo_saida']}_wordgen.csv")
+    prefixo, pontuacao_maxima = config['prefixo'], config['pontuacao_maxima']
+    coluna_grupo = config['coluna_grupo']
+
+    print("="*80)
+    print(f"PIPELINE {config['titulo']} - WORDGEN FASE {fase}")
+    print("="*80)
+    print(f"Executado em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*80)
+
+    # 1. CARREGAR DADOS
+    print("1. CARREGANDO DADOS...")
+    df_pre = pd.read_csv(arquivo_pre).rename(columns=COLUNAS_PADRONIZADAS)
+    df_pos = pd.read_csv(arquivo_pos).rename(columns=COLUNAS_PADRONIZADAS)
+    if mapeamento is None:
+        mapeamento = carregar_mapeamento(prova, data_dir)
+
+    print(f"   PRÉ-teste: {len(df_pre)} registros")
+    print(f"   PÓS-teste: {len(df_pos)} registros")
+    print(f"   Mapeamento: {len(mapeamento)} questões")
+
+    # 2. PRÉ-PROCESSAMENTO
+    print("\n2. PRÉ-PROCESSAMENTO...")
+    colunas_q = [f'{prefixo}{i}' for i in range(1, config['n_questoes'] + 1)]
+
+    # 2.1 Completar dados faltantes de Escola e/ou Turma
+    print("\n2.1 COMPLETANDO DADOS FALTANTES...")
+    df_pre = completar_dados_faltantes(df_pre, "PRÉ-teste")
+    df_pos = completar_dados_faltantes(df_pos, "PÓS-teste")
+
+    # 2.2 Remover duplicados
+    print("\n2.2 REMOVENDO DUPLICADOS...")
+    df_pre = remover_duplicados(df_pre, "PRÉ-teste")
+    df_pos = remover_duplicados(df_pos, "PÓS-teste")
+
+    # 2.3 Converter valores
+    print("\n2.3 CONVERTENDO VALORES DAS QUESTÕES...")
+    # Bloco inteiro de uma vez (0/1 ou 0/1/2 em Int8 anulável). As questões com alguma
+    # resposta ausente/inválida ficam anotadas: no CSV elas saem como float (ver etapa 3)
+    decimais = {}
+    for momento, df_momento in (('pre', df_pre), ('pos', df_pos)):
+        bloco = converter_respostas(df_momento, colunas_q, pontuacao_maxima)
+        df_momento[bloco.columns] = bloco
+        decimais[momento] = {col for col in bloco.columns if bloco[col].isna().any()}
+
+    # 2.4 Verificar questões válidas (mínimo da prova, padrão 25%)
+    print("\n2.4 VERIFICANDO QUESTÕES VÁLIDAS...")
+    df_pre, distribuicao_pre = verificar_questoes_validas(df_pre, colunas_q, "PRÉ-teste", config['minimo_questoes'])
+    df_pos, distribuicao_pos = verificar_questoes_validas(df_pos, colunas_q, "PÓS-teste", config['minimo_questoes'])
+
+    # 2.5 Classificar grupos
+    print("\n2.5 CLASSIFICANDO GRUPOS...")
+    args_grupo = (config['grupos'], config_fase.get('turma_sem_ordinal', False))
+    df_pre[coluna_grupo] = df_pre['Turma'].apply(classificar_grupo, args=args_grupo)
+    df_pos[coluna_grupo] = df_pos['Turma'].apply(classificar_grupo, args=args_grupo)
+
+    # 2.6 ID único
+    print("\n2.6 CRIANDO IDs ÚNICOS...")
+    df_pre['ID_Unico'] = df_pre['Nome'].astype(str) + "_" + df_pre['Escola'].astype(str) + "_" + df_pre['Turma'].astype(str)
+    df_pos['ID_Unico'] = df_pos['Nome'].astype(str) + "_" + df_pos['Escola'].astype(str) + "_" + df_pos['Turma'].astype(str)
+
+    # 2.7 Verificar presença em ambos os testes (PRÉ e PÓS)
+    print("\n2.7 VERIFICANDO PRESENÇA EM AMBOS OS TESTES...")
+    ids_pre = set(df_pre['ID_Unico'])
+    ids_pos = set(df_pos['ID_Unico'])
+    ids_comuns = ids_pre.intersection(ids_pos)
+
+    print(f"   IDs no PRÉ-teste: {len(ids_pre)}")
+    print(f"   IDs no PÓS-teste: {len(ids_pos)}")
+    print(f"   IDs em ambos os testes: {len(ids_comuns)}")
+    print(f"   IDs apenas no PRÉ: {len(ids_pre - ids_pos)}")
+    print(f"   IDs apenas no PÓS: {len(ids_pos - ids_pre)}")
+
+    # Mostrar alguns exemplos de registros que serão removidos
+    for rotulo, df_momento, ids_exclusivos in (('PRÉ', df_pre, ids_pre - ids_pos), ('PÓS', df_pos, ids_pos - ids_pre)):
+        if len(ids_exclusivos) > 0:
+            print(f"     Exemplos de registros apenas no {rotulo}-teste (serão removidos):")
+            for id_exemplo in list(ids_exclusivos)[:3]:
+                exemplo = df_momento[df_momento['ID_Unico'] == id_exemplo].iloc[0]
+                print(f"       - {exemplo['Nome']} | {exemplo['Escola']} | {exemplo['Turma']}")
+
+    # Filtrar apenas registros presentes em ambos os testes
+    df_pre = df_pre[df_pre['ID_Unico'].isin(ids_comuns)]
+    df_pos = df_pos[df_pos['ID_Unico'].isin(ids_comuns)]
+
+    print(f"   Registros finais: {len(df_pre)}")
+
+    # 3. GERAR TABELA BRUTA
+    print("\n3. GERANDO TABELA BRUTA...")
+
+    # Um registro de PÓS por ID (o primeiro na ordem de ID_Unico), alinhado às linhas do PRÉ
+    df_pre = df_pre.sort_values('ID_Unico').reset_index(drop=True)
+    df_pos = df_pos.sort_values('ID_Unico').drop_duplicates('ID_Unico')
+    df_pos = df_pre[['ID_Unico']].merge(df_pos[['ID_Unico'] + colunas_q], on='ID_Unico',
+                                        how='left', validate='many_to_one')
+    bloco_pre, bloco_pos = df_pre[colunas_q], df_pos[colunas_q]
+
+    # Scores: soma das questões respondidas; percentual sobre as questões válidas nos dois testes
+    score_pre = bloco_pre.sum(axis=1).to_numpy(dtype=np.int64)
+    score_pos = bloco_pos.sum(axis=1).to_numpy(dtype=np.int64)
+    questoes_validas = (bloco_pre.notna() & bloco_pos.notna()).sum(axis=1).to_numpy()
+    pontos_possiveis = questoes_validas * pontuacao_maxima
+    com_questoes = questoes_validas > 0
+    percentual_pre, percentual_pos = np.zeros(len(df_pre)), np.zeros(len(df_pre))
+    np.divide(score_pre, pontos_possiveis, out=percentual_pre, where=com_questoes)
+    np.divide(score_pos, pontos_possiveis, out=percentual_pos, where=com_questoes)
+
+    # Formato do CSV (o mesmo dos scripts por fase anteriores, lido pelos scripts de merge):
+    # a questão com alguma resposta ausente/inválida sai como float (1.0, -1.0), as demais
+    # como inteiro; o score sai como float se algum registro somou uma questão float
+    def formatar(valores, decimal: bool):
+        return pd.array(valores, dtype='Float64') if decimal else valores
+
+    def score_decimal(bloco, colunas_decimais) -> bool:
+        colunas = [col for col in colunas_q if col in colunas_decimais]
+        return bool(colunas) and bool(bloco[colunas].notna().to_numpy().any())
+
+    decimal_pre = score_decimal(bloco_pre, decimais['pre'])
+    decimal_pos = score_decimal(bloco_pos, decimais['pos'])
+    colunas_tabela = {
+        'ID_Unico': df_pre['ID_Unico'],
+        'Nome': df_pre['Nome'],
+        'Escola': df_pre['Escola'] if 'Escola' in df_pre.columns else 'N/A',
+        'Turma': df_pre['Turma'],
+        coluna_grupo: df_pre[coluna_grupo],
+        'Score_Pre': formatar(score_pre, decimal_pre),
+        'Score_Pos': formatar(score_pos, decimal_pos),
+        'Delta_Score': formatar(score_pos - score_pre, decimal_pre or decimal_pos),
+        'Questoes_Validas': questoes_validas,
+        'Percentual_Pre': percentual_pre * 100,
+        'Percentual_Pos': percentual_pos * 100,
+    }
+
+    # Questões individuais (vazias quando faltam no PRÉ, no PÓS ou, para o Delta, em algum dos dois)
+    for i, col in enumerate(colunas_q, 1):
+        palavra = mapeamento.get(col, f"Palavra_{prefixo}{i}")
+        pre, pos = bloco_pre[col].array, bloco_pos[col].array
+        decimal_pre, decimal_pos = col in decimais['pre'], col in decimais['pos']
+        colunas_tabela[f'{prefixo}{i:02d}_Pre_{palavra}'] = formatar(pre, decimal_pre)
+        colunas_tabela[f'{prefixo}{i:02d}_Pos_{palavra}'] = formatar(pos, decimal_pos)
+        colunas_tabela[f'{prefixo}{i:02d}_Delta_{palavra}'] = formatar(pos - pre, decimal_pre or decimal_pos)
+
+    df_tabela = pd.DataFrame(colunas_tabela)
+    # Subproduto para os relatórios de qualidade dos dados (não vai para o CSV)
+    df_tabela.attrs['distribuicao_questoes_validas'] = pd.concat(
+        {'PRÉ': distribuicao_pre, 'PÓS': distribuicao_pos}, names=['momento']
+    ).reset_index(level=0).reset_index(drop=True)
+
+    # 4. ESTATÍSTICAS
+    print("\n4. ESTATÍSTICAS DOS DADOS:")
+    print("="*50)
+
+    print(f"TOTAL DE ESTUDANTES: {len(df_tabela)}")
+    print(f"TOTAL DE COLUNAS: {len(df_tabela.columns)}")
+
+    print(f"\nPOR {config['titulo_grupo']}:")
+    por_grupo = estatisticas_por_grupo(df_tabela, coluna_grupo, ordenar=False)
+    for _, linha in por_grupo[por_grupo[coluna_grupo] != 'Indefinido'].iterrows():
+        print(f"  {linha[coluna_grupo]}:")
+        print(f"    N: {linha['n']}")
+        print(f"    Pré-teste: {linha['media_pre']:.2f} ± {linha['dp_pre']:.2f}")
+        print(f"    Pós-teste: {linha['media_pos']:.2f} ± {linha['dp_pos']:.2f}")
+        print(f"    Delta: {linha['media_delta']:.2f} ± {linha['dp_delta']:.2f}")
+
+        # Teste t pareado e d de Cohen pareado (Delta médio / DP do Delta)
+        print(f"    Teste t: t={linha['t_pareado']:.3f}, p={linha['p_t']:.4f}")
+        print(f"    Cohen's d: {linha['d_pareado']:.3f}")
+
+    print("\nPOR ESCOLA:")
+    por_escola = estatisticas_por_grupo(df_tabela, 'Escola', ordenar=False)
+    for _, linha in por_escola[por_escola['Escola'] != 'N/A'].iterrows():
+        print(f"  {linha['Escola']}: N={linha['n']}, Δ={linha['media_delta']:.2f}")
+
+    print("\nPOR TURMA:")
+    for _, linha in estatisticas_por_grupo(df_tabela, 'Turma').iterrows():
+        print(f"  {linha['Turma']}: N={linha['n']}, Δ={linha['media_delta']:.2f}")
+
+    # Estatísticas gerais
+    geral = estatisticas_por_grupo(df_tabela).iloc[0]
+    print(f"\nESTATÍSTICAS GERAIS:")
+    print(f"  Score Pré-teste: {geral['media_pre']:.2f} ± {geral['dp_pre']:.2f}")
+    print(f"  Score Pós-teste: {geral['media_pos']:.2f} ± {geral['dp_pos']:.2f}")
+    print(f"  Delta médio: {geral['media_delta']:.2f} ± {geral['dp_delta']:.2f}")
+
+    # Teste t geral
+    print(f"  Teste t pareado: t={geral['t_pareado']:.3f}, p={geral['p_t']:.4f}")
+    print(f"  Cohen's d geral: {geral['d_pareado']:.3f}")
+
+    # 5. SALVAR CSV
+    print("\n5. SALVANDO TABELA...")
+    df_tabela.to_csv(output_csv, index=False, encoding='utf-8-sig')
+
+    print("="*80)
+    print(f"✅ PIPELINE {config['titulo']} CONCLUÍDO!")
+    print("="*80)
+    print(f"📁 Arquivo gerado: {output_csv}")
+    print(f"📊 Registros: {len(df_tabela)}")
+    print(f"📋 Colunas: {len(df_tabela.columns)}")
+    print("="*80)
+
+    return df_tabela
+
+
+def _executar_combinacao(fase: int, prova: str, mapeamento: dict, data_dir) -> dict:
+    """Executa uma combinação capturando o log (roda nos processos do pool)."""
+    log = io.StringIO()
+    inicio = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log):
+            df_tabela = executar_pipeline(fase, prova, mapeamento, data_dir)
+        erro, linhas = None, len(df_tabela)
+        questoes_validas = df_tabela.attrs.get('distribuicao_questoes_validas')
+    except Exception as e:
+        erro, linhas, questoes_validas = f'{type(e).__name__}: {e}', None, None
+    return {
+        'fase': fase,
+        'prova': prova,
+        'linhas': linhas,
+        'questoes_validas': questoes_validas,
+        'segundos': time.perf_counter() - inicio,
+        'erro': erro,
+        'log': log.getvalue(),
+    }
+
+
+def executar_todas(fases=None, provas=None, processos: int | None = None, data_dir=DATA_DIR) -> list:
+    """Executa as combinações fase × prova (padrão: todas) em um pool de processos."""
+    fases = list(fases or FASES)
+    provas = list(provas or PROVAS)
+    # Cada mapeamento é lido uma vez e compartilhado por todas as fases
+    mapeamentos = {prova: carregar_mapeamento(prova, data_dir) for prova in provas}
+    combinacoes = [(fase, prova, mapeamentos[prova], data_dir) for fase in fases for prova in provas]
+
+    processos = min(processos or os.cpu_count() or 1, len(combinacoes))
+    if processos <= 1:
+        return [_executar_combinacao(*c) for c in combinacoes]
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        return list(pool.map(_executar_combinacao, *zip(*combinacoes)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tabela bruta Pré/Pós por fase e prova')
+    parser.add_argument('--fases', type=int, nargs='+', choices=sorted(FASES), help='Padrão: todas')
+    parser.add_argument('--provas', nargs='+', choices=sorted(PROVAS), help='Padrão: todas')
+    parser.add_argument('--processos', type=int, help='Processos do pool (padrão: nº de CPUs)')
+    parser.add_argument('--dados', default=str(DATA_DIR), help='Pasta Data (entradas e saídas)')
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resultados = executar_todas(args.fases, args.provas, args.processos, args.dados)
+    for r in resultados:
+        print(r['log'], end='')
+        if r['erro']:
+            print(f"❌ FASE {r['fase']} {r['prova']}: {r['erro']}")
+
+    print("\n" + "=" * 72)
+    print("📋 RESUMO DAS COMBINAÇÕES")
+    print("=" * 72)
+    for r in resultados:
+        situacao = f"{r['linhas']} registros" if r['erro'] is None else f"❌ {r['erro']}"
+        print(f"   Fase {r['fase']} {r['prova']:<12} {r['segundos']:7.1f} s   {situacao}")
+    print(f"   Total: {time.perf_counter() - inicio:.1f} s")
+    print("=" * 72)
+
+    if any(r['erro'] for r in resultados):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,8 +16,7 @@ Data: 16 de outubro de 2025
 """
 
 import pandas as pd
-import unicodedata
-import re
+import sys
 from pathlib import Path
 from typing import Dict
 
@@ -31,35 +30,24 @@ DADOS_GERAIS_DIR = DATA_DIR / "DadosGerais"
 TDE_LONGITUDINAL = DASHBOARD_DIR / "TDE_longitudinal.csv"
 VOCAB_LONGITUDINAL = DASHBOARD_DIR / "vocabulario_longitudinal.csv"
 
+# Normalização de nomes compartilhada com o Dashboard
+sys.path.append(str(DASHBOARD_DIR))
+from text_normalization import normalize_name, normalize_names
+
 
 def normalizar_nome(nome: str) -> str:
     """
     Normaliza nome para facilitar matching (remove acentos, converte para maiúscula).
     
+    Pontuação é trocada por espaço antes de colapsar os espaços.
+    
     Args:
         nome: Nome a ser normalizado
         
     Returns:
         Nome normalizado
     """
-    if pd.isna(nome) or nome == "":
-        return ""
-    
-    # Converter para string e remover espaços extras
-    nome = str(nome).strip()
-    
-    # Remover acentos (NFD normalization)
-    nome_nfd = unicodedata.normalize('NFD', nome)
-    nome_sem_acento = ''.join(c for c in nome_nfd if unicodedata.category(c) != 'Mn')
-    
-    # Converter para maiúsculo
-    nome_upper = nome_sem_acento.upper()
-    
-    # Remover caracteres especiais e múltiplos espaços
-    nome_limpo = re.sub(r'[^\w\s]', ' ', nome_upper)
-    nome_limpo = re.sub(r'\s+', ' ', nome_limpo)
-    
-    return nome_limpo.strip()
+    return normalize_name(nome, especiais='espaco')
 
 
 def carregar_datas_aniversario() -> Dict[str, str]:
@@ -182,27 +170,13 @@ def adicionar_coluna_aniversario(arquivo_path: Path, mapeamento_datas: Dict[str,
     if 'DataAniversario' in df.columns:
         print(f"   ⚠️  Coluna 'DataAniversario' já existe. Será sobrescrita.")
     
-    # Criar coluna DataAniversario
-    datas_aniversario = []
-    matches = 0
-    sem_match = 0
-    
-    for _, row in df.iterrows():
-        nome = row.get('Nome', '')
-        nome_norm = normalizar_nome(nome)
-        
-        # Buscar data no mapeamento
-        data = mapeamento_datas.get(nome_norm, '')
-        
-        if data:
-            matches += 1
-        else:
-            sem_match += 1
-        
-        datas_aniversario.append(data)
+    # Criar coluna DataAniversario (cada nome distinto é normalizado uma única vez)
+    nomes = df['Nome'] if 'Nome' in df.columns else pd.Series('', index=df.index)
+    nomes_norm = normalize_names(nomes, especiais='espaco')
+    df['DataAniversario'] = nomes_norm.map(mapeamento_datas).fillna('')
     
-    # Adicionar coluna ao DataFrame
-    df['DataAniversario'] = datas_aniversario
+    matches = int((df['DataAniversario'] != '').sum())
+    sem_match = len(df) - matches
     
     # Salvar backup
     df_original = pd.read_csv(arquivo_path)
@@ -27,23 +27,13 @@ import os
 from datetime import datetime
 
 # Adicionar path do Dashboard
-sys.path.append(os.path.join(os.path.dirname(__file__), 'Dashboard'))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Dashboard'))
 from data_loader import get_datasets
+from text_normalization import normalize_name, normalize_names, mapear_unicos
 
 def normalizar_nome(nome):
-    """Normaliza nome para comparação consistente"""
-    if pd.isna(nome):
-        return ""
-    
-    nome = str(nome).upper().strip()
-    # Remover acentos
-    nome = ''.join(c for c in unicodedata.normalize('NFD', nome) 
-                  if unicodedata.category(c) != 'Mn')
-    # Remover caracteres especiais e espaços extras
-    nome = re.sub(r'[^A-Z0-9\s]', '', nome)
-    nome = re.sub(r'\s+', ' ', nome).strip()
-    
-    return nome
+    """Normaliza nome para comparação consistente (remove caracteres especiais)"""
+    return normalize_name(nome, especiais='remover')
 
 def normalizar_escola(escola):
     """Normaliza nome da escola para comparação consistente"""
@@ -77,6 +67,11 @@ def gerar_id_unico_permanente(nome, escola):
     
     return id_unico
 
+def gerar_ids_unicos_permanentes(nomes, escolas):
+    """Versão vetorizada de gerar_id_unico_permanente (cada nome/escola/chave distinta é processada uma vez)"""
+    chaves = normalize_names(nomes, especiais='remover') + "_" + mapear_unicos(escolas, normalizar_escola)
+    return mapear_unicos(chaves, lambda chave: hashlib.md5(chave.encode('utf-8')).hexdigest()[:12].upper())
+
 def identificar_turma_origem(df_aluno):
     """Identifica a turma de origem (primeira aparição) de um aluno"""
     if df_aluno.empty:
@@ -101,10 +96,7 @@ def refatorar_dados(df_original, nome_prova):
     
     # Gerar novos IDs únicos permanentes
     print("   Gerando IDs únicos permanentes...")
-    df_refatorado['ID_Unico_Novo'] = df_refatorado.apply(
-        lambda row: gerar_id_unico_permanente(row['Nome'], row['Escola']), 
-        axis=1
-    )
+    df_refatorado['ID_Unico_Novo'] = gerar_ids_unicos_permanentes(df_refatorado['Nome'], df_refatorado['Escola'])
     
     # Identificar turma de origem para cada aluno
     print("   Identificando turmas de origem...")
@@ -166,12 +158,18 @@ def validar_consistencia(df_tde, df_vocab):
     print("\n🔍 VALIDAÇÃO DE CONSISTÊNCIA:")
     
     # Verificar se mesmo aluno tem mesmo ID em ambos os datasets
-    alunos_tde = set(df_tde[['Nome', 'Escola', 'ID_Unico']].drop_duplicates().apply(
-        lambda x: (normalizar_nome(x['Nome']), normalizar_escola(x['Escola']), x['ID_Unico']), axis=1
+    base_tde = df_tde[['Nome', 'Escola', 'ID_Unico']].drop_duplicates()
+    alunos_tde = set(zip(
+        normalize_names(base_tde['Nome'], especiais='remover'),
+        mapear_unicos(base_tde['Escola'], normalizar_escola),
+        base_tde['ID_Unico']
     ))
     
-    alunos_vocab = set(df_vocab[['Nome', 'Escola', 'ID_Unico']].drop_duplicates().apply(
-        lambda x: (normalizar_nome(x['Nome']), normalizar_escola(x['Escola']), x['ID_Unico']), axis=1
+    base_vocab = df_vocab[['Nome', 'Escola', 'ID_Unico']].drop_duplicates()
+    alunos_vocab = set(zip(
+        normalize_names(base_vocab['Nome'], especiais='remover'),
+        mapear_unicos(base_vocab['Escola'], normalizar_escola),
+        base_vocab['ID_Unico']
     ))
     
     # Encontrar alunos em comum